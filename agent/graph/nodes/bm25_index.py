@@ -0,0 +1,194 @@
+"""
+Local BM25 keyword index over SEC filing chunks (Node 7 side index).
+
+Every chunk stored in ChromaDB is also tokenized into an inverted index in
+SQLite (BM25_INDEX_PATH), so keyword-heavy questions — "gross margin
+guidance", "export controls China" — can be answered by exact term
+matching without a remote embedding call. rag_retriever fuses these hits
+with the vector results, and falls back to them alone when the embedding
+API is slow or down.
+
+Schema:
+  chunks   (id, ticker, filing_period, length, text, metadata JSON)
+  postings (term, ticker, chunk_id, tf) — primary key (term, ticker, chunk_id),
+           so the per-term document frequency and the postings for a query
+           come from index range scans scoped to one ticker.
+
+Scoring is Okapi BM25 (k1=1.2, b=0.75) with corpus statistics (N, average
+length, df) taken per ticker, since every query is scoped to one company.
+
+Storage errors are logged and treated as "no keyword hits"; retrieval
+still works from the vector store alone. One connection is shared across
+worker threads, guarded by a lock.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.&'][a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be been by did do does for from had has have how in is it its of on or "
+    "our say said that the their them they this to was we were what when which who why will with "
+    "about after before during than then there these those into over under".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Casefolded word tokens with stopwords removed and plurals folded
+    ("margins" → "margin"), so query and chunk terms meet halfway.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(text.casefold()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """SQLite-backed inverted index with BM25 search, scoped per ticker."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id            TEXT PRIMARY KEY,
+                    ticker        TEXT NOT NULL,
+                    filing_period TEXT NOT NULL,
+                    length        INTEGER NOT NULL,
+                    text          TEXT NOT NULL,
+                    metadata      TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS chunks_ticker ON chunks (ticker, filing_period);
+                CREATE TABLE IF NOT EXISTS postings (
+                    term     TEXT NOT NULL,
+                    ticker   TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    tf       INTEGER NOT NULL,
+                    PRIMARY KEY (term, ticker, chunk_id)
+                ) WITHOUT ROWID;
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def add(self, chunks: Iterable[dict]) -> int:
+        """
+        Index chunks (id, text, metadata with ticker/filing_period). Chunks
+        already indexed are skipped. Returns how many were added.
+        """
+        added = 0
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    for chunk in chunks:
+                        meta = chunk["metadata"]
+                        terms = Counter(tokenize(chunk["text"]))
+                        cur = conn.execute(
+                            "INSERT OR IGNORE INTO chunks VALUES (?, ?, ?, ?, ?, ?)",
+                            (chunk["id"], meta["ticker"], meta["filing_period"],
+                             sum(terms.values()), chunk["text"], json.dumps(meta)),
+                        )
+                        if cur.rowcount == 0:
+                            continue
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)",
+                            ((term, meta["ticker"], chunk["id"], tf) for term, tf in terms.items()),
+                        )
+                        added += 1
+            except sqlite3.Error as e:
+                logger.warning("BM25 index write failed: %s", e)
+                return 0
+        return added
+
+    def search(
+        self,
+        ticker: str,
+        query: str,
+        filing_periods: Optional[list[str]] = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        """
+        Top `limit` chunks of `ticker` for `query` by BM25, best first.
+        Returns dicts: id, text, metadata, score. Empty on no match or error.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        term_marks = ",".join("?" * len(terms))
+
+        with self._lock:
+            try:
+                conn = self._connect()
+                n_docs, avg_len = conn.execute(
+                    "SELECT COUNT(*), AVG(length) FROM chunks WHERE ticker = ?", (ticker,)
+                ).fetchone()
+                if not n_docs:
+                    return []
+                df = dict(conn.execute(
+                    f"SELECT term, COUNT(*) FROM postings WHERE ticker = ? AND term IN ({term_marks}) GROUP BY term",
+                    (ticker, *terms),
+                ).fetchall())
+
+                sql = (
+                    "SELECT p.chunk_id, p.term, p.tf, c.length FROM postings p "
+                    "JOIN chunks c ON c.id = p.chunk_id "
+                    f"WHERE p.ticker = ? AND p.term IN ({term_marks})"
+                )
+                params: list = [ticker, *terms]
+                if filing_periods:
+                    sql += f" AND c.filing_period IN ({','.join('?' * len(filing_periods))})"
+                    params.extend(filing_periods)
+                rows = conn.execute(sql, params).fetchall()
+
+                scores: dict[str, float] = {}
+                avg_len = avg_len or 1.0
+                for chunk_id, term, tf, length in rows:
+                    idf = math.log(1 + (n_docs - df[term] + 0.5) / (df[term] + 0.5))
+                    norm = tf + _K1 * (1 - _B + _B * length / avg_len)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (_K1 + 1) / norm
+
+                top = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+                if not top:
+                    return []
+                docs = {
+                    row[0]: row[1:]
+                    for row in conn.execute(
+                        f"SELECT id, text, metadata FROM chunks WHERE id IN ({','.join('?' * len(top))})",
+                        [chunk_id for chunk_id, _ in top],
+                    )
+                }
+            except sqlite3.Error as e:
+                logger.warning("BM25 index search failed: %s", e)
+                return []
+
+        return [
+            {"id": chunk_id, "text": docs[chunk_id][0], "metadata": json.loads(docs[chunk_id][1]), "score": round(score, 4)}
+            for chunk_id, score in top
+            if chunk_id in docs
+        ]
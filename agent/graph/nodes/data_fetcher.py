@@ -12,12 +12,27 @@ volume against a 90-day historical baseline. A ratio > 1.5x flags
 unusual trading activity — a proxy signal used by the Response
 Synthesizer to add context ("volume was significantly elevated").
 
+Daily bars are served from a local SQLite cache (PRICE_CACHE_PATH) that
+records which date intervals it already holds per ticker. The query window
+and the 90-day baseline are requested as one span, so a cold query costs a
+single yfinance history() call and a follow-up on the same ticker usually
+costs none — only the uncovered gaps are fetched.
+
+Enrichment (analyst ratings, short interest, next earnings date) reads from
+one fundamentals snapshot per ticker: .info, .recommendations_summary and
+.calendar are fetched concurrently, started before the price fetch so they
+overlap it, and kept in a TTL cache because they do not change intraday.
+
 No LLM calls in this node — pure data retrieval and arithmetic.
 """
 
 import asyncio
 import logging
 import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -26,6 +41,7 @@ import requests
 import yfinance as yf
 
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.timing import submit_timed, timed_call
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +52,204 @@ VOLUME_ANOMALY_THRESHOLD = 1.5
 # How many days of history to use for the volume baseline.
 HISTORICAL_BASELINE_DAYS = 90
 
+# On-disk daily-bar cache. ":memory:" keeps it process-local (used by tests).
+PRICE_CACHE_PATH = os.getenv("PRICE_CACHE_PATH", "data/price_cache.sqlite3")
+
+# How long a fundamentals snapshot (.info / recommendations / calendar) is
+# reused before Yahoo is asked again. These fields do not move intraday.
+FUNDAMENTALS_TTL_SECONDS = 6 * 60 * 60
+
+
+# ---------------------------------------------------------------------------
+# Daily-bar cache
+# ---------------------------------------------------------------------------
+
+class _DailyBarCache:
+    """
+    Per-ticker store of daily OHLCV bars plus the date intervals already
+    fetched from yfinance.
+
+    Coverage is tracked as half-open [start, end) intervals — the same
+    convention as yfinance's history(start, end) — and merged on write, so
+    an interval lookup tells us exactly which gaps still need fetching.
+    Weekends and holidays inside a covered interval simply have no bars;
+    they are not gaps.
+
+    One connection is shared across executor threads, guarded by a lock.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS daily_bars (
+                    ticker TEXT NOT NULL,
+                    date   TEXT NOT NULL,
+                    open   REAL, high REAL, low REAL, close REAL,
+                    volume INTEGER,
+                    PRIMARY KEY (ticker, date)
+                );
+                CREATE TABLE IF NOT EXISTS bar_coverage (
+                    ticker TEXT NOT NULL,
+                    start  TEXT NOT NULL,
+                    end    TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_bar_coverage_ticker
+                    ON bar_coverage (ticker);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def missing_ranges(self, ticker: str, start: str, end: str) -> list[tuple[str, str]]:
+        """Return the sub-intervals of [start, end) not yet covered for ticker."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT start, end FROM bar_coverage WHERE ticker = ? ORDER BY start",
+                (ticker,),
+            ).fetchall()
+
+        gaps = []
+        cursor = start
+        for cov_start, cov_end in rows:
+            if cov_end <= cursor:
+                continue
+            if cov_start >= end:
+                break
+            if cov_start > cursor:
+                gaps.append((cursor, cov_start))
+            cursor = max(cursor, cov_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def store(self, ticker: str, hist, start: str, end: str) -> None:
+        """
+        Upsert the bars in `hist` and mark [start, end) as covered — also
+        when `hist` is empty, so a weekend- or holiday-only span is not
+        fetched again on every query. A missing (NaN) volume is stored as 0.
+
+        Coverage is clamped to before today: the current session's bar is
+        still moving, so it is stored but always refetched on the next query.
+        """
+        rows = [
+            (
+                ticker,
+                ts.strftime("%Y-%m-%d"),
+                float(row["Open"]), float(row["High"]),
+                float(row["Low"]), float(row["Close"]),
+                0 if pd.isna(row["Volume"]) else int(row["Volume"]),
+            )
+            for ts, row in hist.iterrows()
+        ]
+        covered_end = min(end, datetime.now().strftime("%Y-%m-%d"))
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO daily_bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                if start < covered_end:
+                    self._merge_coverage(conn, ticker, start, covered_end)
+
+    @staticmethod
+    def _merge_coverage(conn: sqlite3.Connection, ticker: str, start: str, end: str) -> None:
+        """Fold [start, end) into the ticker's coverage, merging touching intervals."""
+        overlapping = conn.execute(
+            "SELECT rowid, start, end FROM bar_coverage "
+            "WHERE ticker = ? AND start <= ? AND end >= ?",
+            (ticker, end, start),
+        ).fetchall()
+        for rowid, cov_start, cov_end in overlapping:
+            start = min(start, cov_start)
+            end = max(end, cov_end)
+            conn.execute("DELETE FROM bar_coverage WHERE rowid = ?", (rowid,))
+        conn.execute(
+            "INSERT INTO bar_coverage (ticker, start, end) VALUES (?, ?, ?)",
+            (ticker, start, end),
+        )
+
+    def load(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Return cached bars in [start, end) as a yfinance-shaped DataFrame."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT date, open, high, low, close, volume FROM daily_bars "
+                "WHERE ticker = ? AND date >= ? AND date < ? ORDER BY date",
+                (ticker, start, end),
+            ).fetchall()
+
+        df = pd.DataFrame(rows, columns=["Date", "Open", "High", "Low", "Close", "Volume"])
+        df.index = pd.to_datetime(df.pop("Date"))
+        return df
+
+
+_bar_cache = _DailyBarCache(PRICE_CACHE_PATH)
+
+
+def _naive_dates(hist: pd.DataFrame) -> pd.DataFrame:
+    """Drop the exchange timezone from a yfinance index so it matches cached bars."""
+    if hist is not None and getattr(hist.index, "tz", None) is not None:
+        hist = hist.copy()
+        hist.index = hist.index.tz_localize(None)
+    return hist
+
+
+def _get_daily_bars(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Return daily bars for [start_date, end_date), fetching only what the
+    cache does not already cover.
+
+    All gaps are coalesced into one history() call spanning the first gap
+    start to the last gap end, so the cost is at most one round-trip no
+    matter how fragmented the coverage is. If the cache itself is broken
+    (unwritable path, corrupt file), falls back to a direct yfinance call.
+    Network errors from yfinance propagate to the caller.
+    """
+    ticker = ticker.upper()
+
+    try:
+        gaps = _bar_cache.missing_ranges(ticker, start_date, end_date)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("price cache unavailable (%s); fetching %s directly", e, ticker)
+        with timed_call("yfinance.history"):
+            hist = yf.Ticker(ticker).history(start=start_date, end=end_date)
+        return _naive_dates(hist)
+
+    if gaps:
+        fetch_start, fetch_end = gaps[0][0], gaps[-1][1]
+        with timed_call("yfinance.history"):
+            hist = yf.Ticker(ticker).history(start=fetch_start, end=fetch_end)
+        if hist is not None:
+            try:
+                _bar_cache.store(ticker, hist, fetch_start, fetch_end)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("price cache write failed for %s: %s", ticker, e)
+                hist = _naive_dates(hist)
+                return hist.loc[
+                    (hist.index >= pd.Timestamp(start_date))
+                    & (hist.index < pd.Timestamp(end_date))
+                ]
+        logger.debug(
+            "_get_daily_bars %s: fetched %s to %s (%d gap(s))",
+            ticker, fetch_start, fetch_end, len(gaps),
+        )
+    else:
+        logger.debug("_get_daily_bars %s: cache hit %s to %s", ticker, start_date, end_date)
+
+    return _bar_cache.load(ticker, start_date, end_date)
+
 
 # ---------------------------------------------------------------------------
 # yfinance helpers
@@ -71,6 +285,10 @@ def _compute_volume_anomaly(
     Compare the average daily volume in `hist` (the queried period) against
     a 90-day historical baseline ending at start_date.
 
+    The baseline is read through the daily-bar cache. When called from
+    _fetch_yfinance the baseline was prefetched together with the query
+    window, so this is a local read with no yfinance call.
+
     Returns a volume_anomaly dict. If the baseline fetch fails, is_anomalous
     is set to False and the failure is logged (not propagated — a missing
     anomaly signal should not fail the whole node).
@@ -83,10 +301,8 @@ def _compute_volume_anomaly(
         baseline_end = datetime.strptime(start_date, "%Y-%m-%d")
         baseline_start = baseline_end - timedelta(days=HISTORICAL_BASELINE_DAYS)
 
-        stock = yf.Ticker(ticker)
-        hist_baseline = stock.history(
-            start=baseline_start.strftime("%Y-%m-%d"),
-            end=start_date,
+        hist_baseline = _get_daily_bars(
+            ticker, baseline_start.strftime("%Y-%m-%d"), start_date,
         )
 
         if hist_baseline.empty:
@@ -126,10 +342,18 @@ def _fetch_yfinance(
     Attempt to fetch OHLCV data from yfinance.
     Returns (price_data dict, volume_anomaly dict) on success.
     Returns (None, error_message) on failure.
+
+    The baseline window and the query window are adjacent, so both are
+    requested as one span through the daily-bar cache and the query period
+    is sliced out of the merged series.
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=start_date, end=end_date)
+        baseline_start = (
+            datetime.strptime(start_date, "%Y-%m-%d")
+            - timedelta(days=HISTORICAL_BASELINE_DAYS)
+        ).strftime("%Y-%m-%d")
+        series = _get_daily_bars(ticker, baseline_start, end_date)
+        hist = series.loc[series.index >= pd.Timestamp(start_date)]
 
         if hist is None or hist.empty:
             return None, f"yfinance returned no data for {ticker} ({start_date} to {end_date})"
@@ -187,7 +411,8 @@ def _fetch_alpha_vantage(
             f"&outputsize=full"
             f"&apikey={api_key}"
         )
-        response = requests.get(url, timeout=10)
+        with timed_call("alpha_vantage"):
+            response = requests.get(url, timeout=10)
         data = response.json()
 
         time_series = data.get("Time Series (Daily)")
@@ -243,19 +468,128 @@ def _fetch_alpha_vantage(
         return None, f"Alpha Vantage error: {e}"
 
 
+# ---------------------------------------------------------------------------
+# Fundamentals snapshot — one set of yfinance calls shared by all enrichment
+# helpers below.
+# ---------------------------------------------------------------------------
+
+_FUNDAMENTAL_FIELDS = ("info", "recommendations_summary", "calendar")
+
+# Shared pool so concurrent sessions do not each spin up their own threads.
+_fundamentals_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yf-fundamentals")
+_fundamentals_lock = threading.Lock()
+# ticker → (fetched_at monotonic seconds, snapshot dict)
+_fundamentals_cache: dict[str, tuple[float, dict]] = {}
+# ticker → (started_at monotonic seconds, {field: Future}) for fetches that
+# have started but not been read
+_fundamentals_inflight: dict[str, tuple[float, dict[str, Future]]] = {}
+
+
+def _fetch_fundamental(ticker: str, field: str):
+    """Read one fundamentals field from a Ticker of its own (runs on the pool)."""
+    return getattr(yf.Ticker(ticker), field)
+
+
+def _cached_or_inflight(ticker: str) -> tuple[Optional[dict], dict[str, Future]]:
+    """
+    Return (snapshot, {}) on a fresh cache hit, otherwise (None, futures)
+    for the in-flight fetch — starting one if needed.
+
+    Each field is its own Yahoo request, so the three run concurrently on
+    the shared pool, each on its own yf.Ticker: the lazy properties share
+    unlocked internal state, so one Ticker must not be read from several
+    threads at once. Concurrent callers for the same ticker (e.g. two
+    sessions) share one fetch. An in-flight fetch started more than
+    FUNDAMENTALS_TTL_SECONDS ago is never joined; a fresh one replaces it.
+    """
+    key = ticker.upper()
+    now = time.monotonic()
+    with _fundamentals_lock:
+        cached = _fundamentals_cache.get(key)
+        if cached and now - cached[0] < FUNDAMENTALS_TTL_SECONDS:
+            return cached[1], {}
+        inflight = _fundamentals_inflight.get(key)
+        if inflight is not None and now - inflight[0] < FUNDAMENTALS_TTL_SECONDS:
+            return None, inflight[1]
+        futures = {
+            field: submit_timed(_fundamentals_pool, f"yfinance.{field}", _fetch_fundamental, ticker, field)
+            for field in _FUNDAMENTAL_FIELDS
+        }
+        _fundamentals_inflight[key] = (now, futures)
+        return None, futures
+
+
+def _prefetch_fundamentals(ticker: str) -> dict[str, Future]:
+    """
+    Start fetching the fundamentals snapshot for ticker without waiting.
+    Returns the in-flight futures ({} on a cache hit), for
+    _discard_fundamentals_prefetch on paths that never read them.
+    """
+    return _cached_or_inflight(ticker)[1]
+
+
+def _discard_fundamentals_prefetch(ticker: str, futures: dict[str, Future]) -> None:
+    """
+    Forget a prefetch whose result will not be read, so a later query starts
+    a fresh fetch instead of picking up a stale result. Only the entry for
+    these futures is removed; a newer fetch for the ticker is left alone.
+    """
+    key = ticker.upper()
+    with _fundamentals_lock:
+        inflight = _fundamentals_inflight.get(key)
+        if inflight is not None and inflight[1] is futures:
+            del _fundamentals_inflight[key]
+
+
+def _get_fundamentals(ticker: str) -> dict:
+    """
+    Return {info, recommendations_summary, calendar} for ticker.
+
+    Served from the TTL cache when fresh; otherwise waits on (or starts) the
+    concurrent fetch. A field whose request raised is None in the snapshot,
+    and a snapshot with any failed field is not cached, so the next query
+    retries instead of reusing a partial result for hours.
+    """
+    snapshot, futures = _cached_or_inflight(ticker)
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = {}
+    failed = False
+    for field in _FUNDAMENTAL_FIELDS:
+        try:
+            snapshot[field] = futures[field].result()
+        except Exception as e:
+            logger.warning("fundamentals %s fetch failed for %s: %s", field, ticker, e)
+            snapshot[field] = None
+            failed = True
+
+    key = ticker.upper()
+    with _fundamentals_lock:
+        inflight = _fundamentals_inflight.get(key)
+        if inflight is not None and inflight[1] is futures:
+            del _fundamentals_inflight[key]
+            if not failed:
+                _fundamentals_cache[key] = (time.monotonic(), snapshot)
+
+    return snapshot
+
+
 # ---------------------------------------------------------------------------
 # Enrichment helpers — analyst data, short interest, earnings date
-# All are non-fatal: failures return None and are logged as warnings.
+# All read from the fundamentals snapshot and are non-fatal: failures
+# return None and are logged as warnings.
 # ---------------------------------------------------------------------------
 
 def _fetch_analyst_data(ticker: str) -> Optional[dict]:
     """
-    Fetch analyst price targets and recommendation breakdown via yfinance.
+    Read analyst price targets and recommendation breakdown from the
+    fundamentals snapshot.
     Returns None if info is unavailable or all target values are missing.
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        snapshot = _get_fundamentals(ticker)
+        info = snapshot["info"]
         if not isinstance(info, dict):
             return None
 
@@ -269,7 +603,7 @@ def _fetch_analyst_data(ticker: str) -> Optional[dict]:
 
         strong_buy = buy = hold = sell = strong_sell = None
         try:
-            recs = stock.recommendations_summary
+            recs = snapshot["recommendations_summary"]
             if recs is not None and hasattr(recs, "empty") and not recs.empty:
                 latest = recs.iloc[0]
                 strong_buy = int(latest.get("strongBuy", 0))
@@ -299,11 +633,11 @@ def _fetch_analyst_data(ticker: str) -> Optional[dict]:
 
 def _fetch_short_interest(ticker: str) -> Optional[dict]:
     """
-    Fetch short interest metrics from yfinance ticker.info.
+    Read short interest metrics from the snapshot's ticker.info.
     Returns None if info is unavailable or all short fields are missing.
     """
     try:
-        info = yf.Ticker(ticker).info
+        info = _get_fundamentals(ticker)["info"]
         if not isinstance(info, dict):
             return None
 
@@ -329,11 +663,11 @@ def _fetch_short_interest(ticker: str) -> Optional[dict]:
 
 def _fetch_earnings_date(ticker: str) -> tuple[Optional[str], Optional[int]]:
     """
-    Fetch next earnings date from yfinance ticker.calendar.
+    Read the next earnings date from the snapshot's ticker.calendar.
     Returns (ISO date string, days until earnings) or (None, None).
     """
     try:
-        calendar = yf.Ticker(ticker).calendar
+        calendar = _get_fundamentals(ticker)["calendar"]
         if not isinstance(calendar, dict):
             return None, None
 
@@ -389,6 +723,11 @@ def _fetch_price_data_sync(state: AgentState) -> AgentState:
             "next_earnings_date": None, "days_until_earnings": None,
         }
 
+    # Enrichment fields are needed on both success paths below; start them
+    # now so the Yahoo round-trips overlap the price fetch. The failure paths
+    # never read them and must discard the prefetch.
+    fundamentals = _prefetch_fundamentals(ticker)
+
     # Layer 1 — yfinance (primary)
     price_data, result = _fetch_yfinance(ticker, start_date, end_date)
 
@@ -419,6 +758,7 @@ def _fetch_price_data_sync(state: AgentState) -> AgentState:
     alpha_key = os.getenv("ALPHA_VANTAGE_API_KEY", "")
     if not alpha_key:
         logger.warning("fetch_price_data: no ALPHA_VANTAGE_API_KEY set; no fallback available")
+        _discard_fundamentals_prefetch(ticker, fundamentals)
         return {
             **state,
             "price_data": None, "volume_anomaly": None, "price_error": yfinance_error,
@@ -447,6 +787,7 @@ def _fetch_price_data_sync(state: AgentState) -> AgentState:
     # Both sources failed
     combined_error = f"yfinance: {yfinance_error} | alpha_vantage: {av_result}"
     logger.error("fetch_price_data: all sources failed for %s: %s", ticker, combined_error)
+    _discard_fundamentals_prefetch(ticker, fundamentals)
     return {
         **state,
         "price_data": None, "volume_anomaly": None, "price_error": combined_error,
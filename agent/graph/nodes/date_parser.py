@@ -32,6 +32,7 @@ import yfinance as yf
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.timing import timed_call
 from llm.llm_setup import llm_classifier
 
 logger = logging.getLogger(__name__)
@@ -346,7 +347,8 @@ def _get_earnings_date(ticker: str, quarter: int, year: int) -> datetime | None:
 
     try:
         stock = yf.Ticker(ticker)
-        df = stock.earnings_dates
+        with timed_call("yfinance.earnings_dates"):
+            df = stock.earnings_dates
 
         if df is None or df.empty:
             return None
@@ -0,0 +1,253 @@
+"""
+Shared HTTP clients for the retrieval nodes (Nodes 5, 6, 7).
+
+Every outbound request from the news, sentiment and RAG nodes goes through
+one connection-pooled httpx client instead of a fresh `requests.get`, so
+concurrent Chainlit sessions reuse keep-alive (and HTTP/2) connections to
+each provider rather than paying a TCP + TLS handshake per call.
+
+Two clients share the same pool settings:
+  async_get / async_post — httpx.AsyncClient used by the async node bodies.
+  sync_get / sync_stream — httpx.Client for code that runs in worker threads
+                           (SEC EDGAR ingestion inside Node 7); sync_stream
+                           reads large documents without buffering them.
+
+Per-host concurrency limits:
+  Each host gets a semaphore sized by _HOST_LIMITS (default
+  _DEFAULT_HOST_LIMIT). A burst of sessions queues on the semaphore instead
+  of opening dozens of sockets to one provider and tripping its rate limit.
+
+Per-host request rates:
+  Hosts listed in _RATE_LIMIT_GROUPS draw from a shared token bucket
+  (_RATE_LIMITS) before each request. The buckets are process-wide and
+  thread-safe, so every session and ingest worker together stay under the
+  provider's published limit — SEC EDGAR allows 10 requests/second across
+  www.sec.gov and data.sec.gov. Callers wait only when the bucket is
+  empty; there is no fixed per-request sleep.
+
+Call timing:
+  Every request is recorded as an external call (see timing.py), named by
+  _CALL_NAMES for known providers or by hostname otherwise, including any
+  wait on the host semaphore.
+
+Event-loop binding:
+  httpx.AsyncClient and asyncio.Semaphore belong to the loop that first uses
+  them. Chainlit runs a single loop, so in production the client is created
+  once. If a different loop shows up (tests, evaluators using asyncio.run),
+  a fresh client and semaphore set are built for it.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from agent.graph.nodes.timing import timed_call
+
+logger = logging.getLogger(__name__)
+
+_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+_DEFAULT_HOST_LIMIT = 8
+_HOST_LIMITS = {
+    "finnhub.io": 4,
+    "ydc-index.io": 4,
+    "api.firecrawl.dev": 5,
+    "news.google.com": 4,
+    "www.reddit.com": 2,
+    "api.stocktwits.com": 2,
+    "www.sec.gov": 4,
+    "data.sec.gov": 4,
+}
+
+# Token buckets: group → (tokens per second, burst). rate + burst ≤ 10 keeps
+# any one-second window within SEC's 10 requests/second fair-access limit.
+_RATE_LIMITS = {
+    "sec.gov": (8.0, 2),
+}
+_RATE_LIMIT_GROUPS = {
+    "www.sec.gov": "sec.gov",
+    "data.sec.gov": "sec.gov",
+}
+
+# External-call names used for latency timings
+_CALL_NAMES = {
+    "finnhub.io": "finnhub",
+    "ydc-index.io": "youcom",
+    "api.firecrawl.dev": "firecrawl",
+    "news.google.com": "google_rss",
+    "www.reddit.com": "reddit",
+    "api.stocktwits.com": "stocktwits",
+    "www.sec.gov": "edgar",
+    "data.sec.gov": "edgar",
+}
+
+
+def _host_limit(host: str) -> int:
+    return _HOST_LIMITS.get(host, _DEFAULT_HOST_LIMIT)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() takes a token and returns how long
+    the caller must wait before using it; the balance may go negative, so
+    concurrent callers queue up in arrival order instead of polling.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_buckets = {group: TokenBucket(rate, burst) for group, (rate, burst) in _RATE_LIMITS.items()}
+
+
+def _rate_bucket(host: str) -> TokenBucket | None:
+    group = _RATE_LIMIT_GROUPS.get(host)
+    return _rate_buckets.get(group) if group else None
+
+
+def _new_client_kwargs() -> dict:
+    return {
+        "http2": True,
+        "limits": _LIMITS,
+        "timeout": _TIMEOUT,
+        "follow_redirects": True,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Async client (Nodes 5 and 6, async node bodies)
+# ---------------------------------------------------------------------------
+
+_async_loop: asyncio.AbstractEventLoop | None = None
+_async_client: httpx.AsyncClient | None = None
+_async_host_sems: dict[str, asyncio.Semaphore] = {}
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the AsyncClient bound to the running event loop, creating it on first use."""
+    global _async_loop, _async_client, _async_host_sems
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_loop is not loop or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(**_new_client_kwargs())
+        _async_loop = loop
+        _async_host_sems = {}
+        logger.debug("http_client: created shared AsyncClient")
+    return _async_client
+
+
+def _async_host_sem(host: str) -> asyncio.Semaphore:
+    sem = _async_host_sems.get(host)
+    if sem is None:
+        sem = _async_host_sems[host] = asyncio.Semaphore(_host_limit(host))
+    return sem
+
+
+async def async_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request on the shared AsyncClient, bounded by the host's concurrency limit."""
+    client = get_async_client()
+    host = urlsplit(url).hostname or ""
+    with timed_call(_CALL_NAMES.get(host, host)):
+        bucket = _rate_bucket(host)
+        if bucket is not None:
+            delay = bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with _async_host_sem(host):
+            return await client.request(method, url, **kwargs)
+
+
+async def async_get(url: str, **kwargs) -> httpx.Response:
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url: str, **kwargs) -> httpx.Response:
+    return await async_request("POST", url, **kwargs)
+
+
+async def aclose() -> None:
+    """Close the shared AsyncClient (call on application shutdown)."""
+    global _async_client, _async_loop
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+    _async_loop = None
+
+
+# ---------------------------------------------------------------------------
+# Sync client (worker-thread code paths)
+# ---------------------------------------------------------------------------
+
+_sync_lock = threading.Lock()
+_sync_client: httpx.Client | None = None
+_sync_host_sems: dict[str, threading.BoundedSemaphore] = {}
+
+
+def get_sync_client() -> httpx.Client:
+    """Return the process-wide httpx.Client (thread-safe), creating it on first use."""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_new_client_kwargs())
+            logger.debug("http_client: created shared sync Client")
+        return _sync_client
+
+
+def _sync_host_sem(host: str) -> threading.BoundedSemaphore:
+    with _sync_lock:
+        sem = _sync_host_sems.get(host)
+        if sem is None:
+            sem = _sync_host_sems[host] = threading.BoundedSemaphore(_host_limit(host))
+        return sem
+
+
+def sync_get(url: str, **kwargs) -> httpx.Response:
+    """GET on the shared sync Client, bounded by the host's concurrency limit."""
+    client = get_sync_client()
+    host = urlsplit(url).hostname or ""
+    with timed_call(_CALL_NAMES.get(host, host)):
+        bucket = _rate_bucket(host)
+        if bucket is not None:
+            bucket.acquire()
+        with _sync_host_sem(host):
+            return client.get(url, **kwargs)
+
+
+@contextmanager
+def sync_stream(url: str, **kwargs):
+    """
+    Streaming GET on the shared sync Client, under the same host limits as
+    sync_get. Yields the response with its body unread; iterate it inside
+    the `with` block.
+    """
+    client = get_sync_client()
+    host = urlsplit(url).hostname or ""
+    with timed_call(_CALL_NAMES.get(host, host)):
+        bucket = _rate_bucket(host)
+        if bucket is not None:
+            bucket.acquire()
+        with _sync_host_sem(host), client.stream("GET", url, **kwargs) as resp:
+            yield resp
@@ -4,6 +4,10 @@ Node 1: Intent Classifier
 Reads:  user_message
 Writes: intent, chart_requested, intent_error
 
+Runs in parallel with the ticker/date stage (Nodes 2 → 3), so it returns
+only the keys it owns — a full-state return would collide with the
+ticker and date fields written in the same superstep.
+
 Uses with_structured_output() + Pydantic for reliable JSON extraction.
 Prompt is pulled from LangSmith Prompt Hub at runtime; falls back to the
 inline prompt if Prompt Hub is unavailable.
@@ -89,8 +93,8 @@ def classify_intent(state: AgentState) -> AgentState:
             intent = "unknown"
 
         logger.info("classify_intent → intent=%r chart_requested=%r", intent, chart_requested)
-        return {**state, "intent": intent, "chart_requested": chart_requested, "intent_error": None}
+        return {"intent": intent, "chart_requested": chart_requested, "intent_error": None}
 
     except Exception as e:
         logger.error("classify_intent failed: %s", e)
-        return {**state, "intent": "unknown", "chart_requested": False, "intent_error": str(e)}
+        return {"intent": "unknown", "chart_requested": False, "intent_error": str(e)}
@@ -15,26 +15,82 @@ Three-layer architecture:
   2. Google News RSS — no API key. Emergency fallback when both
      Layer 1 sources are absent or return nothing.
 
+Provider fan-out is deadline-bounded. Google RSS is started as a hedge
+NEWS_RSS_HEDGE_SECONDS after Layer 1 if no Layer 1 articles have arrived by
+then (immediately when no Layer 1 key is set), so its answer is ready if
+Layer 1 comes back empty. The fetch returns as soon as _MAX_ARTICLES
+relevant Layer 1 articles are in or every provider has answered, and never
+later than NEWS_FETCH_BUDGET_SECONDS; providers still running at that point
+are cancelled.
+
 After retrieval, free-domain articles (reuters.com, cnbc.com, apnews.com,
 finance.yahoo.com, benzinga.com, marketwatch.com) are enriched with full
 article text via Firecrawl. Key from FIRECRAWL_API_KEY env var.
 Enrichment is skipped gracefully if no key is set — snippets fall back
-to the 600-char source excerpt.
-
-If include_current_snapshot is True, a second parallel fetch for the last
-7 days is appended alongside the historical set (deduped by URL).
+to the 600-char source excerpt. Scraped text is kept in a URL-keyed,
+zlib-compressed SQLite cache (FIRECRAWL_CACHE_PATH) bounded to
+FIRECRAWL_CACHE_MAX_MB with least-recently-used eviction, so an article
+already scraped for an earlier question is enriched without a Firecrawl call.
+
+Article store:
+  Every article fetched is kept in a local SQLite store (NEWS_STORE_PATH)
+  together with the date spans already fetched per ticker and provider set.
+  _fetch_articles reads the store first and asks providers only for the
+  span that is not yet covered; repeat and overlapping queries cost no
+  provider calls. News for a closed date range does not change, so settled
+  coverage is kept indefinitely. The last _RECENT_NEWS_DAYS days are still
+  filling in, and an empty answer may be a provider outage, so those spans
+  expire after NEWS_RECENT_TTL_SECONDS and are fetched again. A fetch
+  where any provider hit its _MAX_ARTICLES cap is only a sample of its
+  span, so it covers a repeat of that exact fetch but never a sub-span.
+
+Relevance ranking:
+  Articles that do not mention the stock are dropped; the rest are scored
+  by word-boundary mentions of the ticker symbol (case-sensitive, so COIN
+  or SNOW do not match prose; one- and two-letter and everyday-word
+  tickers such as A or IT need a $, parenthesis or exchange prefix) and
+  company names from TICKER_LOOKUP in the title and snippet, recency
+  within the query window, and outlet weight.
+  After near-duplicate clustering the top _MAX_RANKED_ARTICLES go on to
+  enrichment and the synthesizer.
+
+Near-duplicate clustering:
+  Syndicated wire stories (AP, Reuters reprints) arrive under different
+  URLs. After relevance ranking and before enrichment, articles are
+  fingerprinted with a 64-bit SimHash over the words and word pairs of
+  title + snippet; articles within _SIMHASH_MAX_DISTANCE bits of an earlier
+  one form a cluster and only one representative is kept — the first seen,
+  or a free-domain member if the first cannot be enriched. Snapshot
+  articles are also clustered against the historical set.
+
+If include_current_snapshot is True, the last 7 days are appended to the
+historical set (deduped by URL). Only the part of that window after the
+historical range is fetched alongside it; the rest is read from the store.
+
+All HTTP goes through the shared AsyncClient in http_client.py; the node is
+async, so provider calls and Firecrawl enrichment are awaited concurrently
+on the event loop instead of occupying a thread pool per call.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import re
+import sqlite3
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta
-from urllib.parse import quote_plus
+from typing import Optional
+from urllib.parse import quote_plus, urlsplit
 
 import feedparser
-import requests
 
+from agent.graph.nodes.http_client import async_get, async_post
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.ticker_resolver import TICKER_LOOKUP, _TICKER_BLOCKLIST
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +103,76 @@ _FINNHUB_NEWS_URL = "https://finnhub.io/api/v1/company-news"
 _YOUCOM_SEARCH_URL = "https://ydc-index.io/v1/search"
 _FIRECRAWL_SCRAPE_URL = "https://api.firecrawl.dev/v1/scrape"
 
+# On-disk article store. ":memory:" keeps it process-local (used by tests).
+NEWS_STORE_PATH = os.getenv("NEWS_STORE_PATH", "data/news_store.sqlite3")
+
+# Scraped-article cache. Size is the total of the compressed text.
+FIRECRAWL_CACHE_PATH = os.getenv("FIRECRAWL_CACHE_PATH", "data/firecrawl_cache.sqlite3")
+FIRECRAWL_CACHE_MAX_MB = int(os.getenv("FIRECRAWL_CACHE_MAX_MB", "64"))
+# Eviction frees down to this fraction of the budget, so the writes that
+# follow do not each have to evict again.
+_SCRAPE_CACHE_EVICT_TO = 0.9
+
+# Articles published in the last _RECENT_NEWS_DAYS days are still being
+# indexed by the providers, so coverage of that span (and of any span that
+# came back empty) is trusted only for NEWS_RECENT_TTL_SECONDS.
+_RECENT_NEWS_DAYS = 2
+NEWS_RECENT_TTL_SECONDS = 15 * 60
+
+# Provider fan-out: total wait budget per fetch, and how long Layer 1 gets
+# to produce articles before Google RSS is started as a hedge.
+NEWS_FETCH_BUDGET_SECONDS = float(os.getenv("NEWS_FETCH_BUDGET_SECONDS", "6"))
+NEWS_RSS_HEDGE_SECONDS = float(os.getenv("NEWS_RSS_HEDGE_SECONDS", "1.5"))
+
+# Relevance ranking. At most _MAX_RANKED_ARTICLES historical articles are
+# kept — the number of news slots the synthesizer puts in its prompt.
+_MAX_RANKED_ARTICLES = 8
+_TITLE_MATCH_SCORE = 2.0
+_SNIPPET_MATCH_SCORE = 0.5
+_MAX_SNIPPET_MATCHES = 3
+_RECENCY_WEIGHT = 0.5
+_DEFAULT_SOURCE_WEIGHT = 0.5
+# Outlet weights, keyed by URL host label ("reuters" in reuters.com) or by
+# the source name lowercased with non-alphanumerics and a leading "the" removed.
+_SOURCE_WEIGHTS = {
+    "reuters": 1.0,
+    "bloomberg": 1.0,
+    "wsj": 1.0,
+    "wallstreetjournal": 1.0,
+    "ft": 1.0,
+    "financialtimes": 1.0,
+    "apnews": 0.9,
+    "associatedpress": 0.9,
+    "cnbc": 0.9,
+    "marketwatch": 0.8,
+    "barrons": 0.8,
+    "yahoo": 0.7,
+    "benzinga": 0.6,
+    "seekingalpha": 0.6,
+    "fool": 0.4,
+    "motleyfool": 0.4,
+}
+_CORPORATE_SUFFIX_RE = re.compile(r",?\s+(?:inc|corp|corporation|co|company|ltd|plc|holdings|group)\.?$")
+# Tickers this short, or spelled like an everyday capitalised word, match
+# prose ("A new report", "IT spending") even case-sensitively. They count
+# only as $TICKER, (TICKER) or EXCHANGE:TICKER.
+_MAX_AMBIGUOUS_TICKER_LEN = 2
+_WORD_TICKERS = _TICKER_BLOCKLIST | {
+    "ARE", "BIG", "CAN", "CAR", "FUN", "GO", "HAS", "HE", "KEY", "LOW", "MAIN", "ONE", "OPEN",
+    "OUT", "PLAY", "REAL", "SEE", "TRUE", "TWO", "WELL",
+}
+_EXCHANGE_PREFIX = r"(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|NYSE American)\s*:\s*"
+
+# Near-duplicate clustering: SimHash fingerprints within this many of 64
+# bits are the same story. Texts shorter than _SIMHASH_MIN_TOKENS words are
+# too short to fingerprint reliably and are only deduplicated by URL.
+_SIMHASH_MAX_DISTANCE = 14
+_SIMHASH_MIN_TOKENS = 8
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Layer 1 providers in merge order; Google RSS is served only without them.
+_LAYER1_PROVIDERS = ("finnhub", "youcom")
+
 _FREE_DOMAINS = {
     "reuters.com",
     "cnbc.com",
@@ -91,7 +217,7 @@ def _build_query(ticker: str, company_name: str) -> str:
 # Layer 1a: Finnhub
 # ---------------------------------------------------------------------------
 
-def _fetch_finnhub(
+async def _fetch_finnhub(
     ticker: str,
     start_date: str,
     end_date: str,
@@ -101,7 +227,7 @@ def _fetch_finnhub(
     Query Finnhub /company-news. Returns normalised articles or None on failure/empty.
     """
     try:
-        resp = requests.get(
+        resp = await async_get(
             _FINNHUB_NEWS_URL,
             params={"symbol": ticker, "from": start_date, "to": end_date, "token": api_key},
             timeout=10,
@@ -144,7 +270,7 @@ def _fetch_finnhub(
 # Layer 1b: You.com Search API
 # ---------------------------------------------------------------------------
 
-def _fetch_youcom(
+async def _fetch_youcom(
     ticker: str,
     company_name: str,
     start_date: str,
@@ -160,7 +286,7 @@ def _fetch_youcom(
     freshness = f"{start_date}to{end_date}"
 
     try:
-        resp = requests.get(
+        resp = await async_get(
             _YOUCOM_SEARCH_URL,
             headers={"X-API-Key": api_key},
             params={"query": query, "freshness": freshness, "count": _MAX_ARTICLES},
@@ -199,7 +325,7 @@ def _fetch_youcom(
 # Layer 2: Google News RSS (emergency fallback)
 # ---------------------------------------------------------------------------
 
-def _fetch_google_rss(
+async def _fetch_google_rss(
     ticker: str,
     company_name: str,
     start_date: str,
@@ -207,12 +333,18 @@ def _fetch_google_rss(
 ) -> list | None:
     """
     Query Google News RSS. Date filtering is best-effort (post-parse check).
+    The feed is downloaded on the shared client and parsed from bytes, so
+    feedparser never opens its own blocking connection.
     Returns normalised articles or None on failure/empty.
     """
     try:
         query = _build_query(ticker, company_name)
         url = _GOOGLE_NEWS_RSS.format(query=quote_plus(query))
-        feed = feedparser.parse(url)
+        resp = await async_get(url, timeout=10)
+        if resp.status_code != 200:
+            logger.warning("Google RSS returned HTTP %s", resp.status_code)
+            return None
+        feed = feedparser.parse(resp.content)
 
         if feed.bozo and not feed.entries:
             logger.warning("Google RSS feed parse error: %s", feed.bozo_exception)
@@ -258,30 +390,135 @@ def _fetch_google_rss(
 
 
 # ---------------------------------------------------------------------------
-# Relevance filter
+# Relevance ranking
 # ---------------------------------------------------------------------------
 
-def _filter_relevant_articles(
+def _company_aliases(company_name: str) -> set[str]:
+    """Lowercase names in a canonical company name: "Alphabet (Google)" → {"alphabet", "google"}."""
+    aliases = set()
+    for part in re.split(r"[()]", company_name or ""):
+        name = _CORPORATE_SUFFIX_RE.sub("", part.strip().casefold()).strip()
+        if name:
+            aliases.add(name)
+    return aliases
+
+
+def _entity_matchers(ticker: str, company_name: str) -> tuple[re.Pattern, re.Pattern | None, re.Pattern | None]:
+    """
+    Build (symbol, names, weak) patterns for a stock.
+
+    symbol matches the ticker case-sensitively as a word ("COIN", "$COIN"),
+    so tickers that are ordinary words do not match prose. Tickers of up to
+    _MAX_AMBIGUOUS_TICKER_LEN letters and those in _WORD_TICKERS still would
+    at the start of a sentence or in acronyms, so they need a marker: "$A",
+    "(A)" or "NYSE:A". names matches,
+    case-insensitively on word boundaries, the TICKER_LOOKUP names for the
+    ticker (other than the bare ticker key) and the resolved company name.
+    For stocks not in TICKER_LOOKUP, weak matches the company name's first
+    word ("Micron" for "Micron Technology") and scores lower.
+    """
+    ticker_upper = ticker.upper()
+    escaped = re.escape(ticker_upper)
+    if len(ticker_upper) <= _MAX_AMBIGUOUS_TICKER_LEN or ticker_upper in _WORD_TICKERS:
+        symbol = re.compile(
+            rf"(?:(?<![A-Za-z0-9])\${escaped}|\({escaped}\)|\b{_EXCHANGE_PREFIX}{escaped})(?![A-Za-z0-9])"
+        )
+    else:
+        symbol = re.compile(rf"(?<![A-Za-z0-9])\$?{escaped}(?![A-Za-z0-9])")
+
+    names = set()
+    for key, (lookup_ticker, canonical) in TICKER_LOOKUP.items():
+        if lookup_ticker == ticker_upper:
+            names |= _company_aliases(canonical)
+            if key != ticker_upper.casefold():
+                names.add(key)
+    known = bool(names)
+    if company_name and company_name.casefold() != ticker_upper.casefold():
+        names |= _company_aliases(company_name)
+
+    weak_words = set()
+    if not known:
+        first_words = {name.split()[0] for name in names if " " in name}
+        weak_words = {w for w in first_words if len(w) >= 4 and w not in names}
+
+    def _words(words: set[str]) -> re.Pattern | None:
+        if not words:
+            return None
+        alternation = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+        return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    return symbol, _words(names), _words(weak_words)
+
+
+def _source_weight(article: dict) -> float:
+    """Weight of the article's outlet, by URL host label or normalized source name."""
+    host = urlsplit(article.get("url") or "").hostname or ""
+    name = re.sub(r"[^a-z0-9]", "", (article.get("source_name") or "").casefold()).removeprefix("the")
+    candidates = set(host.split(".")) | {name}
+    return max((_SOURCE_WEIGHTS[c] for c in candidates if c in _SOURCE_WEIGHTS), default=_DEFAULT_SOURCE_WEIGHT)
+
+
+def _recency(published_date: str, start: datetime | None, end: datetime | None) -> float:
+    """Position of published_date in [start, end]: 0 at the start, 1 at the end, 0 if outside or unknown."""
+    if not (start and end and published_date):
+        return 0.0
+    try:
+        published = datetime.fromisoformat(published_date[:10])
+    except ValueError:
+        return 0.0
+    if not start <= published <= end:
+        return 0.0
+    span = (end - start).days
+    return (published - start).days / span if span else 1.0
+
+
+def _rank_articles(
     articles: list,
     ticker: str,
     company_name: str,
+    start_date: str,
+    end_date: str,
 ) -> list:
     """
-    Remove articles that don't mention the stock in their title or snippet.
-    Finnhub tags articles at sector level, so off-topic articles regularly appear.
+    Score articles for relevance to the stock and return those that mention
+    it, best first (ties keep provider order).
+
+    An article must mention the stock — its ticker symbol or one of its
+    names — in the title or snippet; Finnhub tags articles at sector level,
+    so off-topic articles regularly appear. The score adds:
+      title mention     _TITLE_MATCH_SCORE (half for a weak first-word match)
+      snippet mentions  _SNIPPET_MATCH_SCORE each, up to _MAX_SNIPPET_MATCHES
+      recency           up to _RECENCY_WEIGHT, by position in the window
+      source weight     _SOURCE_WEIGHTS, _DEFAULT_SOURCE_WEIGHT if unlisted
     """
     if not articles:
         return []
 
-    ticker_lower = ticker.lower()
-    company_lower = company_name.lower() if company_name else ticker_lower
-    company_primary = company_lower.split()[0] if company_lower else ticker_lower
+    symbol, names, weak = _entity_matchers(ticker, company_name)
+    try:
+        start, end = datetime.fromisoformat(start_date), datetime.fromisoformat(end_date)
+    except ValueError:
+        start = end = None
 
-    return [
-        a for a in articles
-        if ticker_lower in (a.get("title") or "").lower() + " " + (a.get("snippet") or "").lower()
-        or company_primary in (a.get("title") or "").lower() + " " + (a.get("snippet") or "").lower()
-    ]
+    def _mentions(text: str) -> tuple[int, int]:
+        strong = len(symbol.findall(text)) + (len(names.findall(text)) if names else 0)
+        return strong, len(weak.findall(text)) if weak else 0
+
+    scored = []
+    for i, article in enumerate(articles):
+        title_strong, title_weak = _mentions(article.get("title") or "")
+        snippet_strong, snippet_weak = _mentions(article.get("snippet") or "")
+        if not (title_strong or title_weak or snippet_strong or snippet_weak):
+            continue
+
+        score = _TITLE_MATCH_SCORE if title_strong else _TITLE_MATCH_SCORE / 2 if title_weak else 0.0
+        score += _SNIPPET_MATCH_SCORE * min(snippet_strong + snippet_weak / 2, _MAX_SNIPPET_MATCHES)
+        score += _RECENCY_WEIGHT * _recency(article.get("published_date") or "", start, end)
+        score += _source_weight(article)
+        scored.append((-score, i, article))
+
+    scored.sort(key=lambda item: item[:2])
+    return [article for _, _, article in scored]
 
 
 # ---------------------------------------------------------------------------
@@ -293,9 +530,102 @@ def _is_free_domain(url: str) -> bool:
     return any(domain in url for domain in _FREE_DOMAINS)
 
 
-def _enrich_with_firecrawl(article: dict, api_key: str) -> dict:
+class _ScrapeCache:
+    """
+    Scraped article text keyed by URL, zlib-compressed, with LRU eviction
+    once the compressed total exceeds max_bytes.
+
+    Each hit refreshes the entry's last_used time. The compressed total is
+    kept as a running count; a write that takes it over max_bytes evicts
+    the least recently used entries in one batch, down to
+    _SCRAPE_CACHE_EVICT_TO of the budget. The cache is best-effort: SQLite
+    errors are logged and it behaves as a miss.
+
+    One connection is shared across callers, guarded by a lock. Calls
+    block, so async code runs them via asyncio.to_thread.
     """
-    Fetch full article text via Firecrawl for a single free-domain article.
+
+    def __init__(self, path: str, max_bytes: int):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total: Optional[int] = None   # compressed bytes stored; None = recount
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS scrapes (
+                    url       TEXT PRIMARY KEY,
+                    markdown  BLOB NOT NULL,
+                    size      INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_scrapes_last_used ON scrapes (last_used);
+                """
+            )
+            self._conn = conn
+        if self._total is None:
+            self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scrapes").fetchone()[0]
+        return self._conn
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT markdown FROM scrapes WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    return None
+                with conn:
+                    conn.execute("UPDATE scrapes SET last_used = ? WHERE url = ?", (time.time(), url))
+                return zlib.decompress(row[0]).decode("utf-8")
+            except (sqlite3.Error, zlib.error) as e:
+                logger.warning("Firecrawl cache read failed for %s: %s", url, e)
+                return None
+
+    def put(self, url: str, markdown: str) -> None:
+        blob = zlib.compress(markdown.encode("utf-8"))
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    old = conn.execute("SELECT size FROM scrapes WHERE url = ?", (url,)).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO scrapes VALUES (?, ?, ?, ?)",
+                        (url, blob, len(blob), time.time()),
+                    )
+                    total = self._total + len(blob) - (old[0] if old else 0)
+                    if total > self._max_bytes:
+                        total = self._evict(conn, total)
+                self._total = total
+            except sqlite3.Error as e:
+                self._total = None
+                logger.warning("Firecrawl cache write failed for %s: %s", url, e)
+
+    def _evict(self, conn: sqlite3.Connection, total: int) -> int:
+        """Drop least recently used entries in one batch; returns the new total."""
+        target = int(self._max_bytes * _SCRAPE_CACHE_EVICT_TO)
+        victims = []
+        for url, size in conn.execute("SELECT url, size FROM scrapes ORDER BY last_used"):
+            if total <= target:
+                break
+            victims.append((url,))
+            total -= size
+        conn.executemany("DELETE FROM scrapes WHERE url = ?", victims)
+        return total
+
+
+_scrape_cache = _ScrapeCache(FIRECRAWL_CACHE_PATH, FIRECRAWL_CACHE_MAX_MB * 1024 * 1024)
+
+
+async def _enrich_with_firecrawl(article: dict, api_key: str) -> dict:
+    """
+    Fetch full article text via Firecrawl for a single free-domain article,
+    or from the scrape cache if the URL was scraped before.
     Returns the article with snippet replaced by full markdown text.
     Returns the original article unchanged on any failure.
     """
@@ -303,8 +633,12 @@ def _enrich_with_firecrawl(article: dict, api_key: str) -> dict:
     if not url or not _is_free_domain(url):
         return article
 
+    cached = await asyncio.to_thread(_scrape_cache.get, url)
+    if cached:
+        return {**article, "snippet": cached}
+
     try:
-        resp = requests.post(
+        resp = await async_post(
             _FIRECRAWL_SCRAPE_URL,
             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
             json={"url": url, "formats": ["markdown"]},
@@ -315,7 +649,9 @@ def _enrich_with_firecrawl(article: dict, api_key: str) -> dict:
 
         markdown = (resp.json().get("data") or {}).get("markdown") or ""
         if markdown:
-            return {**article, "snippet": markdown[:_FIRECRAWL_MAX_CHARS]}
+            markdown = markdown[:_FIRECRAWL_MAX_CHARS]
+            await asyncio.to_thread(_scrape_cache.put, url, markdown)
+            return {**article, "snippet": markdown}
         return article
 
     except Exception as e:
@@ -323,16 +659,16 @@ def _enrich_with_firecrawl(article: dict, api_key: str) -> dict:
         return article
 
 
-def _enrich_articles(articles: list, api_key: str | None) -> list:
+async def _enrich_articles(articles: list, api_key: str | None) -> list:
     """
-    Enrich free-domain articles with full text via Firecrawl (parallel).
+    Enrich free-domain articles with full text via Firecrawl (concurrent).
+    Concurrency is capped by the Firecrawl host limit in http_client.
     Skips enrichment entirely if no API key is configured.
     """
     if not api_key or not articles:
         return articles
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        enriched = list(executor.map(lambda a: _enrich_with_firecrawl(a, api_key), articles))
+    enriched = list(await asyncio.gather(*(_enrich_with_firecrawl(a, api_key) for a in articles)))
 
     enriched_count = sum(
         1 for orig, enr in zip(articles, enriched)
@@ -344,86 +680,503 @@ def _enrich_articles(articles: list, api_key: str | None) -> list:
     return enriched
 
 
+# ---------------------------------------------------------------------------
+# Near-duplicate clustering
+# ---------------------------------------------------------------------------
+
+def _simhash(article: dict) -> int | None:
+    """
+    64-bit SimHash over the words and adjacent word pairs of title + snippet,
+    or None if the text is too short to fingerprint.
+    """
+    words = _WORD_RE.findall(f"{article.get('title') or ''} {article.get('snippet') or ''}".casefold())
+    if len(words) < _SIMHASH_MIN_TOKENS:
+        return None
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _is_near_duplicate(a: int, b: int) -> bool:
+    return bin(a ^ b).count("1") <= _SIMHASH_MAX_DISTANCE
+
+
+def _collapse_near_duplicates(articles: list, known: list | None = None) -> list:
+    """
+    Keep one representative per cluster of near-duplicate articles, in the
+    position of the cluster's first article. The representative is the
+    first article unless it is not on a free domain and a later member is,
+    so the cluster can still be enriched. Articles matching one of `known`
+    (already kept elsewhere) are dropped.
+    """
+    known_prints = [fp for fp in map(_simhash, known or []) if fp is not None]
+    kept: list[dict] = []
+    prints: list[int | None] = []
+
+    for article in articles:
+        fp = _simhash(article)
+        if fp is not None and any(_is_near_duplicate(fp, k) for k in known_prints):
+            continue
+        match = None
+        if fp is not None:
+            match = next((i for i, p in enumerate(prints) if p is not None and _is_near_duplicate(fp, p)), None)
+        if match is None:
+            kept.append(article)
+            prints.append(fp)
+        elif not _is_free_domain(kept[match].get("url", "")) and _is_free_domain(article.get("url", "")):
+            kept[match] = article
+
+    if len(kept) < len(articles):
+        logger.info("_collapse_near_duplicates: %d → %d articles", len(articles), len(kept))
+    return kept
+
+
+# ---------------------------------------------------------------------------
+# Article store
+# ---------------------------------------------------------------------------
+
+def _next_day(date: str) -> str:
+    return (datetime.fromisoformat(date) + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _previous_day(date: str) -> str:
+    return (datetime.fromisoformat(date) - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _outside_range(gaps: list[tuple[str, str]], start: str, end: str) -> list[tuple[str, str]]:
+    """The parts of the inclusive gaps that fall outside [start, end]."""
+    try:
+        before, after = _previous_day(start), _next_day(end)
+    except ValueError:
+        return gaps
+    remaining = []
+    for gap_start, gap_end in gaps:
+        if gap_start < start:
+            remaining.append((gap_start, min(gap_end, before)))
+        if gap_end > end:
+            remaining.append((max(gap_start, after), gap_end))
+    return remaining
+
+
+class _ArticleStore:
+    """
+    Per-ticker store of news articles plus the date spans already fetched
+    for each provider set.
+
+    Callers pass inclusive [start, end] dates, as the providers take them.
+    Coverage is kept as half-open [start, end) day intervals — the same
+    convention as the daily-bar cache in data_fetcher — so adjacent spans
+    merge on write. Coverage is keyed by the providers configured for the
+    fetch: adding a Finnhub key later is a miss rather than a reason to keep
+    serving RSS results. Settled intervals never expire; recent and empty
+    ones carry an expiry time and drop out of missing_ranges once it passes.
+
+    A span fetched with truncated=True (a provider hit its article cap) is
+    recorded in news_exact_spans instead. It answers a query whose gaps
+    coalesce to exactly that span again, but not part of it: a week inside
+    a capped quarter may have articles the capped fetch never saw.
+
+    Articles are keyed by (url, ticker) and indexed on (ticker,
+    published_date). Their date is clamped into the span they were fetched
+    for, so a provider's timezone slop or a missing date never hides an
+    article from the query that fetched it.
+
+    One connection is shared across callers, guarded by a lock.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS news_articles (
+                    url            TEXT NOT NULL,
+                    ticker         TEXT NOT NULL,
+                    published_date TEXT NOT NULL,
+                    provider       TEXT NOT NULL,
+                    article        TEXT NOT NULL,
+                    PRIMARY KEY (url, ticker)
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_articles_ticker_date
+                    ON news_articles (ticker, published_date);
+                CREATE TABLE IF NOT EXISTS news_coverage (
+                    ticker     TEXT NOT NULL,
+                    sources    TEXT NOT NULL,
+                    start      TEXT NOT NULL,
+                    end        TEXT NOT NULL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_coverage_ticker
+                    ON news_coverage (ticker, sources);
+                CREATE TABLE IF NOT EXISTS news_exact_spans (
+                    ticker     TEXT NOT NULL,
+                    sources    TEXT NOT NULL,
+                    start      TEXT NOT NULL,
+                    end        TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (ticker, sources, start, end)
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def missing_ranges(self, ticker: str, sources: str, start: str, end: str) -> list[tuple[str, str]]:
+        """Return the inclusive sub-ranges of [start, end] not yet covered for ticker and sources."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT start, end FROM news_coverage "
+                "WHERE ticker = ? AND sources = ? AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY start",
+                (ticker, sources, now),
+            ).fetchall()
+            gaps = self._gaps(rows, start, end)
+            if gaps and conn.execute(
+                "SELECT 1 FROM news_exact_spans "
+                "WHERE ticker = ? AND sources = ? AND start = ? AND end = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (ticker, sources, gaps[0][0], _next_day(gaps[-1][1]), now),
+            ).fetchone():
+                return []
+        return gaps
+
+    @staticmethod
+    def _gaps(rows: list[tuple[str, str]], start: str, end: str) -> list[tuple[str, str]]:
+        """Inclusive sub-ranges of [start, end] outside the sorted half-open coverage rows."""
+        end_excl = _next_day(end)
+        gaps = []
+        cursor = start
+        for cov_start, cov_end in rows:
+            if cov_end <= cursor:
+                continue
+            if cov_start >= end_excl:
+                break
+            if cov_start > cursor:
+                gaps.append((cursor, _previous_day(cov_start)))
+            cursor = max(cursor, cov_end)
+            if cursor >= end_excl:
+                break
+        if cursor < end_excl:
+            gaps.append((cursor, end))
+        return gaps
+
+    def store(
+        self,
+        ticker: str,
+        sources: str,
+        start: str,
+        end: str,
+        articles: list[tuple[str, dict]],
+        complete: bool = True,
+        truncated: bool = False,
+    ) -> None:
+        """
+        Insert (provider, article) pairs fetched for [start, end] and mark the
+        span as covered. Articles already stored for the ticker keep their
+        first-seen provider and date; articles without a URL are not stored.
+
+        The span's last _RECENT_NEWS_DAYS days — or all of it, if nothing came
+        back or the fetch was cut short (complete=False) — are covered only
+        for NEWS_RECENT_TTL_SECONDS. A truncated span is recorded as an exact
+        span only (see the class docstring), on the same expiry rules.
+        """
+        rows = [
+            (a["url"], ticker, min(max(a.get("published_date") or end, start), end), provider, json.dumps(a))
+            for provider, a in articles
+            if a.get("url")
+        ]
+        end_excl = _next_day(end)
+        recent_start = (datetime.now() - timedelta(days=_RECENT_NEWS_DAYS - 1)).strftime("%Y-%m-%d")
+        settled_end = min(end_excl, recent_start) if articles and complete else start
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO news_articles VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("DELETE FROM news_coverage WHERE expires_at <= ?", (now,))
+                conn.execute("DELETE FROM news_exact_spans WHERE expires_at <= ?", (now,))
+                if truncated:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO news_exact_spans VALUES (?, ?, ?, ?, ?)",
+                        (ticker, sources, start, end_excl,
+                         None if settled_end >= end_excl else now + NEWS_RECENT_TTL_SECONDS),
+                    )
+                    return
+                if start < settled_end:
+                    self._merge_coverage(conn, ticker, sources, start, settled_end)
+                if max(start, settled_end) < end_excl:
+                    conn.execute(
+                        "INSERT INTO news_coverage VALUES (?, ?, ?, ?, ?)",
+                        (ticker, sources, max(start, settled_end), end_excl, now + NEWS_RECENT_TTL_SECONDS),
+                    )
+
+    @staticmethod
+    def _merge_coverage(conn: sqlite3.Connection, ticker: str, sources: str, start: str, end: str) -> None:
+        """Fold [start, end) into the settled coverage, merging touching intervals."""
+        overlapping = conn.execute(
+            "SELECT rowid, start, end FROM news_coverage "
+            "WHERE ticker = ? AND sources = ? AND expires_at IS NULL AND start <= ? AND end >= ?",
+            (ticker, sources, end, start),
+        ).fetchall()
+        for rowid, cov_start, cov_end in overlapping:
+            start = min(start, cov_start)
+            end = max(end, cov_end)
+            conn.execute("DELETE FROM news_coverage WHERE rowid = ?", (rowid,))
+        conn.execute(
+            "INSERT INTO news_coverage VALUES (?, ?, ?, ?, NULL)",
+            (ticker, sources, start, end),
+        )
+
+    def load(self, ticker: str, start: str, end: str) -> list[tuple[str, dict]]:
+        """Return (provider, article) pairs published in [start, end], newest first."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT provider, article FROM news_articles "
+                "WHERE ticker = ? AND published_date >= ? AND published_date <= ? "
+                "ORDER BY published_date DESC, rowid",
+                (ticker, start, end),
+            ).fetchall()
+        return [(provider, json.loads(article)) for provider, article in rows]
+
+
+_article_store = _ArticleStore(NEWS_STORE_PATH)
+
+
 # ---------------------------------------------------------------------------
 # Parallel fetch orchestrator
 # ---------------------------------------------------------------------------
 
-def _fetch_articles(
+def _source_set(finnhub_key: str | None, youcom_key: str | None) -> str:
+    """Label of the providers a fetch would query — the article store's coverage key."""
+    configured = [name for name, key in (("finnhub", finnhub_key), ("youcom", youcom_key)) if key]
+    return "+".join(configured) or "google_rss"
+
+
+async def _fetch_from_providers(
     ticker: str,
     company_name: str,
     start_date: str,
     end_date: str,
     finnhub_key: str | None,
     youcom_key: str | None,
-) -> tuple[list | None, str]:
+) -> tuple[list[tuple[str, dict]], bool]:
     """
-    Run Finnhub and You.com in parallel. Merge results, deduplicate by URL
-    (Finnhub order preserved). Fall back to Google RSS if both return nothing.
-    Returns (articles, source_label).
+    Fan out to the configured providers within NEWS_FETCH_BUDGET_SECONDS.
+
+    Finnhub and You.com start at once. Google RSS starts when Layer 1 has
+    produced nothing after NEWS_RSS_HEDGE_SECONDS, or as soon as every
+    Layer 1 provider has answered empty. Returns once _MAX_ARTICLES relevant
+    Layer 1 articles have arrived, once Layer 1 has answered with articles,
+    once every started provider has answered, or at the deadline —
+    cancelling whatever is still running.
+
+    Returns ((provider, article) pairs, complete). Layer 1 articles come
+    first, Finnhub before You.com; RSS articles are returned only when
+    Layer 1 has none. complete is False when a provider whose answer counts
+    was still running at return — a Layer 1 provider cut off by the
+    deadline or cancelled by the early return, or the RSS hedge when Layer 1
+    has nothing — so the span is not stored as settled coverage. An RSS
+    hedge still running once Layer 1 has answered in full does not count.
     """
-    finnhub_articles = None
-    youcom_articles = None
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + NEWS_FETCH_BUDGET_SECONDS
+    hedge_at = started + NEWS_RSS_HEDGE_SECONDS
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        fh_future = (
-            executor.submit(_fetch_finnhub, ticker, start_date, end_date, finnhub_key)
-            if finnhub_key else None
-        )
-        ydc_future = (
-            executor.submit(_fetch_youcom, ticker, company_name, start_date, end_date, youcom_key)
-            if youcom_key else None
-        )
+    tasks: dict[asyncio.Task, str] = {}
+    if finnhub_key:
+        tasks[asyncio.create_task(_fetch_finnhub(ticker, start_date, end_date, finnhub_key))] = "finnhub"
+    if youcom_key:
+        tasks[asyncio.create_task(_fetch_youcom(ticker, company_name, start_date, end_date, youcom_key))] = "youcom"
+    results: dict[str, list] = {}
 
-        if fh_future:
-            try:
-                finnhub_articles = fh_future.result()
-            except Exception as e:
-                logger.warning("Finnhub parallel fetch error: %s", e)
+    def _layer1() -> list[tuple[str, dict]]:
+        return [(p, a) for p in _LAYER1_PROVIDERS for a in results.get(p, [])]
 
-        if ydc_future:
-            try:
-                youcom_articles = ydc_future.result()
-            except Exception as e:
-                logger.warning("You.com parallel fetch error: %s", e)
+    try:
+        while True:
+            pending = {t for t in tasks if not t.done()}
+            layer1_pending = any(tasks[t] != "google_rss" for t in pending)
+            layer1 = _layer1()
+
+            if layer1 and (
+                not layer1_pending
+                or len(_rank_articles([a for _, a in layer1], ticker, company_name, start_date, end_date)) >= _MAX_ARTICLES
+            ):
+                break
+            hedging = not layer1 and "google_rss" not in tasks.values()
+            if hedging and (not layer1_pending or loop.time() >= hedge_at):
+                task = asyncio.create_task(_fetch_google_rss(ticker, company_name, start_date, end_date))
+                tasks[task] = "google_rss"
+                pending.add(task)
+                hedging = False
+            if not pending:
+                break
+
+            now = loop.time()
+            if now >= deadline:
+                logger.warning(
+                    "_fetch_articles %s: %.1fs budget spent; cancelling %s",
+                    ticker, NEWS_FETCH_BUDGET_SECONDS, "+".join(sorted(tasks[t] for t in pending)),
+                )
+                break
+            wake_at = min(hedge_at, deadline) if hedging else deadline
+            done, _ = await asyncio.wait(pending, timeout=wake_at - now, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                provider = tasks[task]
+                if task.exception() is not None:
+                    logger.warning("%s parallel fetch error: %s", provider, task.exception())
+                    results[provider] = []
+                else:
+                    results[provider] = task.result() or []
+    finally:
+        layer1_done = all(t.done() for t, p in tasks.items() if p != "google_rss")
+        rss_done = all(t.done() for t, p in tasks.items() if p == "google_rss")
+        complete = layer1_done and (bool(_layer1()) or rss_done)
+        for task in tasks:
+            task.cancel()
+
+    layer1 = _layer1()
+    if layer1:
+        return layer1, complete
+    return [("google_rss", a) for a in results.get("google_rss", [])], complete
+
+
+def _hit_article_cap(tagged: list[tuple[str, dict]]) -> bool:
+    """True if any provider returned _MAX_ARTICLES articles — its answer may have been cut short."""
+    counts: dict[str, int] = {}
+    for provider, _ in tagged:
+        counts[provider] = counts.get(provider, 0) + 1
+    return any(n >= _MAX_ARTICLES for n in counts.values())
+
+
+def _merge_articles(tagged: list[tuple[str, dict]]) -> tuple[list | None, str]:
+    """
+    Merge (provider, article) pairs: Finnhub then You.com, at most
+    _MAX_ARTICLES each, deduplicated by URL (first seen wins). Google RSS
+    articles are used only when neither Layer 1 provider has any.
+    Returns (articles, source_label).
+    """
+    by_provider: dict[str, list[dict]] = {}
+    for provider, article in tagged:
+        by_provider.setdefault(provider, []).append(article)
+
+    sources_used = [p for p in _LAYER1_PROVIDERS if by_provider.get(p)]
+    if not sources_used and by_provider.get("google_rss"):
+        sources_used = ["google_rss"]
 
-    # Merge, dedup by URL
     merged = []
     seen_urls: set[str] = set()
-    sources_used = []
+    for provider in sources_used:
+        for a in by_provider[provider][:_MAX_ARTICLES]:
+            url = a.get("url", "")
+            if url not in seen_urls:
+                seen_urls.add(url)
+                merged.append(a)
+
+    if not merged:
+        return None, "none"
+    return merged, "+".join(sources_used)
+
 
-    for source_name, articles in [("finnhub", finnhub_articles), ("youcom", youcom_articles)]:
-        if articles:
-            sources_used.append(source_name)
-            for a in articles:
-                url = a.get("url", "")
-                if url not in seen_urls:
-                    seen_urls.add(url)
-                    merged.append(a)
+async def _fetch_articles(
+    ticker: str,
+    company_name: str,
+    start_date: str,
+    end_date: str,
+    finnhub_key: str | None,
+    youcom_key: str | None,
+) -> tuple[list | None, str]:
+    """
+    Return merged articles for [start_date, end_date], serving what the
+    article store already covers and fetching only the uncovered span.
+
+    All gaps are coalesced into one provider fetch spanning the first gap
+    start to the last gap end. If the store itself is broken (unwritable
+    path, corrupt file) or the dates do not parse, providers are queried
+    directly for the whole range. Store calls run in a worker thread so
+    SQLite I/O does not block the event loop.
+    Returns (articles, source_label).
+    """
+    store_ticker = ticker.upper()
+    sources = _source_set(finnhub_key, youcom_key)
 
-    if merged:
-        label = "+".join(sources_used)
-        logger.info("_fetch_articles [%s] → %d merged articles", label, len(merged))
-        return merged, label
+    try:
+        gaps = await asyncio.to_thread(_article_store.missing_ranges, store_ticker, sources, start_date, end_date)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.warning("news store unavailable (%s); fetching %s directly", e, ticker)
+        fetched, _ = await _fetch_from_providers(
+            ticker, company_name, start_date, end_date, finnhub_key, youcom_key,
+        )
+        return _merge_articles(fetched)
 
-    # Fall back to Google RSS
-    rss = _fetch_google_rss(ticker, company_name, start_date, end_date)
-    if rss:
-        logger.info("_fetch_articles [google_rss] → %d articles", len(rss))
-        return rss, "google_rss"
+    fetched: list[tuple[str, dict]] = []
+    if gaps:
+        fetch_start, fetch_end = gaps[0][0], gaps[-1][1]
+        fetched, complete = await _fetch_from_providers(
+            ticker, company_name, fetch_start, fetch_end, finnhub_key, youcom_key,
+        )
+        try:
+            await asyncio.to_thread(
+                _article_store.store, store_ticker, sources, fetch_start, fetch_end, fetched, complete,
+                _hit_article_cap(fetched),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("news store write failed for %s: %s", ticker, e)
+            return _merge_articles(fetched)
+        logger.debug(
+            "_fetch_articles %s: fetched %s to %s (%d gap(s))",
+            ticker, fetch_start, fetch_end, len(gaps),
+        )
+    else:
+        logger.debug("_fetch_articles %s: store hit %s to %s", ticker, start_date, end_date)
 
-    return None, "none"
+    try:
+        stored = await asyncio.to_thread(_article_store.load, store_ticker, start_date, end_date)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("news store read failed for %s: %s", ticker, e)
+        stored = fetched
+
+    articles, label = _merge_articles(stored)
+    if articles:
+        logger.info("_fetch_articles [%s] → %d merged articles", label, len(articles))
+    return articles, label
 
 
 # ---------------------------------------------------------------------------
 # Node function
 # ---------------------------------------------------------------------------
 
-def retrieve_news(state: AgentState) -> AgentState:
+async def retrieve_news(state: AgentState) -> AgentState:
     """
     Fetch news articles for the given ticker and date range.
-    Runs Finnhub + You.com in parallel, falls back to Google RSS.
-    Enriches free-domain articles with full text via Firecrawl.
-    Appends current-snapshot articles if include_current_snapshot is True.
+    Runs Finnhub + You.com in parallel, falls back to Google RSS; spans the
+    article store already covers are served without provider calls.
+    Ranks articles by relevance, collapses near-duplicates and keeps the
+    top _MAX_RANKED_ARTICLES, then enriches free-domain articles with full
+    text via Firecrawl.
+    Appends current-snapshot articles if include_current_snapshot is True;
+    the parts of the snapshot window that neither the article store nor the
+    historical range cover are fetched concurrently with it.
     """
     ticker = state.get("ticker", "")
     company_name = state.get("company_name", ticker)
@@ -437,34 +1190,60 @@ def retrieve_news(state: AgentState) -> AgentState:
         youcom_key = _get_youcom_key(user_config)
         firecrawl_key = _get_firecrawl_key(user_config)
 
-        articles, source_used = _fetch_articles(
-            ticker, company_name, start_date, end_date, finnhub_key, youcom_key
-        )
+        fetches = [
+            _fetch_articles(ticker, company_name, start_date, end_date, finnhub_key, youcom_key),
+        ]
+        # Current snapshot — last 7 days. The spans of it that the article
+        # store lacks and the historical fetch will not cover are fetched
+        # alongside it; the rest is read from the store once both land.
+        if include_current:
+            today = datetime.now().strftime("%Y-%m-%d")
+            snapshot_start = (datetime.now() - timedelta(days=_CURRENT_SNAPSHOT_DAYS)).strftime("%Y-%m-%d")
+            whole_snapshot = [(snapshot_start, today)]
+            try:
+                snapshot_gaps = await asyncio.to_thread(
+                    _article_store.missing_ranges,
+                    ticker.upper(), _source_set(finnhub_key, youcom_key), snapshot_start, today,
+                )
+                snapshot_gaps = _outside_range(snapshot_gaps, start_date, end_date)
+            except (sqlite3.Error, OSError, ValueError):
+                snapshot_gaps = whole_snapshot   # _fetch_articles logs and fetches directly
+            fetches.extend(
+                _fetch_articles(ticker, company_name, gap_start, gap_end, finnhub_key, youcom_key)
+                for gap_start, gap_end in snapshot_gaps
+            )
+
+        results = await asyncio.gather(*fetches)
+        articles, source_used = results[0]
+        if include_current:
+            if snapshot_gaps == whole_snapshot:
+                snapshot_articles, _ = results[1]
+            else:
+                # Every uncovered span was fetched above, so this reads the store.
+                snapshot_articles, _ = await _fetch_articles(
+                    ticker, company_name, snapshot_start, today, finnhub_key, youcom_key,
+                )
 
         if articles is None:
             articles = []
             logger.warning("retrieve_news: all sources returned no articles")
 
-        articles = _filter_relevant_articles(articles, ticker, company_name)
-        articles = _enrich_articles(articles, firecrawl_key)
-        logger.info("retrieve_news: %d relevant articles after filter+enrich", len(articles))
+        articles = _rank_articles(articles, ticker, company_name, start_date, end_date)
+        articles = _collapse_near_duplicates(articles)[:_MAX_RANKED_ARTICLES]
+        unenriched = articles
+        articles = await _enrich_articles(articles, firecrawl_key)
+        logger.info("retrieve_news: %d relevant articles after rank+enrich", len(articles))
 
-        # Current snapshot — append last 7 days if requested
         if include_current:
-            today = datetime.now().strftime("%Y-%m-%d")
-            snapshot_start = (datetime.now() - timedelta(days=_CURRENT_SNAPSHOT_DAYS)).strftime("%Y-%m-%d")
-
-            snapshot_articles, _ = _fetch_articles(
-                ticker, company_name, snapshot_start, today, finnhub_key, youcom_key
-            )
-
             if snapshot_articles:
-                snapshot_articles = _filter_relevant_articles(snapshot_articles, ticker, company_name)
-                snapshot_articles = _enrich_articles(snapshot_articles, firecrawl_key)
                 existing_urls = {a["url"] for a in articles}
-                for a in snapshot_articles:
-                    if a["url"] not in existing_urls:
-                        articles.append(a)
+                snapshot_articles = [
+                    a for a in _rank_articles(snapshot_articles, ticker, company_name, snapshot_start, today)
+                    if a["url"] not in existing_urls
+                ]
+                snapshot_articles = _collapse_near_duplicates(snapshot_articles, known=unenriched)[:_MAX_RANKED_ARTICLES]
+                snapshot_articles = await _enrich_articles(snapshot_articles, firecrawl_key)
+                articles.extend(snapshot_articles)
                 logger.info(
                     "retrieve_news: appended %d current-snapshot articles",
                     len(snapshot_articles),
@@ -11,6 +11,15 @@ Fetches the options chain from yfinance and produces a structured summary:
   - Max Pain strike (where total option buyer loss is maximized at expiry)
   - Black-Scholes Greeks for the at-the-money option (nearest expiry)
   - Average implied volatility across the chain
+  - Volatility surface summary across the next SURFACE_EXPIRIES expiries:
+    ATM IV term structure and 25-delta skew per expiry
+
+Surface mode:
+  The nearest SURFACE_EXPIRIES chains are fetched concurrently on a shared
+  thread pool, so wall time stays close to a single-expiry fetch. Greeks
+  for every strike of every chain are computed in one array-based
+  Black-Scholes pass (_black_scholes_greeks_array) rather than a scalar
+  call per contract. Set SURFACE_EXPIRIES to 1 to skip the surface.
 
 Greeks are calculated via Black-Scholes using the implied volatility already
 embedded in the yfinance chain — no paid data source required. The risk-free
@@ -21,13 +30,17 @@ No LLM calls in this node — pure data retrieval and arithmetic.
 
 import logging
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.timing import submit_timed, timed_call
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +50,24 @@ TOP_N_STRIKES = 5
 # Risk-free rate used in Black-Scholes (approximate 10-year treasury)
 RISK_FREE_RATE = 0.05
 
+# Relative tolerance when comparing Max Pain totals (see _calculate_max_pain)
+_MAX_PAIN_RTOL = 1e-12
+
+# Number of nearest expiries included in the volatility surface summary
+SURFACE_EXPIRIES = int(os.getenv("OPTIONS_SURFACE_EXPIRIES", "4"))
+
+# Contracts quoted below this IV are stale/illiquid quotes, not a real vol
+_MIN_SURFACE_IV = 0.01
+
+# Target |delta| for the skew measure (25-delta risk reversal)
+_SKEW_DELTA = 0.25
+
+# Relative ATM IV change between first and last expiry treated as "flat"
+_FLAT_TERM_STRUCTURE = 0.02
+
+# Shared pool for concurrent option_chain() fetches (one thread per expiry)
+_chain_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yf-options")
+
 
 # ---------------------------------------------------------------------------
 # Black-Scholes helpers
@@ -102,6 +133,78 @@ def _black_scholes_greeks(
     }
 
 
+def _normal_cdf_array(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal CDF for an array, via a Chebyshev-fitted erfc
+    (Numerical Recipes erfcc, fractional error < 1.2e-7) — numpy has no
+    erfc and scipy is not a dependency.
+    """
+    z = -np.asarray(x, dtype=float) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.5 * np.abs(z))
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(poly)
+    erfc = np.where(z >= 0, erfc, 2.0 - erfc)
+    return 0.5 * erfc
+
+
+def _black_scholes_greeks_array(
+    S: float,
+    K: np.ndarray,
+    T: np.ndarray,
+    sigma: np.ndarray,
+    option_type: str = "call",
+    r: float = RISK_FREE_RATE,
+) -> dict:
+    """
+    Array version of _black_scholes_greeks: one pass over every contract.
+
+    K, T and sigma broadcast against each other (T may be a scalar).
+    Returns dict of float arrays (delta, gamma, theta, vega), unrounded,
+    with NaN wherever the scalar version would return None.
+    """
+    K = np.asarray(K, dtype=float)
+    T = np.asarray(T, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    K, T, sigma = np.broadcast_arrays(K, T, sigma)
+
+    valid = (T > 0) & (sigma > 0) & (K > 0) & ~np.isnan(sigma) & (S > 0)
+    # Substitute harmless values for invalid rows so the math stays finite,
+    # then mask them back to NaN at the end.
+    K_ = np.where(valid, K, 1.0)
+    T_ = np.where(valid, T, 1.0)
+    sig_ = np.where(valid, sigma, 1.0)
+
+    sqrt_T = np.sqrt(T_)
+    d1 = (np.log(S / K_) + (r + 0.5 * sig_ ** 2) * T_) / (sig_ * sqrt_T)
+    d2 = d1 - sig_ * sqrt_T
+
+    nd1 = _normal_cdf_array(d1)
+    nd2 = _normal_cdf_array(d2)
+    npd1 = np.exp(-0.5 * d1 ** 2) / math.sqrt(2 * math.pi)
+    discount = r * K_ * np.exp(-r * T_)
+
+    if option_type == "call":
+        delta = nd1
+        theta_rhs = discount * nd2
+    else:
+        delta = nd1 - 1.0
+        theta_rhs = discount * (1 - nd2)
+
+    gamma = npd1 / (S * sig_ * sqrt_T)
+    theta = ((-S * npd1 * sig_) / (2 * sqrt_T) - theta_rhs) / 365
+    vega = S * npd1 * sqrt_T / 100
+
+    nan = np.full(K.shape, np.nan)
+    return {
+        "delta": np.where(valid, delta, nan),
+        "gamma": np.where(valid, gamma, nan),
+        "theta": np.where(valid, theta, nan),
+        "vega": np.where(valid, vega, nan),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Max Pain helper
 # ---------------------------------------------------------------------------
@@ -117,47 +220,223 @@ def _calculate_max_pain(calls_df: pd.DataFrame, puts_df: pd.DataFrame) -> Option
       - Sum (K - P) * OI for all puts  where P < K  (in-the-money puts)
     The strike that minimizes the combined total is Max Pain.
 
+    Computed in one vectorized pass with prefix sums instead of a Python
+    loop per candidate strike. With contracts sorted by strike and
+    cumulative sums of OI and K * OI:
+      call gain(P) = P * sum(OI | K < P) - sum(K * OI | K < P)
+      put gain(P)  = sum(K * OI | K > P) - P * sum(OI | K > P)
+    Each candidate then needs one searchsorted lookup, so the whole chain is
+    O(n log n). Rows with zero/NaN OI or a NaN strike contribute nothing,
+    and ties resolve to the lowest strike, as in the original loop.
+
     Returns the Max Pain strike as a float, or None if data is insufficient.
     """
     try:
-        all_strikes = sorted(
-            set(list(calls_df["strike"].dropna())) |
-            set(list(puts_df["strike"].dropna()))
+        candidates = np.union1d(
+            calls_df["strike"].dropna().to_numpy(dtype=float),
+            puts_df["strike"].dropna().to_numpy(dtype=float),
         )
-        if not all_strikes:
+        if candidates.size == 0:
             return None
 
-        call_strikes = calls_df["strike"].tolist()
-        call_oi = calls_df["openInterest"].tolist()
-        put_strikes = puts_df["strike"].tolist()
-        put_oi = puts_df["openInterest"].tolist()
-
-        min_total = float("inf")
-        max_pain_strike = None
-
-        for P in all_strikes:
-            call_buyer_gain = sum(
-                max(0.0, P - K) * oi
-                for K, oi in zip(call_strikes, call_oi)
-                if oi and not math.isnan(oi)
-            )
-            put_buyer_gain = sum(
-                max(0.0, K - P) * oi
-                for K, oi in zip(put_strikes, put_oi)
-                if oi and not math.isnan(oi)
-            )
-            total = call_buyer_gain + put_buyer_gain
-            if total < min_total:
-                min_total = total
-                max_pain_strike = P
-
-        return float(max_pain_strike) if max_pain_strike is not None else None
+        total = _call_buyer_gain(candidates, calls_df) + _put_buyer_gain(candidates, puts_df)
+        # Lowest strike among minima; the tolerance absorbs summation-order
+        # rounding so mathematically tied totals don't break ties by noise.
+        floor = total.min()
+        return float(candidates[np.flatnonzero(total <= floor + _MAX_PAIN_RTOL * max(1.0, abs(floor)))[0]])
 
     except Exception as e:
         logger.warning("_calculate_max_pain failed: %s", e)
         return None
 
 
+def _weighted_strikes(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return (sorted strikes, prefix sums of OI, prefix sums of K * OI) for the
+    contracts that carry open interest. Prefix arrays have a leading zero.
+    """
+    strikes = pd.to_numeric(df["strike"], errors="coerce").to_numpy(dtype=float)
+    oi = pd.to_numeric(df["openInterest"], errors="coerce").to_numpy(dtype=float)
+    keep = ~np.isnan(strikes) & ~np.isnan(oi) & (oi != 0)
+    strikes, oi = strikes[keep], oi[keep]
+
+    order = np.argsort(strikes, kind="stable")
+    strikes, oi = strikes[order], oi[order]
+    cum_oi = np.concatenate(([0.0], np.cumsum(oi)))
+    cum_koi = np.concatenate(([0.0], np.cumsum(strikes * oi)))
+    return strikes, cum_oi, cum_koi
+
+
+def _call_buyer_gain(candidates: np.ndarray, calls_df: pd.DataFrame) -> np.ndarray:
+    strikes, cum_oi, cum_koi = _weighted_strikes(calls_df)
+    below = np.searchsorted(strikes, candidates, side="left")   # contracts with K < P
+    return candidates * cum_oi[below] - cum_koi[below]
+
+
+def _put_buyer_gain(candidates: np.ndarray, puts_df: pd.DataFrame) -> np.ndarray:
+    strikes, cum_oi, cum_koi = _weighted_strikes(puts_df)
+    at_or_below = np.searchsorted(strikes, candidates, side="right")   # contracts with K <= P
+    return (cum_koi[-1] - cum_koi[at_or_below]) - candidates * (cum_oi[-1] - cum_oi[at_or_below])
+
+
+# ---------------------------------------------------------------------------
+# Volatility surface helpers
+# ---------------------------------------------------------------------------
+
+def _years_to_expiry(expiry: str) -> float:
+    """Time to expiry in years, floored at 0.001 (same rule as the ATM Greeks)."""
+    try:
+        expiry_dt = datetime.strptime(expiry, "%Y-%m-%d")
+        return max((expiry_dt - datetime.now()).days / 365.0, 0.001)
+    except Exception:
+        return 0.0
+
+
+def _fetch_chains(stock, expiries: list[str]) -> dict:
+    """
+    Fetch option chains for several expiries concurrently.
+
+    The first expiry is required — its exception propagates so the node
+    reports it. Later expiries are best-effort: failures are logged and the
+    expiry is left out of the result.
+    """
+    futures = {
+        expiry: submit_timed(_chain_pool, "yfinance.option_chain", stock.option_chain, expiry)
+        for expiry in expiries
+    }
+    chains = {expiries[0]: futures[expiries[0]].result()}
+    for expiry in expiries[1:]:
+        try:
+            chains[expiry] = futures[expiry].result()
+        except Exception as e:
+            logger.warning("analyze_options: option_chain(%s) failed: %s", expiry, e)
+    return chains
+
+
+def _mid_prices(df: pd.DataFrame) -> pd.Series:
+    """Bid/ask midpoint, falling back to lastPrice when either side is unquoted."""
+    bid = pd.to_numeric(df["bid"], errors="coerce")
+    ask = pd.to_numeric(df["ask"], errors="coerce")
+    last = pd.to_numeric(df["lastPrice"], errors="coerce")
+    mid = ((bid + ask) / 2).where((bid > 0) & (ask > 0))
+    return mid.fillna(last)
+
+
+def _implied_spot(calls: pd.DataFrame, puts: pd.DataFrame, T: float, r: float = RISK_FREE_RATE) -> Optional[float]:
+    """
+    Estimate the underlying price from put-call parity (S = C - P + K·e^(-rT))
+    at the common strike where |C - P| is smallest. Used when price_data has
+    no close_price — the options_view path does not run Node 4.
+    """
+    c = pd.DataFrame({"strike": calls["strike"], "call": _mid_prices(calls)})
+    p = pd.DataFrame({"strike": puts["strike"], "put": _mid_prices(puts)})
+    both = c.merge(p, on="strike").dropna()
+    if both.empty:
+        return None
+    row = both.iloc[(both["call"] - both["put"]).abs().argmin()]
+    spot = float(row["call"] - row["put"] + row["strike"] * math.exp(-r * T))
+    return spot if spot > 0 else None
+
+
+def _side_surface(df: pd.DataFrame, S: float, T: float, option_type: str) -> dict:
+    """Strikes, IVs and array Greeks for one side of one chain (liquid IVs only)."""
+    strikes = pd.to_numeric(df["strike"], errors="coerce").to_numpy(dtype=float)
+    ivs = pd.to_numeric(df["impliedVolatility"], errors="coerce").to_numpy(dtype=float)
+    keep = ~np.isnan(strikes) & (ivs >= _MIN_SURFACE_IV)
+    strikes, ivs = strikes[keep], ivs[keep]
+    greeks = _black_scholes_greeks_array(S, strikes, T, ivs, option_type)
+    return {"strike": strikes, "iv": ivs, **greeks}
+
+
+def _iv_nearest(side: dict, key: str, target: float) -> Optional[float]:
+    """IV of the contract whose `key` value (strike or delta) is closest to target."""
+    values = side[key]
+    ok = ~np.isnan(values)
+    if not ok.any():
+        return None
+    idx = np.flatnonzero(ok)[np.argmin(np.abs(values[ok] - target))]
+    return float(side["iv"][idx])
+
+
+def _expiry_surface(expiry: str, chain, S: float) -> Optional[dict]:
+    """ATM IV and 25-delta skew for one expiry, or None if the chain is unusable."""
+    T = _years_to_expiry(expiry)
+    if T <= 0:
+        return None
+
+    calls = _side_surface(chain.calls, S, T, "call")
+    puts = _side_surface(chain.puts, S, T, "put")
+
+    atm_ivs = [iv for iv in (_iv_nearest(calls, "strike", S), _iv_nearest(puts, "strike", S)) if iv is not None]
+    if not atm_ivs:
+        return None
+    atm_iv = sum(atm_ivs) / len(atm_ivs)
+
+    call_25d_iv = _iv_nearest(calls, "delta", _SKEW_DELTA)
+    put_25d_iv = _iv_nearest(puts, "delta", -_SKEW_DELTA)
+    risk_reversal = (
+        round(put_25d_iv - call_25d_iv, 4)
+        if put_25d_iv is not None and call_25d_iv is not None
+        else None
+    )
+
+    return {
+        "expiry": expiry,
+        "days_to_expiry": round(T * 365),
+        "atm_iv": round(atm_iv, 4),
+        "call_25d_iv": round(call_25d_iv, 4) if call_25d_iv is not None else None,
+        "put_25d_iv": round(put_25d_iv, 4) if put_25d_iv is not None else None,
+        "risk_reversal_25d": risk_reversal,
+        "contracts_priced": int(calls["strike"].size + puts["strike"].size),
+    }
+
+
+def _build_surface(chains: dict, S: Optional[float]) -> Optional[dict]:
+    """
+    Summarise the volatility surface across the fetched expiries.
+
+    Returns:
+      spot, spot_source ("price_data" or "put_call_parity"),
+      term_structure: [{expiry, days_to_expiry, atm_iv}, ...] (nearest first)
+      skew:           [{expiry, call_25d_iv, put_25d_iv, risk_reversal_25d}, ...]
+      term_structure_shape: "contango" | "backwardation" | "flat"
+      term_structure_slope: last ATM IV minus first ATM IV
+    or None when no expiry yields a usable ATM IV.
+    """
+    expiries = list(chains)
+    spot_source = "price_data"
+    if S is None:
+        first = chains[expiries[0]]
+        S = _implied_spot(first.calls, first.puts, _years_to_expiry(expiries[0]))
+        spot_source = "put_call_parity"
+    if S is None:
+        return None
+
+    rows = [row for row in (_expiry_surface(e, chains[e], S) for e in expiries) if row]
+    if not rows:
+        return None
+
+    slope = rows[-1]["atm_iv"] - rows[0]["atm_iv"]
+    if len(rows) < 2 or abs(slope) <= _FLAT_TERM_STRUCTURE * rows[0]["atm_iv"]:
+        shape = "flat"
+    else:
+        shape = "contango" if slope > 0 else "backwardation"
+
+    return {
+        "spot": round(S, 2),
+        "spot_source": spot_source,
+        "term_structure": [
+            {k: r[k] for k in ("expiry", "days_to_expiry", "atm_iv")} for r in rows
+        ],
+        "skew": [
+            {k: r[k] for k in ("expiry", "call_25d_iv", "put_25d_iv", "risk_reversal_25d")} for r in rows
+        ],
+        "term_structure_shape": shape,
+        "term_structure_slope": round(slope, 4),
+        "contracts_priced": sum(r["contracts_priced"] for r in rows),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Node function
 # ---------------------------------------------------------------------------
@@ -175,16 +454,19 @@ def analyze_options(state: AgentState) -> AgentState:
 
     try:
         stock = yf.Ticker(ticker)
-        expiry_dates = stock.options
+        with timed_call("yfinance.options"):
+            expiry_dates = stock.options
 
         if not expiry_dates:
             msg = f"No options expiry dates available for {ticker}"
             logger.warning(msg)
             return {**state, "options_data": None, "options_error": msg}
 
-        # Use nearest expiry for Greeks and Max Pain; aggregate all for totals
+        # Use nearest expiry for Greeks and Max Pain; the next few expiries
+        # (fetched concurrently) feed the volatility surface summary.
         target_expiry = expiry_dates[0]
-        chain = stock.option_chain(target_expiry)
+        chains = _fetch_chains(stock, list(expiry_dates[:max(SURFACE_EXPIRIES, 1)]))
+        chain = chains[target_expiry]
         calls = chain.calls
         puts = chain.puts
 
@@ -255,6 +537,16 @@ def analyze_options(state: AgentState) -> AgentState:
                         "put": _black_scholes_greeks(S, K, T, sigma, "put"),
                     }
 
+        # ------------------------------------------------------------------
+        # Volatility surface (term structure + skew across expiries)
+        # ------------------------------------------------------------------
+        surface = None
+        if SURFACE_EXPIRIES > 1:
+            try:
+                surface = _build_surface(chains, S)
+            except Exception as e:
+                logger.warning("analyze_options: surface summary failed for %s: %s", ticker, e)
+
         # ------------------------------------------------------------------
         # Assemble options_data
         # ------------------------------------------------------------------
@@ -268,6 +560,7 @@ def analyze_options(state: AgentState) -> AgentState:
             "average_implied_volatility": avg_iv,
             "max_pain": max_pain,
             "greeks_sample": greeks_sample,
+            "volatility_surface": surface,
             "notable_positions": [],
         }
 
@@ -2,45 +2,140 @@
 Node 7: RAG Retriever (SEC Filings via ChromaDB + Google Gemini Embeddings)
 
 Reads:  ticker, start_date, end_date, user_message
-Writes: filing_chunks, filing_ingested, filing_error
+Writes: filing_chunks, filing_ingested, filing_ingestion_pending, filing_error
 
 Retrieval workflow:
   1. Embed user_message with Google Gemini text-embedding-004.
-  2. Query ChromaDB with ticker metadata filter + semantic search (top 5).
-  3. If results → return them (filing_ingested=False).
-  4. If empty → call SEC EDGAR to find 10-K/10-Q filings that cover the date
-     range.  If filings exist, download and ingest them, then re-query.
-  5. If no EDGAR filings match → return empty list (not an error).
-
-Ingestion workflow (on-demand, first-time only):
-  Download filing HTML → strip tags → chunk (≈600 tokens, 100-token overlap)
-  → batch-embed with Gemini → store in ChromaDB with metadata for deduplication.
-
-Chunk IDs: {ticker}-{filing_type}-{period}-chunk-{N:03d}
-  e.g. NVDA-10Q-2024Q2-chunk-014 — ChromaDB treats duplicate IDs as no-ops.
+  2. Query ChromaDB with a ticker + filing-period metadata filter and
+     semantic search, and the local BM25 index with the same filter; fuse
+     the two rankings (adaptive top-k, 5 by default).
+  3. If results → return them (filing_ingested=False), with
+     filing_ingestion_pending=True while another job for the ticker (a
+     different date range or the watchlist) is still running.
+  4. If empty → queue a background ingestion job for the ticker/date range
+     and wait up to RAG_INGEST_WAIT_SECONDS (default 0) for it. A job that
+     finishes in time is followed by a re-query; otherwise the node returns
+     the (empty) result at once with filing_ingestion_pending=True.
+  5. If no EDGAR filings match → the job ingests nothing (not an error).
+
+Background ingestion:
+  Jobs run on a small worker pool (RAG_INGEST_WORKERS, default 2). One job
+  per (ticker, start_date, end_date) is in flight at a time; later requests
+  for the same key share it. `python -m agent.ingest_watchlist` runs the
+  same ingest_ticker() ahead of time for a list of tickers.
+
+Ingestion workflow (per job):
+  Stream filing HTML → strip tags and data tables → split at Item headings
+  → chunk each section (≈600 tokens, 100-token overlap) → batch-embed with
+  Gemini → store in ChromaDB with metadata for deduplication, and in the
+  BM25 side index.
+  Each stage is a generator feeding the next and chunks are stored in
+  batches of _INGEST_BATCH_CHUNKS, so memory stays bounded however large
+  the filing (10-Ks with inline XBRL run to tens of MB).
+  A job's filings are pipelined (_ingest_sources): all downloads run
+  concurrently under the EDGAR token bucket, their chunks are packed into
+  full embedding batches, and each ChromaDB add overlaps the next batch's
+  embedding.
+
+Section-aware chunking:
+  Only narrative text is embedded. The XBRL header, financial/XBRL tables,
+  the cover page, table-of-contents entries, boilerplate Items (exhibit
+  lists, "Not applicable" stubs) and signatures are dropped before the
+  embedding call, and no chunk straddles two Items. Each chunk records its
+  Item in metadata (section_item "1A", section "Risk Factors"). Filings
+  without recognisable Item headings are chunked whole, as before.
+
+Chunk IDs: {ticker}-{filing_type}-{period}[-{section}]-chunk-{N:03d}
+  e.g. NVDA-10-Q-2024Q2-part2-item1a-chunk-004 — ChromaDB treats duplicate
+  IDs as no-ops.
+
+Content dedup:
+  Each chunk's metadata carries content_hash (normalized-text hash). Text
+  already stored under another ID reuses the stored vector instead of
+  being embedded again, a passage repeated within one filing is stored
+  once, and query results return each passage once.
 
 External dependencies:
-  - GOOGLE_CLOUD_PROJECT env var (required; node returns error if absent)
+  - GOOGLE_CLOUD_PROJECT env var (required for the default Gemini embedding
+    backend unless RAG_RETRIEVAL_MODE=bm25; node returns error if absent)
   - GOOGLE_CLOUD_LOCATION env var (default: us-central1)
   - Auth: Application Default Credentials — run `gcloud auth application-default login`
   - CHROMA_PERSIST_DIR env var (default: data/vector_store)
   - SEC EDGAR public API (no auth; User-Agent header required)
+
+Hybrid retrieval (RAG_RETRIEVAL_MODE):
+  Every stored chunk is also indexed in a SQLite BM25 index (bm25_index.py,
+  BM25_INDEX_PATH). "hybrid" fuses vector and keyword rankings with
+  reciprocal-rank fusion and, if the query embedding fails or takes longer
+  than RAG_EMBED_TIMEOUT_SECONDS, answers from the keyword hits alone.
+  "bm25" never calls the embedding API: ingestion fills only the keyword
+  index and nothing is added to ChromaDB. "vector" is the pure-embedding
+  path.
+
+Embedding backends (RAG_EMBEDDING_BACKEND):
+  "gemini" (default) embeds with Vertex AI. "hashing" is a deterministic
+  local feature-hashing embedder with no network or credentials, for
+  offline runs, CI and tests/benchmarks/bench_rag_ingestion.py. Each
+  backend's model gets its own collection, since their vectors don't mix.
+
+Query embeddings:
+  One genai.Client is shared by the process. Query vectors are memoized by
+  (model, task_type, normalized text) in an in-memory LRU backed by SQLite
+  (EMBEDDING_CACHE_PATH), so the post-ingestion re-query and repeated
+  phrasings of a question skip the Vertex AI round-trip.
+
+Vector store handle:
+  The ChromaDB PersistentClient and collection are opened once per process
+  (_get_collection) and shared by all sessions. warm_up_vector_store() is
+  called at app start to load the HNSW index, so the first user query only
+  pays the search cost.
+
+EDGAR metadata cache:
+  The ticker → CIK map and each company's submissions index are kept in
+  SQLite (EDGAR_CACHE_PATH). The CIK map is held in memory as a dict and
+  refreshed daily; submissions are revalidated with ETag/Last-Modified
+  after an hour. A miss therefore costs local lookups, not two large
+  downloads.
+
+Concurrency:
+  The node is async, but ChromaDB and the google-genai embedding calls are
+  blocking libraries, so the retrieval/ingestion body runs in a worker
+  thread via asyncio.to_thread. EDGAR requests from that thread go through
+  the shared, connection-pooled sync client in http_client.py.
 """
 
+import asyncio
+import contextvars
+import hashlib
+import itertools
+import json
 import logging
+import math
 import os
+import queue
+import random
 import re
+import sqlite3
+import threading
 import time
+from array import array
+from collections import Counter, OrderedDict
+from contextlib import ExitStack
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from html.parser import HTMLParser
-from typing import Optional
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 import chromadb
+import httpx
 from google import genai
 from google.genai import types as genai_types
-import requests
 
+from agent.graph.nodes.bm25_index import BM25Index, tokenize
+from agent.graph.nodes.http_client import sync_get, sync_stream
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.timing import submit_timed, timed_call
 
 logger = logging.getLogger(__name__)
 
@@ -49,174 +144,915 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "data/vector_store")
-COLLECTION_NAME = "sec_filings_gemini_embedding_001"
+# One collection per embedding model (vectors from different models are not
+# comparable), versioned with the chunking scheme: section-aware chunks (v2)
+# replaced fixed windows, and mixing the two would return duplicate passages.
+# e.g. sec_filings_gemini_embedding_001_v2
+COLLECTION_PREFIX = "sec_filings"
+_CHUNKING_VERSION = "v2"
 EMBEDDING_MODEL = "gemini-embedding-001"
+# "gemini" (Vertex AI) or "hashing" (deterministic, local; offline runs and
+# benchmarks — see _HashingEmbedder).
+EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "gemini").lower()
+HASHING_EMBEDDING_DIM = int(os.getenv("RAG_HASHING_DIM", "768"))
 EDGAR_BASE = "https://data.sec.gov"
 EDGAR_SUBMISSIONS = "https://data.sec.gov/submissions/CIK{cik}.json"
 EDGAR_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 EDGAR_FILING_BASE = "https://www.sec.gov/Archives/edgar/data"
 EDGAR_USER_AGENT = "StockInsightAgent admin@stockinsight.dev"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite3")
+EDGAR_CACHE_PATH = os.getenv("EDGAR_CACHE_PATH", "data/edgar_cache.sqlite3")
+BM25_INDEX_PATH = os.getenv("BM25_INDEX_PATH", "data/bm25_index.sqlite3")
+
+# "hybrid" (vector + BM25, fused), "vector", or "bm25" (no embedding call).
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid").lower()
+# In hybrid mode, how long a query embedding may take before the keyword
+# hits are used alone.
+EMBED_QUERY_TIMEOUT_SECONDS = float(os.getenv("RAG_EMBED_TIMEOUT_SECONDS", "3"))
+
+# company_tickers.json changes only when companies list/delist; refresh daily.
+CIK_MAP_TTL_SECONDS = 24 * 60 * 60
+# A cached submissions index is used as-is for this long, then revalidated
+# with If-None-Match / If-Modified-Since.
+SUBMISSIONS_FRESH_SECONDS = 60 * 60
+
+# EDGAR throttling responses are retried with exponential backoff (plus
+# jitter), or after Retry-After when the server sends one. Request pacing
+# itself is the shared token bucket in http_client.
+_EDGAR_RETRY_STATUSES = {429, 503}
+_EDGAR_MAX_RETRIES = 3
+_EDGAR_BACKOFF_SECONDS = 1.0
+_EDGAR_MAX_BACKOFF_SECONDS = 30.0
 
 # Approximate chars per token: 1 token ≈ 4 chars
 _CHUNK_CHARS = 2400   # ≈ 600 tokens
 _OVERLAP_CHARS = 400  # ≈ 100 tokens
 _TOP_K = 5
+# Adaptive top-k (see _query_collection): candidates fetched per query, the
+# most chunks returned, and how far below the best match a chunk beyond the
+# first _TOP_K may score and still be returned.
+_CANDIDATE_MULTIPLIER = 3
+_MAX_TOP_K = 8
+_RELEVANCE_MARGIN = 0.05
+_RRF_K = 60                   # reciprocal-rank fusion constant (standard value)
 _MAX_FILINGS_TO_INGEST = 3   # cap ingestion per query to stay within rate limits
+_MIN_FILING_CHARS = 200       # shorter extracted text means a broken/empty document
+_STREAM_CHUNK_CHARS = 64 * 1024   # decoded HTML read per step when streaming a filing
+_INGEST_BATCH_CHUNKS = 100    # chunks embedded and stored per step (embedding API limit)
+_EMBEDDING_LRU_SIZE = 512     # query vectors kept in memory in front of the disk cache
+
+# Background ingestion: worker count and how long the node waits for a job
+# it just queued before answering without it.
+INGEST_WORKERS = int(os.getenv("RAG_INGEST_WORKERS", "2"))
+INGEST_WAIT_SECONDS = float(os.getenv("RAG_INGEST_WAIT_SECONDS", "0"))
 
 
 # ---------------------------------------------------------------------------
 # HTML cleaning
 # ---------------------------------------------------------------------------
 
-_SUPPRESS_TAGS = {"style", "script"}
+# ix:header holds the hidden inline-XBRL context/fact block of a filing.
+_SUPPRESS_TAGS = {"style", "script", "ix:header"}
 
+# A table is treated as data and dropped when it carries an inline-XBRL
+# numeric fact (ix:nonFraction — every financial statement table since 2019)
+# or, for untagged filings, when this share of its non-space characters are
+# digits. Narrative tables (table-of-contents, two-column heading layouts,
+# a short "Net income | $18.8B" summary) are kept.
+_DATA_TABLE_DIGIT_RATIO = 0.4
 
-class _TagStripper(HTMLParser):
-    """Minimal HTML → plain text converter (no third-party deps).
 
-    Text inside <style> and <script> blocks is suppressed so that CSS rules
-    and JS code don't bleed into the chunk text seen by the synthesizer.
+def _is_data_table(fragments: list[str], has_xbrl_facts: bool) -> bool:
+    if has_xbrl_facts:
+        return True
+    chars = [c for fragment in fragments for c in fragment if not c.isspace()]
+    if not chars:
+        return True
+    return sum(c.isdigit() for c in chars) / len(chars) >= _DATA_TABLE_DIGIT_RATIO
+
+
+class _TagStripper(HTMLParser):
+    """Minimal incremental HTML → plain text converter (no third-party deps).
+
+    Text inside <style> and <script> blocks and the inline-XBRL header is
+    suppressed so that CSS rules, JS code and hidden XBRL facts don't bleed
+    into the chunk text seen by the synthesizer. Tables are held until they
+    close and dropped if they look like data (see _is_data_table) — numeric
+    fragments embed poorly and never clear the relevance threshold.
+
+    Fed piece by piece: each run of text between two pieces of markup is one
+    fragment, and pop_text() returns the fragments completed so far with
+    whitespace collapsed and fragments separated by single spaces — the
+    same text a one-shot feed would produce, without holding the document
+    (beyond one table at a time).
     """
 
     def __init__(self):
         super().__init__()
-        self._parts: list[str] = []
+        self._run: list[str] = []
+        self._fragments: list[str] = []
+        self._table_fragments: list[str] = []
         self._suppress_depth: int = 0
+        self._table_depth: int = 0
+        self._table_has_xbrl = False
+        self._emitted = False
+
+    def _flush(self) -> None:
+        if self._run:
+            target = self._table_fragments if self._table_depth else self._fragments
+            target.append("".join(self._run))
+            self._run = []
+
+    def _close_table(self) -> None:
+        if not _is_data_table(self._table_fragments, self._table_has_xbrl):
+            self._fragments.extend(self._table_fragments)
+        self._table_fragments = []
+        self._table_has_xbrl = False
 
     def handle_starttag(self, tag: str, attrs) -> None:
-        if tag.lower() in _SUPPRESS_TAGS:
+        self._flush()
+        tag = tag.lower()
+        if tag in _SUPPRESS_TAGS:
             self._suppress_depth += 1
+        elif tag == "table":
+            self._table_depth += 1
+        elif tag == "ix:nonfraction" and self._table_depth:
+            self._table_has_xbrl = True
 
     def handle_endtag(self, tag: str) -> None:
-        if tag.lower() in _SUPPRESS_TAGS and self._suppress_depth > 0:
+        self._flush()
+        tag = tag.lower()
+        if tag in _SUPPRESS_TAGS and self._suppress_depth > 0:
             self._suppress_depth -= 1
+        elif tag == "table" and self._table_depth > 0:
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self._close_table()
 
-    def handle_data(self, data: str) -> None:
-        if self._suppress_depth == 0:
-            self._parts.append(data)
+    def handle_comment(self, data: str) -> None:
+        self._flush()
 
-    def get_text(self) -> str:
-        return " ".join(self._parts)
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
 
+    def handle_pi(self, data: str) -> None:
+        self._flush()
 
-def _strip_html(html: str) -> str:
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if self._suppress_depth == 0:
+            self._run.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        if self._table_depth:
+            self._table_depth = 0
+            self._close_table()
+
+    def pop_text(self) -> str:
+        """Normalized text of the fragments completed since the last call."""
+        words = [w for fragment in self._fragments for w in fragment.split()]
+        self._fragments = []
+        if not words:
+            return ""
+        text = " ".join(words)
+        if self._emitted:
+            text = " " + text
+        self._emitted = True
+        return text
+
+
+def _iter_text(html_pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Strip tags from HTML arriving in pieces, yielding normalized text as it
+    becomes available. A parser error ends the text early rather than
+    raising.
+    """
     parser = _TagStripper()
+    for piece in html_pieces:
+        try:
+            parser.feed(piece)
+        except Exception:
+            break
+        text = parser.pop_text()
+        if text:
+            yield text
     try:
-        parser.feed(html)
+        parser.close()
     except Exception:
         pass
-    text = parser.get_text()
-    # Collapse whitespace runs
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    text = parser.pop_text()
+    if text:
+        yield text
 
 
 # ---------------------------------------------------------------------------
 # Chunking
 # ---------------------------------------------------------------------------
 
-def _chunk_text(text: str, ticker: str, filing_type: str, period: str) -> list[dict]:
-    """
-    Split text into overlapping chunks and assign stable unique IDs.
-
-    Returns list of dicts:
-      id, text, metadata (ticker, filing_type, filing_period)
-    """
-    chunks = []
-    start = 0
-    idx = 0
-    while start < len(text):
-        end = start + _CHUNK_CHARS
-        chunk_text = text[start:end].strip()
-        if chunk_text:
-            chunk_id = f"{ticker}-{filing_type}-{period}-chunk-{idx:03d}"
-            chunks.append({
-                "id": chunk_id,
-                "text": chunk_text,
-                "metadata": {
-                    "ticker": ticker,
-                    "filing_type": filing_type,
-                    "filing_period": period,
-                },
-            })
-            idx += 1
-        start += _CHUNK_CHARS - _OVERLAP_CHARS
-    return chunks
+def _iter_chunks(
+    text_pieces: Iterable[str],
+    ticker: str,
+    filing_type: str,
+    period: str,
+    section: Optional["_Section"] = None,
+    first_idx: int = 0,
+) -> Iterator[dict]:
+    """
+    Split streamed text into overlapping chunks with stable unique IDs.
+
+    Windows are _CHUNK_CHARS long and advance by _CHUNK_CHARS - _OVERLAP_CHARS,
+    exactly as if the pieces were joined first; only the current window
+    plus one incoming piece is held in memory.
+
+    With a section, IDs carry its slug and the metadata its item and title;
+    numbering starts at first_idx so a section split in two keeps unique IDs.
+
+    Yields dicts: id, text, metadata (ticker, filing_type, filing_period
+    [, section_item, section])
+    """
+    step = _CHUNK_CHARS - _OVERLAP_CHARS
+    prefix = f"{ticker}-{filing_type}-{period}" + (f"-{section.slug}" if section else "")
+    buf = ""
+    idx = first_idx
+
+    def windows(final: bool) -> Iterator[str]:
+        nonlocal buf
+        pos = 0
+        while len(buf) - pos >= _CHUNK_CHARS or (final and pos < len(buf)):
+            yield buf[pos : pos + _CHUNK_CHARS]
+            pos += step
+        buf = buf[pos:]
+
+    def emit(window: str) -> Optional[dict]:
+        nonlocal idx
+        chunk_text = window.strip()
+        if not chunk_text:
+            return None
+        metadata = {
+            "ticker": ticker,
+            "filing_type": filing_type,
+            "filing_period": period,
+        }
+        if section:
+            metadata["section_item"] = section.item
+            metadata["section"] = section.title
+        chunk = {"id": f"{prefix}-chunk-{idx:03d}", "text": chunk_text, "metadata": metadata}
+        idx += 1
+        return chunk
+
+    for piece in text_pieces:
+        buf += piece
+        for window in windows(final=False):
+            chunk = emit(window)
+            if chunk:
+                yield chunk
+    for window in windows(final=True):
+        chunk = emit(window)
+        if chunk:
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Filing sections
+# ---------------------------------------------------------------------------
+
+class _Section(NamedTuple):
+    slug: str     # ID component, e.g. "item1a" or "part2-item1a"
+    item: str     # e.g. "1A"
+    title: str    # e.g. "Risk Factors"
+    keep: bool    # False for boilerplate sections, which are not embedded
+
+
+# Regulation S-K item titles. Items marked False are boilerplate (exhibit
+# lists, "not applicable" placeholders) and are dropped before embedding.
+_10K_ITEMS = {
+    "1": ("Business", True),
+    "1A": ("Risk Factors", True),
+    "1B": ("Unresolved Staff Comments", False),
+    "1C": ("Cybersecurity", True),
+    "2": ("Properties", True),
+    "3": ("Legal Proceedings", True),
+    "4": ("Mine Safety Disclosures", False),
+    "5": ("Market for Registrant's Common Equity", True),
+    "6": ("Reserved", False),
+    "7": ("Management's Discussion and Analysis", True),
+    "7A": ("Quantitative and Qualitative Disclosures About Market Risk", True),
+    "8": ("Financial Statements and Supplementary Data", True),
+    "9": ("Changes in and Disagreements with Accountants", False),
+    "9A": ("Controls and Procedures", True),
+    "9B": ("Other Information", True),
+    "9C": ("Disclosure Regarding Foreign Jurisdictions that Prevent Inspections", False),
+    "10": ("Directors, Executive Officers and Corporate Governance", True),
+    "11": ("Executive Compensation", True),
+    "12": ("Security Ownership", True),
+    "13": ("Certain Relationships and Related Transactions", True),
+    "14": ("Principal Accountant Fees and Services", False),
+    "15": ("Exhibits and Financial Statement Schedules", False),
+    "16": ("Form 10-K Summary", False),
+}
+# 10-Q item numbers restart in Part II, so the key includes the part.
+_10Q_ITEMS = {
+    ("I", "1"): ("Financial Statements", True),
+    ("I", "2"): ("Management's Discussion and Analysis", True),
+    ("I", "3"): ("Quantitative and Qualitative Disclosures About Market Risk", True),
+    ("I", "4"): ("Controls and Procedures", True),
+    ("II", "1"): ("Legal Proceedings", True),
+    ("II", "1A"): ("Risk Factors", True),
+    ("II", "2"): ("Unregistered Sales of Equity Securities", True),
+    ("II", "3"): ("Defaults Upon Senior Securities", False),
+    ("II", "4"): ("Mine Safety Disclosures", False),
+    ("II", "5"): ("Other Information", True),
+    ("II", "6"): ("Exhibits", False),
+}
+
+# "Item 1A. Risk Factors", "ITEM 7 — MANAGEMENT'S ...": the item number must
+# be followed by a capitalised title, which rules out cross-references such
+# as `see Item 7 of this report` or `Part II, Item 1A, "Risk Factors"`.
+_HEADING_RE = re.compile(
+    r"\b(?:ITEM|Item)\s+(\d{1,2}[A-C]?)\s*[.:\-\u2013\u2014]?\s+(?=[A-Z])"
+    r"|\bPART\s+(IV|III|II|I)\b\s*[.:\-\u2013\u2014]?\s*(?=[A-Z])"
+    r"|\bSIGNATURES?\s+(?=Pursuant)"
+)
+# Running page header repeated on every page of most filings.
+_PAGE_HEADER_RE = re.compile(r"\s*\bTable of Contents\b")
+# Text held back at the end of the buffer so a heading split across pieces
+# is still matched whole.
+_HEADING_HOLD_CHARS = 200
+# Text before the first Item heading is the cover page and is dropped. If no
+# heading shows up within this many chars, the filing is treated as
+# unstructured and chunked whole.
+_MAX_PREAMBLE_CHARS = 50_000
+# Sections shorter than this are table-of-contents entries or one-line
+# "None." / "Not applicable." placeholders.
+_MIN_SECTION_CHARS = 300
+
+_PART_NUMBERS = {"I": 1, "II": 2, "III": 3, "IV": 4}
+_SIGNATURES = _Section("signatures", "", "Signatures", False)
+
+
+def _section_for(filing_type: str, part: Optional[str], item: str) -> _Section:
+    item = item.upper()
+    if filing_type.upper().startswith("10-Q"):
+        part = part or "I"
+        title, keep = _10Q_ITEMS.get((part, item), (f"Item {item}", True))
+        return _Section(f"part{_PART_NUMBERS[part]}-item{item.lower()}", item, title, keep)
+    title, keep = _10K_ITEMS.get(item, (f"Item {item}", True))
+    return _Section(f"item{item.lower()}", item, title, keep)
+
+
+def _iter_sections(text_pieces: Iterable[str], filing_type: str) -> Iterator[tuple[Optional[_Section], str]]:
+    """
+    Tag streamed filing text with the 10-K / 10-Q section it belongs to.
+
+    Yields (section, text) pairs in document order; section is None for a
+    filing in which no Item heading was found. The cover page ahead of the
+    first heading is discarded and running "Table of Contents" page headers
+    are removed. Memory is bounded by one piece plus _HEADING_HOLD_CHARS
+    (or _MAX_PREAMBLE_CHARS while still on the cover page).
+    """
+    buf = ""
+    section: Optional[_Section] = None
+    part: Optional[str] = None
+    preamble: Optional[list[str]] = []      # None once a heading is seen or the cover is given up on
+    preamble_chars = 0
+
+    def emit(text: str) -> Iterator[tuple[Optional[_Section], str]]:
+        nonlocal preamble, preamble_chars
+        if not text:
+            return
+        if preamble is None:
+            yield section, text
+            return
+        preamble.append(text)
+        preamble_chars += len(text)
+        if preamble_chars > _MAX_PREAMBLE_CHARS:
+            held, preamble = preamble, None
+            yield None, "".join(held)
+
+    def scan(final: bool) -> Iterator[tuple[Optional[_Section], str]]:
+        nonlocal buf, section, part, preamble
+        buf = _PAGE_HEADER_RE.sub("", buf)
+        limit = len(buf) if final else max(len(buf) - _HEADING_HOLD_CHARS, 0)
+        pos = 0
+        for match in _HEADING_RE.finditer(buf, 0, len(buf)):
+            if match.start() >= limit:
+                break
+            item, roman = match.group(1), match.group(2)
+            if roman:
+                # A PART heading only changes how 10-Q item numbers resolve.
+                part = roman
+                continue
+            yield from emit(buf[pos : match.start()])
+            preamble = None    # the first heading ends (and discards) the cover page
+            section = _section_for(filing_type, part, item) if item else _SIGNATURES
+            pos = match.start()
+        yield from emit(buf[pos:limit])
+        buf = buf[limit:]
+
+    for piece in text_pieces:
+        buf += piece
+        yield from scan(final=False)
+    yield from scan(final=True)
+    if preamble:
+        # No heading anywhere: the whole (short) filing is unstructured text.
+        yield None, "".join(preamble)
+
+
+def _iter_section_chunks(text_pieces: Iterable[str], ticker: str, filing_type: str, period: str) -> Iterator[dict]:
+    """
+    Chunk a filing section by section: windows never straddle two Items,
+    boilerplate and stub sections are skipped, and each chunk's metadata
+    names its section. Filings without Item headings are chunked exactly
+    like _iter_chunks.
+    """
+    next_idx: dict[str, int] = {}
+    for section, group in itertools.groupby(_iter_sections(text_pieces, filing_type), key=lambda p: p[0]):
+        if section is not None and not section.keep:
+            continue
+        key = section.slug if section else ""
+        chunks = _iter_chunks((text for _, text in group), ticker, filing_type, period, section, next_idx.get(key, 0))
+        first = next(chunks, None)
+        if first is None:
+            continue
+        second = next(chunks, None)
+        if section is not None and second is None and len(first["text"]) < _MIN_SECTION_CHARS:
+            continue
+        for chunk in itertools.chain((first,), () if second is None else (second,), chunks):
+            next_idx[key] = next_idx.get(key, 0) + 1
+            yield chunk
 
 
 # ---------------------------------------------------------------------------
 # Embedding
 # ---------------------------------------------------------------------------
 
+_genai_client: Optional[genai.Client] = None
+_genai_client_lock = threading.Lock()
+
+
 def _get_genai_client() -> genai.Client:
-    return genai.Client(
-        vertexai=True,
-        project=os.getenv("GOOGLE_CLOUD_PROJECT"),
-        location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
-    )
+    """Return the process-wide genai.Client, creating it on first use."""
+    global _genai_client
+    with _genai_client_lock:
+        if _genai_client is None:
+            _genai_client = genai.Client(
+                vertexai=True,
+                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+                location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+            )
+        return _genai_client
+
+
+def _normalize_query(text: str) -> str:
+    """Cache key form of a query: whitespace collapsed, case-folded."""
+    return " ".join(text.split()).casefold()
+
+
+class _EmbeddingCache:
+    """
+    Memoized embedding vectors keyed by (model, task_type, normalized text).
+
+    An in-memory LRU answers repeats within the process; misses fall
+    through to a SQLite table so vectors survive restarts. Vectors are
+    stored as float64 arrays, so a cached vector is bit-identical to the
+    one the API returned. The disk layer is best-effort: SQLite errors are
+    logged and the cache behaves as a miss.
+
+    One connection is shared across worker threads, guarded by a lock.
+    """
+
+    def __init__(self, path: str, max_entries: int = _EMBEDDING_LRU_SIZE):
+        self._path = path
+        self._max_entries = max_entries
+        self._lru: OrderedDict[tuple[str, str, str], list[float]] = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model     TEXT NOT NULL,
+                    task_type TEXT NOT NULL,
+                    text      TEXT NOT NULL,
+                    vector    BLOB NOT NULL,
+                    PRIMARY KEY (model, task_type, text)
+                )
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: tuple[str, str, str], vector: list[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, model: str, task_type: str, text: str) -> Optional[list[float]]:
+        key = (model, task_type, _normalize_query(text))
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                return vector
+            try:
+                row = self._connect().execute(
+                    "SELECT vector FROM embeddings WHERE model = ? AND task_type = ? AND text = ?",
+                    key,
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("embedding cache read failed: %s", e)
+                return None
+            if row is None:
+                return None
+            vector = array("d", row[0]).tolist()
+            self._remember(key, vector)
+            return vector
+
+    def put(self, model: str, task_type: str, text: str, vector: list[float]) -> None:
+        key = (model, task_type, _normalize_query(text))
+        vector = list(vector)
+        with self._lock:
+            self._remember(key, vector)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    (*key, array("d", vector).tobytes()),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("embedding cache write failed: %s", e)
+
+
+_embedding_cache = _EmbeddingCache(EMBEDDING_CACHE_PATH)
+
+
+class _GeminiEmbedder:
+    """Vertex AI gemini-embedding-001 — the production backend."""
+
+    label = "gemini"
+    model = EMBEDDING_MODEL
+    requires_gcp = True
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        response = _get_genai_client().models.embed_content(
+            model=self.model,
+            contents=texts,
+            config=genai_types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT"),
+        )
+        return [list(e.values) for e in response.embeddings]
+
+    def embed_query(self, text: str) -> list[float]:
+        response = _get_genai_client().models.embed_content(
+            model=self.model,
+            contents=text,
+            config=genai_types.EmbedContentConfig(task_type="RETRIEVAL_QUERY"),
+        )
+        return list(response.embeddings[0].values)
+
+
+class _HashingEmbedder:
+    """
+    Deterministic local stand-in: signed feature hashing of word unigrams
+    and bigrams into `dimensions` buckets, log-scaled term counts, L2
+    normalised. blake2b keeps vectors identical across processes (unlike
+    hash()). No network or credentials, so ingestion and query throughput
+    of the ChromaDB path can be measured offline; retrieval quality is
+    keyword-level, not semantic.
+    """
+
+    label = "hashing"
+    requires_gcp = False
+
+    def __init__(self, dimensions: int = HASHING_EMBEDDING_DIM):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    def _embed(self, text: str) -> list[float]:
+        tokens = tokenize(text)
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        vector = [0.0] * self.dimensions
+        for feature, count in features.items():
+            h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            vector[h % self.dimensions] += (1.0 + math.log(count)) * (1.0 if h >> 63 else -1.0)
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0.0:
+            vector[0] = norm = 1.0     # no tokens: any fixed unit vector keeps cosine defined
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+_EMBEDDING_BACKENDS = {"gemini": _GeminiEmbedder, "hashing": _HashingEmbedder}
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def _get_embedder():
+    """Return the process-wide embedding backend selected by EMBEDDING_BACKEND."""
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            backend = _EMBEDDING_BACKENDS.get(EMBEDDING_BACKEND)
+            if backend is None:
+                raise ValueError(
+                    f"unknown RAG_EMBEDDING_BACKEND {EMBEDDING_BACKEND!r} "
+                    f"(expected one of: {', '.join(_EMBEDDING_BACKENDS)})"
+                )
+            _embedder = backend()
+        return _embedder
 
 
 def _embed_texts(texts: list[str]) -> list[list[float]]:
     """
-    Batch-embed texts using Gemini text-embedding-004.
-    Processes in batches of 100 (API limit).
+    Batch-embed document texts with the configured backend.
+    Processes in batches of 100 (Gemini API limit).
     """
-    client = _get_genai_client()
+    embedder = _get_embedder()
     all_vectors = []
     batch_size = 100
     for i in range(0, len(texts), batch_size):
         batch = texts[i : i + batch_size]
-        response = client.models.embed_content(
-            model=EMBEDDING_MODEL,
-            contents=batch,
-            config=genai_types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT"),
-        )
-        all_vectors.extend([e.values for e in response.embeddings])
+        with timed_call(f"{embedder.label}.embed_documents"):
+            all_vectors.extend(embedder.embed_documents(batch))
     return all_vectors
 
 
 def _embed_query(text: str) -> list[float]:
-    client = _get_genai_client()
-    response = client.models.embed_content(
-        model=EMBEDDING_MODEL,
-        contents=text,
-        config=genai_types.EmbedContentConfig(task_type="RETRIEVAL_QUERY"),
-    )
-    return response.embeddings[0].values
+    """Embed a retrieval query, served from _embedding_cache when possible."""
+    embedder = _get_embedder()
+    cached = _embedding_cache.get(embedder.model, "RETRIEVAL_QUERY", text)
+    if cached is not None:
+        return cached
+
+    with timed_call(f"{embedder.label}.embed_query"):
+        vector = embedder.embed_query(text)
+    _embedding_cache.put(embedder.model, "RETRIEVAL_QUERY", text, vector)
+    return vector
 
 
 # ---------------------------------------------------------------------------
 # SEC EDGAR helpers
 # ---------------------------------------------------------------------------
 
-def _edgar_get(url: str) -> Optional[requests.Response]:
-    """GET a SEC EDGAR URL with required User-Agent header and gentle rate limit."""
-    try:
-        resp = requests.get(url, headers={"User-Agent": EDGAR_USER_AGENT}, timeout=30)
-        time.sleep(0.15)  # stay well under 10 req/sec courtesy limit
-        return resp if resp.ok else None
-    except requests.RequestException as e:
-        logger.warning("EDGAR request failed for %s: %s", url, e)
-        return None
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if given, else backoff."""
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), _EDGAR_MAX_BACKOFF_SECONDS)
+    backoff = _EDGAR_BACKOFF_SECONDS * (2 ** attempt)
+    return min(backoff + random.uniform(0, backoff / 2), _EDGAR_MAX_BACKOFF_SECONDS)
 
 
-def _get_cik(ticker: str) -> Optional[str]:
+def _edgar_get(url: str, headers: Optional[dict] = None) -> Optional[httpx.Response]:
     """
-    Resolve stock ticker to zero-padded 10-digit CIK string.
-    Uses SEC's company_tickers.json mapping file.
+    GET a SEC EDGAR URL with the required User-Agent header.
+
+    Pacing comes from the process-wide EDGAR token bucket in sync_get;
+    429/503 responses are retried up to _EDGAR_MAX_RETRIES times with
+    backoff. Returns the response on 2xx, or on 304 when `headers` made the
+    request conditional; None otherwise.
+    """
+    for attempt in range(_EDGAR_MAX_RETRIES + 1):
+        try:
+            resp = sync_get(url, headers={"User-Agent": EDGAR_USER_AGENT, **(headers or {})}, timeout=30)
+        except httpx.HTTPError as e:
+            logger.warning("EDGAR request failed for %s: %s", url, e)
+            return None
+        if resp.status_code not in _EDGAR_RETRY_STATUSES or attempt == _EDGAR_MAX_RETRIES:
+            break
+        delay = _retry_delay(resp, attempt)
+        logger.warning("EDGAR %d for %s, retrying in %.1fs", resp.status_code, url, delay)
+        time.sleep(delay)
+    return resp if resp.is_success or resp.status_code == 304 else None
+
+
+def _edgar_stream_text(url: str) -> Iterator[str]:
+    """
+    Stream a SEC EDGAR document as decoded text pieces, with the same
+    pacing and 429/503 retries as _edgar_get. Yields nothing if the
+    request fails before the body starts.
+    """
+    headers = {"User-Agent": EDGAR_USER_AGENT}
+    for attempt in range(_EDGAR_MAX_RETRIES + 1):
+        with ExitStack() as stack:
+            try:
+                resp = stack.enter_context(sync_stream(url, headers=headers, timeout=30))
+            except httpx.HTTPError as e:
+                logger.warning("EDGAR request failed for %s: %s", url, e)
+                return
+            if resp.status_code in _EDGAR_RETRY_STATUSES and attempt < _EDGAR_MAX_RETRIES:
+                delay = _retry_delay(resp, attempt)
+            elif not resp.is_success:
+                logger.warning("EDGAR %d for %s", resp.status_code, url)
+                return
+            else:
+                yield from resp.iter_text(_STREAM_CHUNK_CHARS)
+                return
+        logger.warning("EDGAR %d for %s, retrying in %.1fs", resp.status_code, url, delay)
+        time.sleep(delay)
+
+
+class _EdgarCache:
+    """
+    SQLite store for the SEC ticker → CIK map and per-company submissions
+    indexes, with their fetch times and HTTP validators.
+
+    The CIK map is also held in memory (`cik_map`) so lookups are O(1);
+    SQLite only matters across restarts. Storage errors are logged and
+    treated as a miss — the network path still works without the cache.
+
+    One connection is shared across worker threads, guarded by a lock.
     """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+        self.cik_map: dict[str, str] = {}
+        self.cik_map_fetched_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cik_map (
+                    ticker TEXT PRIMARY KEY,
+                    cik    TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    key   TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS submissions (
+                    cik           TEXT PRIMARY KEY,
+                    body          TEXT NOT NULL,
+                    etag          TEXT,
+                    last_modified TEXT,
+                    fetched_at    REAL NOT NULL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def load_cik_map(self) -> None:
+        """Populate the in-memory map from disk (no-op if already loaded)."""
+        with self.lock:
+            if self.cik_map:
+                return
+            try:
+                conn = self._connect()
+                self.cik_map = dict(conn.execute("SELECT ticker, cik FROM cik_map").fetchall())
+                row = conn.execute("SELECT value FROM cache_meta WHERE key = 'cik_map_fetched_at'").fetchone()
+                self.cik_map_fetched_at = float(row[0]) if row else 0.0
+            except sqlite3.Error as e:
+                logger.warning("EDGAR cache read failed: %s", e)
+
+    def store_cik_map(self, mapping: dict[str, str], fetched_at: float) -> None:
+        with self.lock:
+            self.cik_map = mapping
+            self.cik_map_fetched_at = fetched_at
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM cik_map")
+                    conn.executemany("INSERT INTO cik_map VALUES (?, ?)", mapping.items())
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache_meta VALUES ('cik_map_fetched_at', ?)",
+                        (str(fetched_at),),
+                    )
+            except sqlite3.Error as e:
+                logger.warning("EDGAR cache write failed: %s", e)
+
+    def get_submissions(self, cik: str) -> Optional[tuple[str, Optional[str], Optional[str], float]]:
+        """Return (body, etag, last_modified, fetched_at) for cik, or None."""
+        with self.lock:
+            try:
+                return self._connect().execute(
+                    "SELECT body, etag, last_modified, fetched_at FROM submissions WHERE cik = ?",
+                    (cik,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("EDGAR cache read failed: %s", e)
+                return None
+
+    def store_submissions(
+        self, cik: str, body: str, etag: Optional[str], last_modified: Optional[str], fetched_at: float
+    ) -> None:
+        with self.lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO submissions VALUES (?, ?, ?, ?, ?)",
+                        (cik, body, etag, last_modified, fetched_at),
+                    )
+            except sqlite3.Error as e:
+                logger.warning("EDGAR cache write failed: %s", e)
+
+    def touch_submissions(self, cik: str, fetched_at: float) -> None:
+        with self.lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute("UPDATE submissions SET fetched_at = ? WHERE cik = ?", (fetched_at, cik))
+            except sqlite3.Error as e:
+                logger.warning("EDGAR cache write failed: %s", e)
+
+
+_edgar_cache = _EdgarCache(EDGAR_CACHE_PATH)
+
+
+def _refresh_cik_map() -> bool:
+    """Download company_tickers.json into the cache. Returns False on failure."""
     resp = _edgar_get(EDGAR_TICKERS_URL)
     if not resp:
-        return None
+        return False
     try:
-        data = resp.json()
-        ticker_upper = ticker.upper()
-        for entry in data.values():
-            if entry.get("ticker", "").upper() == ticker_upper:
-                return str(entry["cik_str"]).zfill(10)
+        mapping = {
+            entry["ticker"].upper(): str(entry["cik_str"]).zfill(10)
+            for entry in resp.json().values()
+            if entry.get("ticker")
+        }
     except Exception as e:
-        logger.warning("CIK lookup failed for %s: %s", ticker, e)
-    return None
+        logger.warning("company_tickers.json parse failed: %s", e)
+        return False
+    _edgar_cache.store_cik_map(mapping, time.time())
+    logger.info("EDGAR CIK map refreshed: %d tickers", len(mapping))
+    return True
+
+
+def _get_cik(ticker: str) -> Optional[str]:
+    """
+    Resolve stock ticker to zero-padded 10-digit CIK string.
+
+    Served from the cached company_tickers.json map, refreshed once it is
+    older than CIK_MAP_TTL_SECONDS. If a refresh fails, the stale map is
+    still used. SEC writes share classes with a dash (BRK-B), so a dotted
+    ticker is also tried in that form.
+    """
+    with _edgar_cache.lock:
+        _edgar_cache.load_cik_map()
+        if time.time() - _edgar_cache.cik_map_fetched_at > CIK_MAP_TTL_SECONDS:
+            if not _refresh_cik_map() and not _edgar_cache.cik_map:
+                return None
+        cik_map = _edgar_cache.cik_map
+
+    ticker_upper = ticker.upper()
+    return cik_map.get(ticker_upper) or cik_map.get(ticker_upper.replace(".", "-"))
+
+
+def _get_submissions(cik: str) -> Optional[dict]:
+    """
+    Return the parsed submissions index for cik.
+
+    A cached copy younger than SUBMISSIONS_FRESH_SECONDS is used without a
+    request. An older copy is revalidated with its ETag / Last-Modified;
+    a 304 keeps it. If EDGAR is unreachable the stale copy is used.
+    """
+    cached = _edgar_cache.get_submissions(cik)
+    now = time.time()
+    if cached and now - cached[3] < SUBMISSIONS_FRESH_SECONDS:
+        return json.loads(cached[0])
+
+    headers = {}
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+    if cached and cached[2]:
+        headers["If-Modified-Since"] = cached[2]
+
+    resp = _edgar_get(EDGAR_SUBMISSIONS.format(cik=cik), headers=headers)
+    if resp is None:
+        return json.loads(cached[0]) if cached else None
+    if resp.status_code == 304 and cached:
+        _edgar_cache.touch_submissions(cik, now)
+        return json.loads(cached[0])
+
+    data = resp.json()
+    _edgar_cache.store_submissions(
+        cik, json.dumps(data), resp.headers.get("ETag"), resp.headers.get("Last-Modified"), now
+    )
+    return data
 
 
 def _date_in_range(filing_date: str, start_date: str, end_date: str) -> bool:
@@ -241,13 +1077,10 @@ def _discover_filings(cik: str, ticker: str, start_date: str, end_date: str) ->
     Return a list of relevant 10-K/10-Q filing dicts for the date range.
     Each dict: accession_number, filing_type, period, filing_date, primary_doc
     """
-    url = EDGAR_SUBMISSIONS.format(cik=cik)
-    resp = _edgar_get(url)
-    if not resp:
-        return []
-
     try:
-        data = resp.json()
+        data = _get_submissions(cik)
+        if not data:
+            return []
         recent = data.get("filings", {}).get("recent", {})
         forms = recent.get("form", [])
         dates = recent.get("filingDate", [])
@@ -292,62 +1125,326 @@ def _discover_filings(cik: str, ticker: str, start_date: str, end_date: str) ->
     return results
 
 
-def _download_filing(cik: str, accession_no: str, primary_doc: str) -> Optional[str]:
-    """Download a filing document from EDGAR and return clean plain text."""
+def _stream_filing_text(cik: str, accession_no: str, primary_doc: str) -> Iterator[str]:
+    """Stream a filing document from EDGAR as clean plain-text pieces."""
     # accession_no is already dash-free (stored that way by _discover_filings).
     # EDGAR Archives paths use the no-dash form: /data/{cik}/{accession_no}/{doc}
     url = f"{EDGAR_FILING_BASE}/{int(cik)}/{accession_no}/{primary_doc}"
-    resp = _edgar_get(url)
-    if not resp:
-        return None
-    return _strip_html(resp.text)
+    return _iter_text(_edgar_stream_text(url))
 
 
 # ---------------------------------------------------------------------------
 # ChromaDB helpers
 # ---------------------------------------------------------------------------
 
-def _get_collection() -> chromadb.Collection:
-    client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
-    return client.get_or_create_collection(
-        name=COLLECTION_NAME,
-        metadata={"hnsw:space": "cosine"},
-    )
+_bm25_index = BM25Index(BM25_INDEX_PATH)
+
+# Query embeddings raced against EMBED_QUERY_TIMEOUT_SECONDS in hybrid mode.
+_embed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="embed-query")
 
+_chroma_client: Optional[chromadb.ClientAPI] = None
+_collection: Optional[chromadb.Collection] = None
+_collection_lock = threading.Lock()
 
-def _ingest_filing(collection: chromadb.Collection, filing: dict, ticker: str) -> int:
+
+def _collection_name(embedder) -> str:
+    model = re.sub(r"[^a-z0-9]+", "_", embedder.model.lower())
+    return f"{COLLECTION_PREFIX}_{model}_{_CHUNKING_VERSION}"
+
+
+def _get_collection() -> chromadb.Collection:
     """
-    Download, chunk, embed, and store a single filing.
-    Returns number of new chunks stored (0 if all already present).
+    Return the process-wide collection handle, opening the persistent
+    client on first use. Opening it means reading the on-disk SQLite
+    catalogue, so it is done once rather than per query.
     """
-    text = _download_filing(filing["cik"], filing["accession_number"], filing["primary_doc"])
-    if not text or len(text) < 200:
-        logger.warning("Empty or too-short filing text for %s %s", ticker, filing["period"])
-        return 0
+    global _chroma_client, _collection
+    with _collection_lock:
+        if _collection is None:
+            _chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+            _collection = _chroma_client.get_or_create_collection(
+                name=_collection_name(_get_embedder()),
+                metadata={"hnsw:space": "cosine"},
+            )
+        return _collection
+
+
+def warm_up_vector_store() -> None:
+    """
+    Open the collection and load its HNSW index ahead of the first query.
 
-    chunks = _chunk_text(text, ticker, filing["filing_type"], filing["period"])
-    if not chunks:
-        return 0
+    Chroma loads the index segment lazily on the first search, so this runs
+    one nearest-neighbour query with a vector already in the store. Called
+    from the Chainlit startup hook; failures are logged, never raised.
+    """
+    started = time.perf_counter()
+    try:
+        collection = _get_collection()
+        sample = collection.get(limit=1, include=["embeddings"])
+        embeddings = sample.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            logger.info("warm_up_vector_store: collection is empty, nothing to load")
+            return
+        collection.query(query_embeddings=[list(embeddings[0])], n_results=1, include=[])
+        logger.info(
+            "warm_up_vector_store: %d chunks ready in %.2fs",
+            collection.count(), time.perf_counter() - started,
+        )
+    except Exception as e:
+        logger.warning("warm_up_vector_store failed: %s", e)
+
+
+def _content_hash(text: str) -> str:
+    """Hash of a chunk's normalized text (whitespace collapsed, case-folded)."""
+    return hashlib.blake2b(_normalize_query(text).encode(), digest_size=16).hexdigest()
+
+
+def _embed_new_chunks(
+    collection: chromadb.Collection,
+    chunks: list[dict],
+    job_vectors: Optional[dict[str, list[float]]] = None,
+) -> tuple[list[dict], list[list[float]]]:
+    """
+    Return the chunks whose IDs are not stored yet, with their embeddings.
+
+    Every chunk's metadata gets its content_hash. Text already stored under
+    another ID — boilerplate and risk factors repeated quarter to quarter —
+    reuses the stored vector, and text repeated within the batch is
+    embedded once, so the embedding API only sees text it hasn't embedded
+    before. The chunk itself is still added: its filing_period is what the
+    period filter matches on.
+
+    job_vectors is the ingestion job's own hash → vector map. It is checked
+    before ChromaDB and filled with every vector found or embedded here:
+    an earlier batch's add may not have landed yet, so ChromaDB alone would
+    miss text repeated across batches or filings of the same job.
+    """
+    for c in chunks:
+        if "content_hash" not in c["metadata"]:
+            c["metadata"]["content_hash"] = _content_hash(c["text"])
 
     # Check which chunk IDs are already stored (deduplication)
     existing_ids = set(collection.get(ids=[c["id"] for c in chunks])["ids"])
     new_chunks = [c for c in chunks if c["id"] not in existing_ids]
-
     if not new_chunks:
-        logger.info("All %d chunks already in ChromaDB for %s %s", len(chunks), ticker, filing["period"])
-        return 0
+        return [], []
+
+    if job_vectors is None:
+        job_vectors = {}
+    vectors_by_hash = {}
+    for c in new_chunks:
+        h = c["metadata"]["content_hash"]
+        if h in job_vectors:
+            vectors_by_hash[h] = job_vectors[h]
+    hashes = sorted({c["metadata"]["content_hash"] for c in new_chunks} - vectors_by_hash.keys())
+    if hashes:
+        known = collection.get(where={"content_hash": {"$in": hashes}}, include=["embeddings", "metadatas"])
+        vectors_by_hash.update(
+            (meta["content_hash"], [float(x) for x in vector])
+            for meta, vector in zip(known.get("metadatas") or [], _as_list(known.get("embeddings")))
+            if meta and meta.get("content_hash")
+        )
+
+    to_embed = {}
+    for c in new_chunks:
+        h = c["metadata"]["content_hash"]
+        if h not in vectors_by_hash:
+            to_embed.setdefault(h, c["text"])
+    if to_embed:
+        vectors_by_hash.update(zip(to_embed, _embed_texts(list(to_embed.values()))))
+    job_vectors.update(vectors_by_hash)
+    reused = len(new_chunks) - len(to_embed)
+    if reused:
+        logger.debug("reused %d stored vectors for repeated chunk text", reused)
+
+    return new_chunks, [vectors_by_hash[c["metadata"]["content_hash"]] for c in new_chunks]
+
+
+def _as_list(value) -> list:
+    # ChromaDB returns embeddings as a numpy array; `or []` would be ambiguous.
+    return [] if value is None else list(value)
+
+
+def _add_chunks(
+    collection: chromadb.Collection,
+    batch: list[dict],
+    new_chunks: list[dict],
+    vectors: list[list[float]],
+) -> int:
+    """
+    Add embedded new_chunks to ChromaDB and the whole batch to the BM25
+    index. Returns how many chunks were stored: new_chunks, or in bm25 mode
+    (where nothing is embedded) the chunks new to the keyword index.
+    """
+    if new_chunks:
+        with timed_call("chroma.add"):
+            collection.add(
+                ids=[c["id"] for c in new_chunks],
+                documents=[c["text"] for c in new_chunks],
+                embeddings=vectors,
+                metadatas=[c["metadata"] for c in new_chunks],
+            )
+    # The keyword index skips IDs it already holds, so passing the whole
+    # batch also backfills chunks stored before it existed.
+    added = _bm25_index.add(batch)
+    return added if RETRIEVAL_MODE == "bm25" else len(new_chunks)
+
+
+class _IngestCancelled(Exception):
+    """Raised in a chunk producer once the pipeline it feeds has failed."""
+
+
+def _produce_chunks(label: str, make_chunks, out: queue.Queue, cancelled: threading.Event) -> None:
+    """
+    Pipeline stage 1 (download pool): run make_chunks() — stream, extract,
+    chunk one source — and put ("chunk", chunk) messages on `out`, then a
+    final ("done", label, n_chunks, error). A source whose only chunk is
+    shorter than _MIN_FILING_CHARS is a broken/empty document and
+    contributes nothing.
+    """
+    def put(message) -> None:
+        while True:
+            try:
+                out.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                if cancelled.is_set():
+                    raise _IngestCancelled
+
+    n_chunks = 0
+    held: Optional[dict] = None
+    try:
+        for chunk in make_chunks():
+            n_chunks += 1
+            if n_chunks == 1:
+                held = chunk          # decided once we know it isn't the only one
+                continue
+            if held is not None:
+                put(("chunk", held))
+                held = None
+            put(("chunk", chunk))
+        # Text shorter than _MIN_FILING_CHARS always fits in one chunk.
+        if held is not None and len(held["text"]) >= _MIN_FILING_CHARS:
+            put(("chunk", held))
+        elif n_chunks <= 1:
+            logger.warning("Empty or too-short filing text for %s", label)
+            n_chunks = 0
+        put(("done", label, n_chunks, None))
+    except _IngestCancelled:
+        pass
+    except Exception as e:
+        try:
+            put(("done", label, n_chunks, e))
+        except _IngestCancelled:
+            pass
 
-    texts = [c["text"] for c in new_chunks]
-    vectors = _embed_texts(texts)
 
-    collection.add(
-        ids=[c["id"] for c in new_chunks],
-        documents=texts,
-        embeddings=vectors,
-        metadatas=[c["metadata"] for c in new_chunks],
+def _ingest_sources(collection: chromadb.Collection, sources: list[tuple[str, Callable[[], Iterable[dict]]]]) -> int:
+    """
+    Pipelined ingestion of several chunk sources (one per filing):
+
+      download pool   every source streams and chunks concurrently; EDGAR
+                      pacing is the shared token bucket in http_client
+      calling thread  packs chunks from all sources into full
+                      _INGEST_BATCH_CHUNKS batches, dedups and embeds them
+                      (in bm25 mode nothing is embedded)
+      add pool        collection.add and the BM25 add for batch N run while
+                      batch N+1 is embedded (at most one add in flight)
+
+    The queue between the stages is bounded, so memory stays at a few
+    batches however large the filings. A source that fails is logged and
+    skipped; if every source fails, the first error is raised.
+    Returns number of new chunks stored.
+    """
+    started = time.perf_counter()
+    out: queue.Queue = queue.Queue(maxsize=2 * _INGEST_BATCH_CHUNKS)
+    cancelled = threading.Event()
+    for label, make_chunks in sources:
+        submit_timed(_download_pool, "ingest.filing", _produce_chunks, label, make_chunks, out, cancelled)
+
+    stored = seen = 0
+    seen_content: set[tuple[str, str, str]] = set()
+    job_vectors: dict[str, list[float]] = {}
+    pending_add: Optional[Future] = None
+    errors: list[Exception] = []
+
+    def flush(batch: list[dict]) -> None:
+        nonlocal stored, pending_add
+        if RETRIEVAL_MODE == "bm25":
+            new_chunks, vectors = [], []       # keyword index only, no embedding call
+        else:
+            new_chunks, vectors = _embed_new_chunks(collection, batch, job_vectors)   # overlaps the previous add
+        if pending_add is not None:
+            stored += pending_add.result()
+        pending_add = _add_pool.submit(
+            contextvars.copy_context().run, _add_chunks, collection, batch, new_chunks, vectors,
+        )
+
+    try:
+        batch: list[dict] = []
+        remaining = len(sources)
+        while remaining:
+            message = out.get()
+            if message[0] == "done":
+                _, label, n_chunks, error = message
+                remaining -= 1
+                if error is not None:
+                    logger.error("ingestion of %s failed: %s", label, error)
+                    errors.append(error)
+                continue
+            chunk = message[1]
+            seen += 1
+            # The same passage twice in one filing (repeated legends) is stored once.
+            content_hash = chunk["metadata"]["content_hash"] = _content_hash(chunk["text"])
+            key = (chunk["metadata"]["filing_type"], chunk["metadata"]["filing_period"], content_hash)
+            if key in seen_content:
+                continue
+            seen_content.add(key)
+            batch.append(chunk)
+            if len(batch) == _INGEST_BATCH_CHUNKS:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        if pending_add is not None:
+            stored += pending_add.result()
+            pending_add = None
+    finally:
+        cancelled.set()
+
+    if errors and len(errors) == len(sources):
+        raise errors[0]
+    elapsed = time.perf_counter() - started
+    labels = ", ".join(label for label, _ in sources)
+    if stored == 0:
+        logger.info("All %d chunks already stored for %s", seen, labels)
+    else:
+        logger.info("Ingested %d new chunks for %s in %.2fs", stored, labels, elapsed)
+    return stored
+
+
+def _ingest_filings(collection: chromadb.Collection, filings: list[dict], ticker: str) -> int:
+    """
+    Stream, chunk, embed, and store filings through the ingestion pipeline
+    (_ingest_sources). Each filing's download-to-chunked time is recorded
+    as external call "ingest.filing" (see /metrics/latency).
+    Returns number of new chunks stored (0 if all already present).
+    """
+    def source(filing: dict) -> Callable[[], Iterable[dict]]:
+        def make_chunks() -> Iterable[dict]:
+            text = _stream_filing_text(filing["cik"], filing["accession_number"], filing["primary_doc"])
+            return _iter_section_chunks(text, ticker, filing["filing_type"], filing["period"])
+        return make_chunks
+
+    return _ingest_sources(
+        collection,
+        [(f"{ticker} {filing['filing_type']} {filing['period']}", source(filing)) for filing in filings],
     )
-    logger.info("Ingested %d new chunks for %s %s", len(new_chunks), ticker, filing["period"])
-    return len(new_chunks)
+
+
+def _ingest_chunks(collection: chromadb.Collection, chunks: Iterable[dict], ticker: str, period: str) -> int:
+    """Ingest already-chunked text (benchmarks). Returns number of new chunks stored."""
+    return _ingest_sources(collection, [(f"{ticker} {period}", lambda: chunks)])
 
 
 _MIN_RELEVANCE_SCORE = 0.62
@@ -388,20 +1485,24 @@ def _periods_for_date_range(start_date: str, end_date: str) -> list[str]:
     return periods
 
 
-def _query_collection(
+def _where_clause(ticker: str, filing_periods: list[str] | None) -> dict:
+    """ChromaDB metadata filter for one ticker, optionally limited to filing periods."""
+    if not filing_periods:
+        return {"ticker": ticker}
+    return {"$and": [{"ticker": ticker}, {"filing_period": {"$in": list(filing_periods)}}]}
+
+
+def _vector_hits(
     collection: chromadb.Collection,
     ticker: str,
     user_message: str,
-    filing_periods: list[str] | None = None,
+    filing_periods: list[str] | None,
+    embed_timeout: Optional[float] = None,
 ) -> list[dict]:
     """
-    Semantic search in ChromaDB filtered to ticker and optionally filing_period.
-    Applies a minimum relevance score threshold to exclude low-signal chunks.
-    Returns list of filing_chunk dicts matching the state schema.
-
-    filing_periods: if provided, only chunks whose filing_period is in this list
-    are returned. This prevents the cache-first path from returning 2024 filings
-    for a 2026 query.
+    Vector candidates above _MIN_RELEVANCE_SCORE, best first, as chunk dicts
+    with their ChromaDB id. With embed_timeout, a query embedding that takes
+    longer raises FutureTimeoutError.
     """
     try:
         count = collection.count()
@@ -410,77 +1511,277 @@ def _query_collection(
     except Exception:
         return []
 
-    query_vec = _embed_query(user_message or ticker)
+    if embed_timeout is None:
+        query_vec = _embed_query(user_message or ticker)
+    else:
+        job = _embed_pool.submit(contextvars.copy_context().run, _embed_query, user_message or ticker)
+        query_vec = job.result(timeout=embed_timeout)
 
-    # Filter by ticker only in ChromaDB — period filtering done in Python below.
-    # Combining ticker + filing_period in a ChromaDB $and filter risks raising
-    # "n_results cannot be greater than number of matching documents" when the
-    # collection is large but fewer chunks match the narrow period set.
+    # ChromaDB ≥ 0.5 returns fewer than n_results when fewer documents match
+    # the where-clause, so the narrow period filter is safe to push down.
     try:
-        results = collection.query(
-            query_embeddings=[query_vec],
-            n_results=min(_TOP_K, count),
-            where={"ticker": ticker},
-            include=["documents", "metadatas", "distances"],
-        )
+        with timed_call("chroma.query"):
+            results = collection.query(
+                query_embeddings=[query_vec],
+                n_results=min(_TOP_K * _CANDIDATE_MULTIPLIER, count),
+                where=_where_clause(ticker, filing_periods),
+                include=["documents", "metadatas", "distances"],
+            )
     except Exception as e:
         logger.warning("ChromaDB query failed: %s", e)
         return []
 
-    chunks = []
+    hits = []
     docs = results.get("documents", [[]])[0]
     metas = results.get("metadatas", [[]])[0]
     distances = results.get("distances", [[]])[0]
+    ids = (results.get("ids") or [[]])[0] or [None] * len(docs)
 
-    for doc, meta, dist in zip(docs, metas, distances):
-        # Convert cosine distance → similarity score (0–1)
+    seen_content = set()
+    for chunk_id, doc, meta, dist in zip(ids, docs, metas, distances):
+        # Convert cosine distance → similarity score (0–1); results arrive
+        # best first.
         score = round(1 - dist, 4)
         if score < _MIN_RELEVANCE_SCORE:
             continue  # skip low-signal chunks (boilerplate tables, headers, etc.)
-        # Period filter applied here in Python rather than in ChromaDB query to
-        # avoid n_results > filtered-count errors when the collection is large.
-        if filing_periods and meta.get("filing_period") not in filing_periods:
+        # The same passage from several quarters counts once (best first).
+        key = meta.get("content_hash") or chunk_id or doc
+        if key in seen_content:
             continue
-        chunks.append({
-            "text": doc,
-            "filing_type": meta.get("filing_type", ""),
-            "filing_quarter": meta.get("filing_period", ""),
-            "filing_date": meta.get("filing_date", ""),
-            "chunk_relevance_score": score,
-        })
+        seen_content.add(key)
+        hits.append({"id": key, **_filing_chunk(doc, meta, score)})
+    return hits
 
-    return chunks
+
+def _keyword_hits(ticker: str, user_message: str, filing_periods: list[str] | None) -> list[dict]:
+    """
+    BM25 candidates from the local side index, best first, scored 0–1
+    relative to the top hit. That is not a cosine similarity, so the chunks
+    carry chunk_score_type "keyword".
+    """
+    with timed_call("bm25.search"):
+        results = _bm25_index.search(ticker, user_message or ticker, filing_periods, _TOP_K * _CANDIDATE_MULTIPLIER)
+    if not results:
+        return []
+    best = results[0]["score"] or 1.0
+    hits, seen_content = [], set()
+    for r in results:
+        key = r["metadata"].get("content_hash") or r["id"]
+        if key in seen_content:
+            continue
+        seen_content.add(key)
+        score = round(r["score"] / best, 4)
+        hits.append({"id": key, **_filing_chunk(r["text"], r["metadata"], score, score_type="keyword")})
+    return hits
+
+
+def _filing_chunk(text: str, meta: dict, score: float, score_type: str = "similarity") -> dict:
+    return {
+        "text": text,
+        "filing_type": meta.get("filing_type", ""),
+        "filing_quarter": meta.get("filing_period", ""),
+        "filing_date": meta.get("filing_date", ""),
+        "section": meta.get("section", ""),
+        "chunk_relevance_score": score,
+        "chunk_score_type": score_type,
+    }
+
+
+def _adaptive_top_k(hits: list[dict]) -> list[dict]:
+    """
+    The first _TOP_K hits, extended up to _MAX_TOP_K by hits within
+    _RELEVANCE_MARGIN of the best score.
+    """
+    if not hits:
+        return []
+    best = hits[0]["chunk_relevance_score"]
+    kept = hits[:_TOP_K]
+    for hit in hits[_TOP_K:_MAX_TOP_K]:
+        if best - hit["chunk_relevance_score"] > _RELEVANCE_MARGIN:
+            break
+        kept.append(hit)
+    return kept
+
+
+def _fuse(vector_hits: list[dict], keyword_hits: list[dict]) -> list[dict]:
+    """
+    Reciprocal-rank fusion of the two candidate lists. Returns the first
+    _TOP_K, extended up to _MAX_TOP_K by chunks both retrievers found. A
+    chunk keeps its cosine score when the vector side found it, otherwise
+    its relative BM25 score (chunk_score_type says which).
+    """
+    fused: dict[str, float] = {}
+    by_id: dict[str, dict] = {}
+    found_by: dict[str, int] = {}
+    for hits in (keyword_hits, vector_hits):      # vector last: its scores win on overlap
+        for rank, hit in enumerate(hits):
+            fused[hit["id"]] = fused.get(hit["id"], 0.0) + 1.0 / (_RRF_K + rank + 1)
+            by_id[hit["id"]] = hit
+            found_by[hit["id"]] = found_by.get(hit["id"], 0) + 1
+
+    ranked = sorted(fused, key=fused.get, reverse=True)
+    kept = ranked[:_TOP_K]
+    kept += [i for i in ranked[_TOP_K:] if found_by[i] == 2][: _MAX_TOP_K - len(kept)]
+    return [by_id[i] for i in kept]
+
+
+def _query_collection(
+    collection: chromadb.Collection,
+    ticker: str,
+    user_message: str,
+    filing_periods: list[str] | None = None,
+) -> list[dict]:
+    """
+    Search filing chunks for ticker (optionally limited to filing_periods)
+    per RETRIEVAL_MODE: vector search, BM25 over the local side index, or
+    both fused (the default).
+    Applies a minimum relevance score threshold to exclude low-signal chunks.
+    Returns list of filing_chunk dicts matching the state schema.
+
+    filing_periods: if provided, only chunks whose filing_period is in this list
+    are searched — the filter is part of the vector query, so chunks from other
+    quarters can't crowd the in-range ones out of the top results. This
+    prevents the cache-first path from returning 2024 filings for a 2026
+    query, or missing cached 2026 chunks and re-ingesting them.
+
+    Adaptive top-k: _TOP_K * _CANDIDATE_MULTIPLIER candidates are fetched in
+    one query per retriever. The first _TOP_K are returned; vector results
+    are extended up to _MAX_TOP_K by candidates within _RELEVANCE_MARGIN of
+    the best match (e.g. a question spanning several quarters), fused
+    results by candidates both retrievers found. Chunks dropped by the
+    threshold are backfilled without a second query.
+
+    Hybrid fallback: the query embedding gets EMBED_QUERY_TIMEOUT_SECONDS.
+    If it times out or fails and BM25 found anything, the keyword hits are
+    returned alone; otherwise the error propagates as before.
+    """
+    if RETRIEVAL_MODE == "bm25":
+        return _strip_ids(_keyword_hits(ticker, user_message, filing_periods)[:_TOP_K])
+    if RETRIEVAL_MODE == "vector":
+        return _strip_ids(_adaptive_top_k(_vector_hits(collection, ticker, user_message, filing_periods)))
+
+    keyword_hits = _keyword_hits(ticker, user_message, filing_periods)
+    try:
+        vector_hits = _vector_hits(
+            collection, ticker, user_message, filing_periods,
+            embed_timeout=EMBED_QUERY_TIMEOUT_SECONDS if keyword_hits else None,
+        )
+    except Exception as e:
+        if not keyword_hits:
+            raise
+        logger.warning("query embedding unavailable (%s), using BM25 results only", e or type(e).__name__)
+        return _strip_ids(keyword_hits[:_TOP_K])
+
+    if not keyword_hits:
+        return _strip_ids(_adaptive_top_k(vector_hits))
+    return _strip_ids(_fuse(vector_hits, keyword_hits))
+
+
+def _strip_ids(hits: list[dict]) -> list[dict]:
+    return [{k: v for k, v in hit.items() if k != "id"} for hit in hits]
+
+
+def _has_vectors(collection: chromadb.Collection, ticker: str, filing_periods: list[str] | None) -> bool:
+    """
+    True if the vector collection holds any chunk for ticker in filing_periods.
+
+    The BM25 side index is not tied to one collection, so after an embedding
+    backend switch or a deleted vector store it can still answer while the
+    collection is empty. A lookup error counts as present: the query path
+    has already logged it, and it is no reason to re-ingest.
+    """
+    try:
+        found = collection.get(where=_where_clause(ticker, filing_periods), limit=1, include=[])
+    except Exception as e:
+        logger.warning("ChromaDB lookup failed for %s: %s", ticker, e)
+        return True
+    return bool(found.get("ids"))
 
 
 # ---------------------------------------------------------------------------
-# Node function
+# Background ingestion
 # ---------------------------------------------------------------------------
 
-def retrieve_rag_context(state: AgentState) -> AgentState:
+_ingest_pool = ThreadPoolExecutor(max_workers=max(INGEST_WORKERS, 1), thread_name_prefix="sec-ingest")
+# Pipeline stages of each job (see _ingest_sources): filing downloads run
+# concurrently, and ChromaDB adds overlap the next batch's embedding.
+_download_pool = ThreadPoolExecutor(
+    max_workers=max(INGEST_WORKERS, 1) * _MAX_FILINGS_TO_INGEST, thread_name_prefix="sec-download",
+)
+_add_pool = ThreadPoolExecutor(max_workers=max(INGEST_WORKERS, 1), thread_name_prefix="chroma-add")
+_ingest_jobs: dict[tuple[str, str, str], Future] = {}
+_ingest_jobs_lock = threading.Lock()
+
+
+def ingest_ticker(ticker: str, start_date: str, end_date: str) -> int:
     """
-    Node 7: RAG Retriever.
+    Discover the EDGAR filings covering the date range and ingest them.
+    Returns the number of new chunks stored. Blocking — runs on the ingest
+    workers or from the watchlist CLI.
+    """
+    collection = _get_collection()
+    cik = _get_cik(ticker)
+    if not cik:
+        logger.info("ingest_ticker: CIK not found for %s", ticker)
+        return 0
 
-    Retrieves relevant SEC filing chunks from ChromaDB.  Triggers on-demand
-    ingestion from SEC EDGAR when no cached chunks exist for the ticker.
+    filings = _discover_filings(cik, ticker, start_date, end_date)
+    if not filings:
+        logger.info("ingest_ticker: no EDGAR filings found for %s in range", ticker)
+        return 0
+
+    total_new = _ingest_filings(collection, filings, ticker)
+    if total_new == 0:
+        logger.info("ingest_ticker: filings already ingested or empty for %s", ticker)
+    return total_new
+
+
+def _run_ingest_job(ticker: str, start_date: str, end_date: str) -> int:
+    try:
+        return ingest_ticker(ticker, start_date, end_date)
+    except Exception as e:
+        logger.error("background ingestion failed for %s %s..%s: %s", ticker, start_date, end_date, e)
+        raise
+
+
+def submit_ingestion(ticker: str, start_date: str, end_date: str) -> Future:
     """
-    ticker = state.get("ticker", "")
-    start_date = state.get("start_date", "")
-    end_date = state.get("end_date", "")
-    user_message = state.get("user_message", "")
+    Queue ingest_ticker() on the worker pool, or return the job already
+    in flight for the same (ticker, start_date, end_date).
+    """
+    key = (ticker.upper(), start_date, end_date)
+    with _ingest_jobs_lock:
+        job = _ingest_jobs.get(key)
+        if job is not None:
+            return job
+        job = _ingest_jobs[key] = _ingest_pool.submit(_run_ingest_job, *key)
 
-    if not ticker:
-        logger.debug("retrieve_rag_context: no ticker, skipping")
-        return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
+    def _forget(done: Future) -> None:
+        with _ingest_jobs_lock:
+            if _ingest_jobs.get(key) is done:
+                del _ingest_jobs[key]
 
-    if not start_date or not end_date:
-        logger.debug("retrieve_rag_context: no date range for %s, skipping", ticker)
-        return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
+    job.add_done_callback(_forget)
+    return job
 
-    gcp_project = os.getenv("GOOGLE_CLOUD_PROJECT")
-    if not gcp_project:
-        logger.warning("retrieve_rag_context: GOOGLE_CLOUD_PROJECT not set")
-        return {"filing_chunks": [], "filing_ingested": False, "filing_error": "GOOGLE_CLOUD_PROJECT not configured"}
 
+def ingestion_pending(ticker: str) -> bool:
+    """True while any ingestion job for ticker is queued or running."""
+    ticker = ticker.upper()
+    with _ingest_jobs_lock:
+        return any(key[0] == ticker and not job.done() for key, job in _ingest_jobs.items())
+
+
+# ---------------------------------------------------------------------------
+# Node function
+# ---------------------------------------------------------------------------
+
+def _retrieve(ticker: str, start_date: str, end_date: str, user_message: str) -> dict:
+    """
+    Blocking body of Node 7: cache-first query, then queue EDGAR ingestion
+    and re-query if it finishes within INGEST_WAIT_SECONDS.
+    Runs in a worker thread (see retrieve_rag_context).
+    """
     try:
         collection = _get_collection()
         filing_periods = _periods_for_date_range(start_date, end_date)
@@ -489,29 +1790,34 @@ def retrieve_rag_context(state: AgentState) -> AgentState:
             ticker, filing_periods,
         )
 
-        # Step 1: try retrieval from existing vector store (date-filtered)
+        # Step 1: try retrieval from existing vector store (date-filtered).
+        # Outside bm25 mode keyword hits alone are not a cache hit: if the
+        # collection has no chunks for the range, they came from a stale
+        # BM25 index and the vector side still needs ingesting.
         chunks = _query_collection(collection, ticker, user_message, filing_periods=filing_periods)
-        if chunks:
+        if chunks and (RETRIEVAL_MODE == "bm25" or _has_vectors(collection, ticker, filing_periods)):
             logger.info("retrieve_rag_context: %d chunks retrieved from cache for %s", len(chunks), ticker)
-            return {"filing_chunks": chunks, "filing_ingested": False, "filing_error": None}
-
-        # Step 2: no cached chunks for this date range → discover and ingest from EDGAR
-        cik = _get_cik(ticker)
-        if not cik:
-            logger.info("retrieve_rag_context: CIK not found for %s", ticker)
-            return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
-
-        filings = _discover_filings(cik, ticker, start_date, end_date)
-        if not filings:
-            logger.info("retrieve_rag_context: no EDGAR filings found for %s in range", ticker)
-            return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
-
-        total_new = 0
-        for filing in filings:
-            total_new += _ingest_filing(collection, filing, ticker)
-
-        if total_new == 0:
-            logger.info("retrieve_rag_context: filings already ingested or empty for %s", ticker)
+            return {
+                "filing_chunks": chunks,
+                "filing_ingested": False,
+                "filing_ingestion_pending": ingestion_pending(ticker),
+                "filing_error": None,
+            }
+
+        # Step 2: no cached chunks for this date range → ingest from EDGAR in
+        # the background; answer now (with any keyword hits) unless the job
+        # finishes within the wait.
+        job = submit_ingestion(ticker, start_date, end_date)
+        try:
+            total_new = job.result(timeout=INGEST_WAIT_SECONDS)
+        except FutureTimeoutError:
+            logger.info("retrieve_rag_context: ingestion for %s queued, answering without vector results", ticker)
+            return {
+                "filing_chunks": chunks,
+                "filing_ingested": False,
+                "filing_ingestion_pending": True,
+                "filing_error": None,
+            }
 
         # Step 3: re-query after ingestion (same date filter)
         chunks = _query_collection(collection, ticker, user_message, filing_periods=filing_periods)
@@ -519,8 +1825,47 @@ def retrieve_rag_context(state: AgentState) -> AgentState:
             "retrieve_rag_context: ingested %d new chunks, retrieved %d for %s",
             total_new, len(chunks), ticker,
         )
-        return {"filing_chunks": chunks, "filing_ingested": total_new > 0, "filing_error": None}
+        return {
+            "filing_chunks": chunks,
+            "filing_ingested": total_new > 0,
+            "filing_ingestion_pending": ingestion_pending(ticker),
+            "filing_error": None,
+        }
 
     except Exception as e:
         logger.error("retrieve_rag_context failed: %s", e)
         return {"filing_chunks": [], "filing_ingested": False, "filing_error": str(e)}
+
+
+async def retrieve_rag_context(state: AgentState) -> AgentState:
+    """
+    Node 7: RAG Retriever.
+
+    Retrieves relevant SEC filing chunks from ChromaDB.  Triggers on-demand
+    ingestion from SEC EDGAR when no cached chunks exist for the ticker.
+    """
+    ticker = state.get("ticker", "")
+    start_date = state.get("start_date", "")
+    end_date = state.get("end_date", "")
+    user_message = state.get("user_message", "")
+
+    if not ticker:
+        logger.debug("retrieve_rag_context: no ticker, skipping")
+        return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
+
+    if not start_date or not end_date:
+        logger.debug("retrieve_rag_context: no date range for %s, skipping", ticker)
+        return {"filing_chunks": [], "filing_ingested": False, "filing_error": None}
+
+    try:
+        embedder = _get_embedder()
+    except ValueError as e:
+        logger.warning("retrieve_rag_context: %s", e)
+        return {"filing_chunks": [], "filing_ingested": False, "filing_error": str(e)}
+
+    gcp_project = os.getenv("GOOGLE_CLOUD_PROJECT")
+    if embedder.requires_gcp and not gcp_project and RETRIEVAL_MODE != "bm25":
+        logger.warning("retrieve_rag_context: GOOGLE_CLOUD_PROJECT not set")
+        return {"filing_chunks": [], "filing_ingested": False, "filing_error": "GOOGLE_CLOUD_PROJECT not configured"}
+
+    return await asyncio.to_thread(_retrieve, ticker, start_date, end_date, user_message)
@@ -22,15 +22,20 @@ Two co-primary sources — both run on every query, results combined:
 
 Posts from both sources are combined and aggregated into sentiment_summary,
 which includes a per-source breakdown for transparency in Node 9.
+
+The node is async: Reddit and Stocktwits are fetched concurrently on the
+shared AsyncClient (http_client.py), and LLM batches use ainvoke so the
+event loop is never blocked by a classifier call.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime, timezone
 
-import requests
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from agent.graph.nodes.http_client import async_get
 from agent.graph.nodes.state import AgentState
 from llm.llm_setup import llm_classifier
 
@@ -65,7 +70,7 @@ Posts:
 # Reddit public JSON fetcher
 # ---------------------------------------------------------------------------
 
-def _fetch_reddit_posts(
+async def _fetch_reddit_posts(
     ticker: str,
     company_name: str,
     start_date: str,
@@ -90,7 +95,7 @@ def _fetch_reddit_posts(
     query = " OR ".join(query_parts)
 
     try:
-        resp = requests.get(
+        resp = await async_get(
             f"https://www.reddit.com/r/{_SUBREDDITS}/search.json",
             headers=_REDDIT_HEADERS,
             params={
@@ -139,7 +144,7 @@ def _fetch_reddit_posts(
 # Stocktwits public stream fetcher
 # ---------------------------------------------------------------------------
 
-def _fetch_stocktwits_messages(
+async def _fetch_stocktwits_messages(
     ticker: str,
     start_date: str,
     end_date: str,
@@ -163,7 +168,7 @@ def _fetch_stocktwits_messages(
 
     for _ in range(_MAX_STOCKTWITS_PAGES):
         try:
-            resp = requests.get(
+            resp = await async_get(
                 f"https://api.stocktwits.com/api/2/streams/symbol/{ticker}.json",
                 params=params,
                 timeout=_REQUEST_TIMEOUT,
@@ -233,7 +238,7 @@ def _fetch_stocktwits_messages(
 # LLM sentiment classification
 # ---------------------------------------------------------------------------
 
-def _classify_batch(batch: list[dict]) -> list[str]:
+async def _classify_batch(batch: list[dict]) -> list[str]:
     """
     Send a batch of posts to the LLM for sentiment classification.
     Returns labels in the same order as batch.
@@ -246,7 +251,7 @@ def _classify_batch(batch: list[dict]) -> list[str]:
     prompt = _SENTIMENT_PROMPT.format(posts_text=posts_text)
 
     try:
-        response = llm_classifier.invoke([
+        response = await llm_classifier.ainvoke([
             SystemMessage(content="You are a financial sentiment classifier. Return only JSON."),
             HumanMessage(content=prompt),
         ])
@@ -267,7 +272,7 @@ def _classify_batch(batch: list[dict]) -> list[str]:
         return ["neutral"] * len(batch)
 
 
-def _classify_all(posts: list[dict]) -> list[str]:
+async def _classify_all(posts: list[dict]) -> list[str]:
     """
     Classify all posts. Uses Stocktwits pre-label where available to skip
     unnecessary LLM calls. Remaining posts are classified in batches of
@@ -287,7 +292,7 @@ def _classify_all(posts: list[dict]) -> list[str]:
     llm_labels: list[str] = []
     for batch_start in range(0, len(llm_posts), _BATCH_SIZE):
         batch = llm_posts[batch_start: batch_start + _BATCH_SIZE]
-        llm_labels.extend(_classify_batch(batch))
+        llm_labels.extend(await _classify_batch(batch))
 
     labels: list[str] = []
     llm_idx = 0
@@ -305,9 +310,10 @@ def _classify_all(posts: list[dict]) -> list[str]:
 # Node function
 # ---------------------------------------------------------------------------
 
-def analyze_reddit_sentiment(state: AgentState) -> AgentState:
+async def analyze_reddit_sentiment(state: AgentState) -> AgentState:
     """
-    Fetch posts from Reddit and Stocktwits, classify sentiment, and aggregate.
+    Fetch posts from Reddit and Stocktwits (concurrently), classify
+    sentiment, and aggregate.
     Writes sentiment_summary (with per-source breakdown) and sentiment_posts.
     Writes sentiment_error on failure; both summary and posts remain None.
     """
@@ -317,8 +323,10 @@ def analyze_reddit_sentiment(state: AgentState) -> AgentState:
     end_date = state.get("end_date", "")
 
     try:
-        reddit_posts = _fetch_reddit_posts(ticker, company_name, start_date, end_date)
-        stocktwits_messages = _fetch_stocktwits_messages(ticker, start_date, end_date)
+        reddit_posts, stocktwits_messages = await asyncio.gather(
+            _fetch_reddit_posts(ticker, company_name, start_date, end_date),
+            _fetch_stocktwits_messages(ticker, start_date, end_date),
+        )
         all_posts = reddit_posts + stocktwits_messages
 
         if not all_posts:
@@ -342,7 +350,7 @@ def analyze_reddit_sentiment(state: AgentState) -> AgentState:
                 "sentiment_error": None,
             }
 
-        labels = _classify_all(all_posts)
+        labels = await _classify_all(all_posts)
 
         sentiment_posts = []
         for post, label in zip(all_posts, labels):
@@ -261,16 +261,30 @@ def _build_synthesis_prompt(state: AgentState) -> str:
         for i, c in enumerate(filing_chunks[:3], 1):
             text_snippet = c.get("text", "")[:400]
             score = c.get("chunk_relevance_score", "")
+            # Keyword-only hits are scored relative to the best BM25 match,
+            # not by cosine similarity, so they get their own label.
+            if c.get("chunk_score_type") == "keyword":
+                score_label = f"keyword match: {score} of best"
+            else:
+                score_label = f"relevance: {score}"
+            section = f" — {c['section']}" if c.get("section") else ""
             chunk_lines.append(
-                f"{i}. {c.get('filing_type')} {c.get('filing_quarter')} "
-                f"(relevance: {score}):\n   {text_snippet}"
+                f"{i}. {c.get('filing_type')} {c.get('filing_quarter')}{section} "
+                f"({score_label}):\n   {text_snippet}"
             )
         ingested_note = " [newly ingested this query]" if filing_ingested else ""
+        if state.get("filing_ingestion_pending"):
+            ingested_note += " [more filings are still being processed]"
         sections.append(
             f"## SEC Filing Excerpts{ingested_note}\n" + "\n".join(chunk_lines)
         )
     elif filing_error:
         sections.append(f"## SEC Filings\nUnavailable — {filing_error}")
+    elif state.get("filing_ingestion_pending"):
+        sections.append(
+            "## SEC Filings\nNot yet available — the relevant filings are being "
+            "processed in the background and will be included in follow-up questions."
+        )
 
     # ------------------------------------------------------------------
     # Options data
@@ -288,6 +302,21 @@ def _build_synthesis_prompt(state: AgentState) -> str:
             f"Average implied volatility: {od.get('average_implied_volatility')}\n"
             f"Max pain strike: {od.get('max_pain')}"
         )
+        surface = od.get("volatility_surface")
+        if surface:
+            term = ", ".join(
+                f"{t['expiry']} ({t['days_to_expiry']}d) {t['atm_iv']}"
+                for t in surface.get("term_structure", [])
+            )
+            skew = ", ".join(
+                f"{k['expiry']} {k['risk_reversal_25d']}"
+                for k in surface.get("skew", [])
+                if k.get("risk_reversal_25d") is not None
+            )
+            sections[-1] += (
+                f"\nATM IV term structure ({surface.get('term_structure_shape')}): {term}"
+                + (f"\n25-delta risk reversal (put IV - call IV): {skew}" if skew else "")
+            )
     elif options_error:
         sections.append(f"## Options Data\nUnavailable — {options_error}")
 
@@ -4,8 +4,8 @@ Retrieval Planner (Phase 5)
 Reads:  user_message, intent, date_context, ticker
 Writes: retrieval_plan, planner_error
 
-Sits between Node 4 (Price Data Fetcher) and the parallel retrieval fan-out
-(Nodes 5, 6, 7). Uses llm_planner (Groq llama-3.1-8b-instant) to decide
+Sits between Node 3 (Date Parser) and the parallel fan-out (Node 4 price
+fetch plus retrieval Nodes 5, 6, 7). Uses llm_planner (Groq llama-3.1-8b-instant) to decide
 which retrieval nodes are worth activating for the current query.
 
 Why a planning node?
@@ -11,9 +11,11 @@ which hid data inside an untyped conversation history. The new approach makes
 every data dependency visible in the type signature.
 """
 
-from typing import Optional, Required
+from typing import Annotated, Optional, Required
 from typing import TypedDict
 
+from agent.graph.nodes.timing import merge_timings
+
 
 class AgentState(TypedDict, total=False):
     """
@@ -24,12 +26,18 @@ class AgentState(TypedDict, total=False):
     fields marked `Required` must be present before the graph starts; all
     others are written by individual nodes during execution.
 
-    Parallel fan-out safety (Nodes 5, 6, 7 via Send()):
+    Parallel fan-out safety (Nodes 4, 5, 6, 7 via Send()):
     LangGraph merges partial dicts from parallel branches by last-write-wins
     per key. Nodes 5, 6, and 7 write to disjoint key sets (news_*, sentiment_*,
-    filing_* respectively), so there is no collision. `Annotated` reducers are
-    NOT needed for this graph. If a future node writes to the same key as a
-    parallel sibling, use `Annotated[list, operator.add]` for that key.
+    filing_* respectively), so there is no collision. Node 4 returns the full
+    state, so it must stay the only branch in that superstep that does.
+    The same rule applies to the front-end stage: Node 1 runs alongside
+    Nodes 2 → 3 and returns only intent/chart_requested/intent_error, while
+    the Node 2 → 3 subgraph hands back only ticker and date fields.
+    The one exception is `timings`: every node writes it (via the timed_node
+    wrapper), so it is the only field with an `Annotated` reducer. If a
+    future node writes to the same key as a parallel sibling, give that key
+    a reducer the same way.
 
     Field ownership is noted in each comment so it's immediately clear which
     node is responsible for writing — and therefore which node to look at if
@@ -237,7 +245,9 @@ class AgentState(TypedDict, total=False):
     filing_chunks: Optional[list]
     # List of relevant SEC filing text chunks, each containing:
     #   text, filing_type (e.g. "10-Q"), filing_quarter, filing_date,
-    #   chunk_relevance_score
+    #   section (e.g. "Risk Factors"; "" for unstructured filings),
+    #   chunk_relevance_score, chunk_score_type ("similarity" for cosine
+    #   similarity, "keyword" for a BM25 score relative to the best match)
     # None if retrieval failed or no filings found.
     # Read by: Node 9.
 
@@ -247,6 +257,13 @@ class AgentState(TypedDict, total=False):
     # the response ("Note: this filing was just processed for the first time").
     # Read by: Node 9.
 
+    filing_ingestion_pending: Optional[bool]
+    # True when an EDGAR ingestion job for the ticker had not finished when
+    # Node 7 answered: the one it queued on a miss, or another session's job
+    # for a different date range. Node 9 tells the user filings are being
+    # processed and a follow-up question will include them.
+    # Read by: Node 9.
+
     filing_error: Optional[str]
     # Written by Node 7 on failure. None on success.
 
@@ -261,7 +278,9 @@ class AgentState(TypedDict, total=False):
     #   highest_volume_calls (list of strike prices),
     #   highest_volume_puts (list of strike prices),
     #   total_call_volume, total_put_volume,
-    #   average_implied_volatility, notable_positions (list)
+    #   average_implied_volatility, notable_positions (list),
+    #   volatility_surface (ATM IV term structure + 25-delta skew across the
+    #   nearest expiries; None if unavailable)
     # None if retrieval failed.
     # Read by: Node 9.
 
@@ -326,3 +345,12 @@ class AgentState(TypedDict, total=False):
     # A non-None value here does NOT stop execution — the fallback plan
     # (all nodes active) is used instead.
 
+    # -------------------------------------------------------------------------
+    # Instrumentation — written by the timed_node wrapper around every node
+    # -------------------------------------------------------------------------
+
+    timings: Annotated[dict, merge_timings]
+    # Per-request latency: {"nodes": {node: seconds},
+    #                       "calls": {"yfinance.history": [seconds, ...], ...}}.
+    # Parallel branches all write it, so merge_timings combines the writes.
+    # Read by: Chainlit app.py (request log). Not fed back into prompts.
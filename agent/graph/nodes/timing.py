@@ -0,0 +1,311 @@
+"""
+Latency instrumentation for the workflow nodes and their external calls.
+
+Two views of the same measurements:
+
+  Per request — AgentState["timings"]
+    Every node registered in create_workflow is wrapped by timed_node(). The
+    wrapper times the node and collects every timed_call() made while it
+    runs, then returns them under the node's `timings` key:
+        {"nodes": {"fetch_price": 0.412, ...},
+         "calls": {"yfinance.history": [0.301], "finnhub": [0.220], ...}}
+    Parallel branches write `timings` in the same superstep, so the field
+    uses merge_timings as its reducer (node durations add, call lists
+    concatenate).
+
+  Process-wide — histograms
+    Each measurement is also observed into a latency histogram keyed by
+    ("node", name) or ("call", name). snapshot() returns count, sum, max,
+    cumulative bucket counts and rolling p50/p95/p99 for each; the Chainlit
+    app serves it at /metrics/latency.
+
+How calls are attributed:
+  The active collector lives in a ContextVar. asyncio tasks, asyncio.to_thread
+  and LangGraph's executor all copy the context, so calls made in those
+  places land in the node that triggered them. Work on shared thread pools
+  (e.g. the fundamentals prefetch) only reaches the histograms unless the
+  submit wraps it in contextvars.copy_context().run.
+
+  A timed node that runs while another timed node is active (e.g. a node
+  function called directly from inside another) reports into the outer
+  collector instead of its result, so nothing is counted twice.
+
+LLM calls are timed by LLMLatencyCallback, attached to the models in
+llm/llm_setup.py, so every invoke/ainvoke/stream is covered without
+touching call sites.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the cumulative histogram buckets
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Samples kept per histogram for the rolling percentiles
+_WINDOW = 1024
+
+
+# ---------------------------------------------------------------------------
+# Histograms
+# ---------------------------------------------------------------------------
+
+class _Histogram:
+    """Cumulative-bucket latency histogram plus a rolling sample window."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bucket_counts = [0] * (len(_BUCKETS) + 1)   # last slot = +Inf
+        self.window: deque[float] = deque(maxlen=_WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.window.append(seconds)
+        for i, bound in enumerate(_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.window)
+
+        def pct(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 4)
+
+        cumulative = {}
+        running = 0
+        for bound, n in zip(list(_BUCKETS) + ["+Inf"], self.bucket_counts):
+            running += n
+            cumulative[str(bound)] = running
+
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "max": round(self.max, 4),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "buckets": cumulative,
+        }
+
+
+_histograms: dict[tuple[str, str], _Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _observe(kind: str, name: str, seconds: float) -> None:
+    with _histograms_lock:
+        hist = _histograms.get((kind, name))
+        if hist is None:
+            hist = _histograms[(kind, name)] = _Histogram()
+        hist.observe(seconds)
+
+
+def snapshot() -> dict:
+    """Histogram summaries: {"nodes": {name: {...}}, "calls": {name: {...}}}."""
+    with _histograms_lock:
+        out: dict = {"nodes": {}, "calls": {}}
+        for (kind, name), hist in sorted(_histograms.items()):
+            out["nodes" if kind == "node" else "calls"][name] = hist.snapshot()
+        return out
+
+
+def reset() -> None:
+    """Drop all histograms (tests)."""
+    with _histograms_lock:
+        _histograms.clear()
+
+
+# ---------------------------------------------------------------------------
+# Per-request collection
+# ---------------------------------------------------------------------------
+
+class _Collector:
+    def __init__(self):
+        self.nodes: dict[str, float] = {}
+        self.calls: dict[str, list[float]] = {}
+        self.lock = threading.Lock()
+
+    def add_call(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.calls.setdefault(name, []).append(round(seconds, 4))
+
+    def add_node(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.nodes[name] = round(self.nodes.get(name, 0.0) + seconds, 4)
+
+    def absorb(self, other: "_Collector") -> None:
+        with self.lock:
+            for name, seconds in other.nodes.items():
+                self.nodes[name] = round(self.nodes.get(name, 0.0) + seconds, 4)
+            for name, samples in other.calls.items():
+                self.calls.setdefault(name, []).extend(samples)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {"nodes": dict(self.nodes), "calls": {k: list(v) for k, v in self.calls.items()}}
+
+
+_current: contextvars.ContextVar[Optional[_Collector]] = contextvars.ContextVar("timing_collector", default=None)
+
+
+def record_call(name: str, seconds: float) -> None:
+    """Record one external call into the histograms and the active node, if any."""
+    _observe("call", name, seconds)
+    collector = _current.get()
+    if collector is not None:
+        collector.add_call(name, seconds)
+
+
+@contextmanager
+def timed_call(name: str):
+    """Time the enclosed block as one external call (usable around `await` too)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_call(name, time.perf_counter() - started)
+
+
+def submit_timed(pool, name: str, fn: Callable, *args):
+    """
+    pool.submit(fn, *args), timed as external call `name` and run in a copy
+    of the caller's context so the call is attributed to the calling node.
+    """
+    ctx = contextvars.copy_context()
+
+    def _run():
+        with timed_call(name):
+            return fn(*args)
+
+    return pool.submit(ctx.run, _run)
+
+
+def merge_timings(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer for AgentState["timings"]: node durations add, call lists concatenate."""
+    merged = {
+        "nodes": dict((left or {}).get("nodes") or {}),
+        "calls": {k: list(v) for k, v in ((left or {}).get("calls") or {}).items()},
+    }
+    for name, seconds in ((right or {}).get("nodes") or {}).items():
+        merged["nodes"][name] = round(merged["nodes"].get(name, 0.0) + seconds, 4)
+    for name, samples in ((right or {}).get("calls") or {}).items():
+        merged["calls"].setdefault(name, []).extend(samples)
+    return merged
+
+
+def _finish(name: str, result, collector: _Collector, parent: Optional[_Collector], started: float):
+    elapsed = time.perf_counter() - started
+    _observe("node", name, elapsed)
+    collector.add_node(name, elapsed)
+    if not isinstance(result, dict):
+        return result
+    result = dict(result)
+    if parent is not None:
+        # Nested inside another timed node: hand everything to the outer one.
+        parent.absorb(collector)
+        result.pop("timings", None)
+    else:
+        # Replaces any `timings` copied in by full-state returns.
+        result["timings"] = collector.as_dict()
+    return result
+
+
+def timed_node(name: str, fn: Callable) -> Callable:
+    """
+    Wrap a LangGraph node so its duration and external calls are recorded.
+    Async nodes get an async wrapper; sync nodes a sync one.
+    """
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _async_node(state):
+            parent = _current.get()
+            collector = _Collector()
+            token = _current.set(collector)
+            started = time.perf_counter()
+            try:
+                result = await fn(state)
+            finally:
+                _current.reset(token)
+            return _finish(name, result, collector, parent, started)
+        return _async_node
+
+    @functools.wraps(fn)
+    def _sync_node(state):
+        parent = _current.get()
+        collector = _Collector()
+        token = _current.set(collector)
+        started = time.perf_counter()
+        try:
+            result = fn(state)
+        finally:
+            _current.reset(token)
+        return _finish(name, result, collector, parent, started)
+    return _sync_node
+
+
+def format_timings(timings: Optional[dict]) -> str:
+    """One-line summary, slowest node first, for request logs."""
+    if not timings:
+        return "no timings"
+    nodes = sorted((timings.get("nodes") or {}).items(), key=lambda kv: kv[1], reverse=True)
+    calls = sorted(
+        ((name, sum(samples), len(samples)) for name, samples in (timings.get("calls") or {}).items()),
+        key=lambda c: c[1],
+        reverse=True,
+    )
+    node_part = ", ".join(f"{n}={s:.3f}s" for n, s in nodes)
+    call_part = ", ".join(f"{n}={s:.3f}s/{k}" for n, s, k in calls)
+    return f"nodes[{node_part}] calls[{call_part}]"
+
+
+# ---------------------------------------------------------------------------
+# LLM calls
+# ---------------------------------------------------------------------------
+
+class LLMLatencyCallback(BaseCallbackHandler):
+    """
+    LangChain callback that times every chat-model run as an external call
+    named `llm.<label>`. run_inline keeps it on the caller's thread/context
+    so the duration is attributed to the node that made the call.
+    """
+
+    run_inline = True
+
+    def __init__(self, label: str):
+        self.name = f"llm.{label}"
+        self._starts: dict = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        self._starts[run_id] = time.perf_counter()
+
+    def _stop(self, run_id) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is not None:
+            record_call(self.name, time.perf_counter() - started)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        self._stop(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._stop(run_id)
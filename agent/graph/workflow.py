@@ -3,33 +3,38 @@ LangGraph workflow for the Stock Insight Agent — Phase 2 + Nodes 7 and 8 + Pha
 
 Nodes wired:
   1  Intent Classifier    — classify_intent
-  2  Ticker Resolver      — resolve_ticker
-  3  Date Parser          — parse_dates
-  4  Price Data Fetcher   — fetch_price_data
+  2  Ticker Resolver      — resolve_ticker   ─┐ resolve_subject subgraph,
+  3  Date Parser          — parse_dates      ─┘ parallel with Node 1
   P  Retrieval Planner    — plan_retrieval      (Phase 5 — decides which of 5/6/7 to run)
-  5  News Retriever       — retrieve_news      ─┐ parallel via Send() (if plan says fetch_news)
+  4  Price Data Fetcher   — fetch_price_data   ─┐ parallel via Send() (always)
+  5  News Retriever       — retrieve_news       │ parallel           (if plan says fetch_news)
   6  Reddit Sentiment     — reddit_sentiment    ├─ parallel           (if plan says fetch_sentiment)
-  7  RAG Retriever        — retrieve_rag        ─┘                    (if plan says fetch_rag)
+  7  RAG Retriever        — retrieve_rag       ─┘                    (if plan says fetch_rag)
   8  Options Analyzer     — analyze_options
   9  Response Synthesizer — synthesize_response
   10 Chart Generator      — generate_chart
 
 Routing overview:
-  Node 1 → Node 2 → Node 3 → route_after_date_parser
+  START ─┬─ Node 1 ───────────────┬─ join_front_end → route_after_date_parser
+         └─ resolve_subject ──────┘
+              (Node 2 → Node 3)
     date_missing or intent="unknown"  → synthesize
     intent="options_view"             → analyze_options → synthesize
-    all other intents                 → fetch_price
-
-  route_after_fetch_price
-    intent="chart_request"            → generate_chart → END
+    intent="chart_request"            → fetch_price
     all other intents                 → plan_retrieval (Phase 5 planner)
 
   route_after_plan_retrieval
-    reads retrieval_plan flags        → selective Send() fan-out
-    fallback (all flags True)         → Send(retrieve_news)
+    reads retrieval_plan flags        → Send(fetch_price)
+                                        + selective Send() fan-out to 5/6/7
+    fallback (all flags True)         → Send(fetch_price)
+                                        + Send(retrieve_news)
                                         + Send(reddit_sentiment)
                                         + Send(retrieve_rag)
-                                        [active branches converge at synthesize]
+                                        [all branches converge at synthesize]
+
+  route_after_fetch_price
+    intent="chart_request"            → generate_chart → END
+    all other intents                 → synthesize (joins the fan-out)
 
   route_after_synthesizer
     chart_requested=True              → generate_chart → END
@@ -41,6 +46,32 @@ Why options_view routes directly to analyze_options (skipping fetch_price)?
   but a historical OHLCV fetch would add latency without adding relevant
   insight for options_view intent. The current snapshot is enough.
 
+Why is fetch_price a fan-out branch instead of a step before the planner?
+  News, sentiment and RAG only need ticker and dates — none of them reads
+  price_data. Running Node 4 ahead of the planner put the price round-trip
+  on the critical path of every stock_analysis query:
+    before: parse_dates → fetch_price → plan_retrieval → max(5, 6, 7)
+    after:  parse_dates → plan_retrieval → max(4, 5, 6, 7)
+  LangGraph runs each superstep to completion before starting the next, so
+  the planner (one cheap LLM call) has to finish before any branch starts;
+  dispatching Node 4 in the same Send() batch as 5/6/7 hides its latency
+  behind the slowest retrieval branch instead of adding to it.
+
+Why does Node 1 run alongside Nodes 2 and 3?
+  Nodes 2 and 3 never read intent, and Node 1 never reads ticker or dates.
+  Only the router after Node 3 needs both. Running them in sequence put the
+  intent LLM call in front of every ticker/date lookup:
+    before: intent LLM → ticker → dates (earnings lookup / LLM fallback)
+    after:  max(intent LLM, ticker → dates)
+  Nodes 2 and 3 stay sequential inside the resolve_subject subgraph because
+  the date parser's earnings layer (and its LLM fallback) needs the ticker;
+  the regex layers of both are microseconds, so they simply finish while
+  the intent call is still in flight. The subgraph's output schema limits
+  its writes to ticker/date fields, and Node 1 returns only its own keys,
+  so the two branches never write the same key in one superstep.
+  join_front_end is a no-op barrier: a conditional edge on either branch
+  would only see that branch's own writes, not the sibling's.
+
 Why keep chart_request separate from chart_requested?
   intent="chart_request" skips news retrieval and the synthesizer
   entirely — the user explicitly asked for a chart, not a narrative.
@@ -49,11 +80,13 @@ Why keep chart_request separate from chart_requested?
 """
 
 import logging
+from typing import Optional, TypedDict
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langgraph.types import Send
 
 from agent.graph.nodes.state import AgentState
+from agent.graph.nodes.timing import timed_node
 from agent.graph.nodes.intent_classifier import classify_intent
 from agent.graph.nodes.ticker_resolver import resolve_ticker
 from agent.graph.nodes.date_parser import parse_dates
@@ -91,7 +124,8 @@ logger = logging.getLogger(__name__)
 
 def route_after_date_parser(state: AgentState) -> str:
     """
-    Decide which node runs after Node 3 (Date Parser).
+    Decide which node runs after the front-end join (Node 1 in parallel
+    with Nodes 2 → 3).
 
     Routes to "synthesize" when no useful data can be fetched:
       - date_missing: no time window to query APIs
@@ -100,8 +134,11 @@ def route_after_date_parser(state: AgentState) -> str:
     Routes to "analyze_options" for options_view intent — Node 8 fetches
     the live options chain and does not need a historical date range.
 
-    Routes to "fetch_price" for all other data-bearing intents, including
-    chart_request (chart needs daily OHLCV from Node 4).
+    Routes to "fetch_price" for chart_request (the chart needs only daily
+    OHLCV from Node 4; no planner, no retrieval).
+
+    Routes to "plan_retrieval" for all other data-bearing intents; Node 4
+    is dispatched from there alongside the retrieval branches.
     """
     date_missing = state.get("date_missing", False)
     intent = state.get("intent", "unknown")
@@ -114,8 +151,12 @@ def route_after_date_parser(state: AgentState) -> str:
         logger.debug("route_after_date_parser → analyze_options (intent=options_view)")
         return "analyze_options"
 
-    logger.debug("route_after_date_parser → fetch_price (intent=%s)", intent)
-    return "fetch_price"
+    if intent == "chart_request":
+        logger.debug("route_after_date_parser → fetch_price (intent=chart_request)")
+        return "fetch_price"
+
+    logger.debug("route_after_date_parser → plan_retrieval (intent=%s)", intent)
+    return "plan_retrieval"
 
 
 def route_after_fetch_price(state: AgentState) -> str:
@@ -125,8 +166,8 @@ def route_after_fetch_price(state: AgentState) -> str:
     chart_request intent: skip news/sentiment/RAG entirely — go straight
     to chart generation.
 
-    All other intents: hand off to the Retrieval Planner, which decides
-    which of Nodes 5/6/7 are worth activating for this specific query.
+    All other intents: Node 4 ran as one branch of the planner's fan-out,
+    so it converges at synthesize with the retrieval branches.
     """
     intent = state.get("intent", "stock_analysis")
 
@@ -134,8 +175,8 @@ def route_after_fetch_price(state: AgentState) -> str:
         logger.debug("route_after_fetch_price: chart_request -> generate_chart")
         return "generate_chart"
 
-    logger.debug("route_after_fetch_price: intent=%s -> plan_retrieval", intent)
-    return "plan_retrieval"
+    logger.debug("route_after_fetch_price: intent=%s -> synthesize", intent)
+    return "synthesize"
 
 
 def route_after_plan_retrieval(state: AgentState):
@@ -143,13 +184,15 @@ def route_after_plan_retrieval(state: AgentState):
     Build the parallel Send() fan-out using the retrieval_plan written by
     the Retrieval Planner node.
 
-    Reads retrieval_plan flags (fetch_news, fetch_sentiment, fetch_rag)
-    and emits a Send() for each active node. Falls back to all three if
-    the plan is missing or empty (e.g. planner LLM call failed).
+    Always dispatches Node 4 (fetch_price) — price data is not optional for
+    analysis intents. Then reads retrieval_plan flags (fetch_news,
+    fetch_sentiment, fetch_rag) and emits a Send() for each active node.
+    Falls back to all three if the plan is missing or empty (e.g. planner
+    LLM call failed).
 
-    LangGraph dispatches each Send() as a separate parallel branch. All
-    active paths target 'synthesize', so LangGraph waits for every branch
-    before advancing past that node.
+    LangGraph dispatches each Send() as a separate parallel branch in the
+    same superstep. All paths target 'synthesize', so LangGraph waits for
+    every branch before advancing past that node.
     """
     plan = state.get("retrieval_plan") or {}
 
@@ -161,8 +204,8 @@ def route_after_plan_retrieval(state: AgentState):
     if plan.get("fetch_rag", True):
         sends.append(Send("retrieve_rag", state))
 
-    # Safety net: never return an empty list — that would leave synthesize
-    # waiting for branches that never complete.
+    # Safety net: an all-False plan is treated like a failed plan — activate
+    # every retrieval node (the pre-planner baseline).
     if not sends:
         logger.warning("route_after_plan_retrieval: all flags False — activating all nodes")
         sends = [
@@ -171,8 +214,8 @@ def route_after_plan_retrieval(state: AgentState):
             Send("retrieve_rag", state),
         ]
 
-    logger.debug("route_after_plan_retrieval: dispatching %d branch(es)", len(sends))
-    return sends
+    logger.debug("route_after_plan_retrieval: dispatching price + %d retrieval branch(es)", len(sends))
+    return [Send("fetch_price", state)] + sends
 
 
 def route_after_synthesizer(state: AgentState) -> str:
@@ -195,6 +238,46 @@ def route_after_synthesizer(state: AgentState) -> str:
     return "end"
 
 
+# ---------------------------------------------------------------------------
+# Front-end stage: Node 1 in parallel with Nodes 2 → 3
+# ---------------------------------------------------------------------------
+
+class _SubjectOutput(TypedDict, total=False):
+    """Fields the resolve_subject subgraph hands back to the parent graph."""
+    ticker: str
+    company_name: str
+    ticker_error: Optional[str]
+    start_date: str
+    end_date: str
+    date_context: str
+    date_missing: bool
+    include_current_snapshot: bool
+    date_error: Optional[str]
+    timings: dict
+
+
+def _build_subject_stage():
+    """
+    Compile Nodes 2 → 3 as one subgraph so they run as a single branch
+    next to Node 1.
+
+    Both nodes return the full state; the output schema trims the
+    subgraph's result to the ticker/date fields so the parent never sees
+    a second write to user_message or intent in the same superstep.
+    """
+    subgraph = StateGraph(AgentState, output_schema=_SubjectOutput)
+    subgraph.add_node("resolve_ticker", timed_node("resolve_ticker", resolve_ticker))
+    subgraph.add_node("parse_dates",    timed_node("parse_dates", parse_dates))
+    subgraph.add_edge(START,            "resolve_ticker")
+    subgraph.add_edge("resolve_ticker", "parse_dates")
+    return subgraph.compile()
+
+
+def _join_front_end(state: AgentState) -> dict:
+    """Barrier after the parallel front-end; writes nothing."""
+    return {}
+
+
 # ---------------------------------------------------------------------------
 # Workflow factory
 # ---------------------------------------------------------------------------
@@ -211,39 +294,41 @@ def create_workflow():
 
     # ------------------------------------------------------------------
     # Register nodes
+    # Every node is wrapped by timed_node, which adds its latency and
+    # external-call timings to state["timings"]. The resolve_subject
+    # subgraph wraps its own inner nodes; the join barrier is not timed.
     # ------------------------------------------------------------------
-    graph.add_node("classify_intent",    classify_intent)
-    graph.add_node("resolve_ticker",     resolve_ticker)
-    graph.add_node("parse_dates",        parse_dates)
-    graph.add_node("fetch_price",        fetch_price_data)
-    graph.add_node("plan_retrieval",     plan_retrieval)
-    graph.add_node("retrieve_news",      retrieve_news)
-    graph.add_node("reddit_sentiment",   analyze_reddit_sentiment)
-    graph.add_node("analyze_options",    analyze_options)
-    graph.add_node("retrieve_rag",       retrieve_rag_context)
-    graph.add_node("synthesize",         synthesize_response)
-    graph.add_node("generate_chart",     generate_chart)
+    graph.add_node("classify_intent",    timed_node("classify_intent", classify_intent))
+    graph.add_node("resolve_subject",    _build_subject_stage())
+    graph.add_node("join_front_end",     _join_front_end)
+    graph.add_node("fetch_price",        timed_node("fetch_price", fetch_price_data))
+    graph.add_node("plan_retrieval",     timed_node("plan_retrieval", plan_retrieval))
+    graph.add_node("retrieve_news",      timed_node("retrieve_news", retrieve_news))
+    graph.add_node("reddit_sentiment",   timed_node("reddit_sentiment", analyze_reddit_sentiment))
+    graph.add_node("analyze_options",    timed_node("analyze_options", analyze_options))
+    graph.add_node("retrieve_rag",       timed_node("retrieve_rag", retrieve_rag_context))
+    graph.add_node("synthesize",         timed_node("synthesize", synthesize_response))
+    graph.add_node("generate_chart",     timed_node("generate_chart", generate_chart))
 
     # ------------------------------------------------------------------
-    # Entry point
+    # Entry: Node 1 and the ticker/date stage start in the same superstep
     # ------------------------------------------------------------------
-    graph.set_entry_point("classify_intent")
+    graph.add_edge(START, "classify_intent")
+    graph.add_edge(START, "resolve_subject")
 
-    # ------------------------------------------------------------------
-    # Unconditional edges (common prefix — always runs in sequence)
-    # ------------------------------------------------------------------
-    graph.add_edge("classify_intent", "resolve_ticker")
-    graph.add_edge("resolve_ticker",  "parse_dates")
+    # Both branches must finish before routing reads intent + date_missing.
+    graph.add_edge(["classify_intent", "resolve_subject"], "join_front_end")
 
     # ------------------------------------------------------------------
     # Conditional edges
     # ------------------------------------------------------------------
 
-    # After Node 3: branch on intent + date_missing
+    # After the front-end join: branch on intent + date_missing
     graph.add_conditional_edges(
-        "parse_dates",
+        "join_front_end",
         route_after_date_parser,
         {
+            "plan_retrieval":  "plan_retrieval",
             "fetch_price":     "fetch_price",
             "analyze_options": "analyze_options",
             "synthesize":      "synthesize",
@@ -253,26 +338,26 @@ def create_workflow():
     # Node 8: options_view path — analyze options then synthesize
     graph.add_edge("analyze_options", "synthesize")
 
-    # After Node 4: chart_request goes directly to chart; all other intents
-    # go to the Retrieval Planner before fan-out.
+    # After Retrieval Planner: Send() fan-out to Node 4 plus whichever of
+    # Nodes 5, 6, 7 the retrieval_plan enables — all in one superstep.
+    graph.add_conditional_edges(
+        "plan_retrieval",
+        route_after_plan_retrieval,
+        ["fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"],
+    )
+
+    # After Node 4: chart_request goes directly to chart; for all other
+    # intents Node 4 was a fan-out branch and converges at synthesize.
     graph.add_conditional_edges(
         "fetch_price",
         route_after_fetch_price,
         {
-            "plan_retrieval": "plan_retrieval",
+            "synthesize":     "synthesize",
             "generate_chart": "generate_chart",
         },
     )
 
-    # After Retrieval Planner: selective Send() fan-out to Nodes 5, 6, 7.
-    # Only the branches enabled by retrieval_plan are dispatched.
-    graph.add_conditional_edges(
-        "plan_retrieval",
-        route_after_plan_retrieval,
-        ["retrieve_news", "reddit_sentiment", "retrieve_rag"],
-    )
-
-    # Active retrieval branches converge at synthesize.
+    # Active branches converge at synthesize.
     # LangGraph waits for all dispatched Send() branches before advancing.
     graph.add_edge("retrieve_news",    "synthesize")
     graph.add_edge("reddit_sentiment", "synthesize")
@@ -295,7 +380,7 @@ def create_workflow():
     # Compile
     # ------------------------------------------------------------------
     compiled = graph.compile()
-    logger.info("Stock Insight Agent workflow compiled (Phase 5: Retrieval Planner + adaptive fan-out)")
+    logger.info("Stock Insight Agent workflow compiled (Phase 5: Retrieval Planner + price/retrieval fan-out)")
     return compiled
 
 
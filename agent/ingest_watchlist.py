@@ -0,0 +1,85 @@
+"""
+Pre-ingest SEC filings for a watchlist of tickers.
+
+Runs the same ingestion job Node 7 queues on a cache miss, ahead of time
+(e.g. from cron before market open), so the first question about a
+watchlist ticker is answered from the vector store instead of waiting on
+EDGAR downloads and embedding.
+
+Usage:
+    python -m agent.ingest_watchlist NVDA AAPL MSFT
+    python -m agent.ingest_watchlist --file watchlist.txt --lookback-days 400
+
+Watchlist files hold one ticker per line; blank lines and `#` comments are
+ignored. Jobs run on the RAG retriever's ingest worker pool
+(RAG_INGEST_WORKERS). Exit status is 1 if any ticker failed.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, timedelta
+
+from agent.graph.nodes.rag_retriever import submit_ingestion
+
+logger = logging.getLogger(__name__)
+
+# Default window: the latest 10-K plus the 10-Qs filed since.
+_DEFAULT_LOOKBACK_DAYS = 400
+
+
+def _read_watchlist(path: str) -> list[str]:
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            ticker = line.split("#", 1)[0].strip()
+            if ticker:
+                tickers.append(ticker)
+    return tickers
+
+
+def ingest_watchlist(tickers: list[str], lookback_days: int = _DEFAULT_LOOKBACK_DAYS) -> dict[str, int | None]:
+    """
+    Ingest filings from the last `lookback_days` for each ticker.
+    Returns {ticker: new_chunks}, with None for tickers whose job failed.
+    """
+    end = date.today()
+    start = end - timedelta(days=lookback_days)
+    jobs = {
+        ticker: submit_ingestion(ticker, start.isoformat(), end.isoformat())
+        for ticker in dict.fromkeys(t.upper() for t in tickers)
+    }
+
+    results: dict[str, int | None] = {}
+    for ticker, job in jobs.items():
+        try:
+            results[ticker] = job.result()
+        except Exception as e:
+            logger.error("ingest_watchlist: %s failed: %s", ticker, e)
+            results[ticker] = None
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-ingest SEC filings for a watchlist of tickers.")
+    parser.add_argument("tickers", nargs="*", help="ticker symbols, e.g. NVDA AAPL")
+    parser.add_argument("--file", help="watchlist file, one ticker per line")
+    parser.add_argument("--lookback-days", type=int, default=_DEFAULT_LOOKBACK_DAYS,
+                        help=f"filing window ending today (default {_DEFAULT_LOOKBACK_DAYS})")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.file:
+        tickers.extend(_read_watchlist(args.file))
+    if not tickers:
+        parser.error("no tickers given")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    results = ingest_watchlist(tickers, args.lookback_days)
+    for ticker, new_chunks in results.items():
+        print(f"{ticker:8s} {'FAILED' if new_chunks is None else f'{new_chunks} new chunks'}")
+    return 1 if any(n is None for n in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
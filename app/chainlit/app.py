@@ -10,19 +10,27 @@ Reads from AgentState fields written by the workflow nodes:
 
 Uses graph.astream_events to stream synthesizer tokens to the UI as they
 arrive.  All other state fields are collected from on_chain_end events.
+
+Latency: each request logs a per-node / per-call timing summary (the
+reduced `timings` field from the graph's final output), and the
+process-wide latency histograms are served as JSON at /metrics/latency.
 """
 
+import asyncio
 import logging
 from pathlib import Path
 
 import chainlit as cl
 import plotly.io as pio
+from chainlit.server import app as server_app
+from fastapi.responses import JSONResponse
 
 # Chainlit 2.10 requires this directory to exist before rendering any file-backed
 # elements (e.g. Plotly charts). Its session.py calls mkdir(exist_ok=True) on a
 # subdirectory without parents=True, so it silently fails if the parent is absent.
 Path(".files").mkdir(exist_ok=True)
 
+from agent.graph.nodes import http_client, rag_retriever, timing
 from agent.graph.workflow import app as graph
 
 logger = logging.getLogger(__name__)
@@ -30,6 +38,19 @@ logger = logging.getLogger(__name__)
 AUTHOR = "Stock Insight Agent"
 
 
+# ---------------------------------------------------------------------------
+# Latency metrics endpoint
+# ---------------------------------------------------------------------------
+
+async def latency_metrics():
+    return JSONResponse(timing.snapshot())
+
+
+server_app.add_api_route("/metrics/latency", latency_metrics, methods=["GET"])
+# Chainlit registers a catch-all UI route at import time; move ours ahead of it.
+server_app.router.routes.insert(0, server_app.router.routes.pop())
+
+
 # ---------------------------------------------------------------------------
 # Chat start
 # ---------------------------------------------------------------------------
@@ -50,6 +71,26 @@ async def start():
     ).send()
 
 
+# ---------------------------------------------------------------------------
+# App startup
+# ---------------------------------------------------------------------------
+
+@cl.on_app_startup
+async def startup():
+    # Open the vector store and load its HNSW index before the first query.
+    await asyncio.to_thread(rag_retriever.warm_up_vector_store)
+
+
+# ---------------------------------------------------------------------------
+# App shutdown
+# ---------------------------------------------------------------------------
+
+@cl.on_app_shutdown
+async def shutdown():
+    # Release the pooled keep-alive connections held by the retrieval nodes.
+    await http_client.aclose()
+
+
 # ---------------------------------------------------------------------------
 # Message handler
 # ---------------------------------------------------------------------------
@@ -99,6 +140,13 @@ async def main(message: cl.Message):
                 if isinstance(output, dict):
                     final_state.update(output)
 
+            # The root graph's end event carries the reduced state, so its
+            # `timings` covers every branch (per-node outputs only hold their own).
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                output = event["data"].get("output", {})
+                if isinstance(output, dict) and output.get("timings"):
+                    final_state["timings"] = output["timings"]
+
     except Exception as e:
         logger.error("Graph streaming failed: %s", e)
         await cl.Message(
@@ -110,6 +158,8 @@ async def main(message: cl.Message):
         ).send()
         return
 
+    logger.info("request timings: %s", timing.format_timings(final_state.get("timings")))
+
     # Finalise the streaming message.
     await streaming_msg.update()
 
@@ -3,12 +3,17 @@ from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from agent.graph.nodes.timing import LLMLatencyCallback
+
 load_dotenv()
 
 _groq_key = os.getenv("GROQ_API_KEY")
 _gcp_project = os.getenv("GOOGLE_CLOUD_PROJECT")
 _gcp_location = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
 
+# Every model carries an LLMLatencyCallback so each call shows up in
+# state["timings"] and the latency histograms as llm.<label>.
+
 # Used by classifier/extractor nodes (Intent, Ticker, Date).
 # temperature=0 → deterministic JSON output; no creativity needed here.
 # max_tokens=256 → these nodes return small JSON objects, 512 was wasteful.
@@ -18,6 +23,7 @@ llm_classifier = ChatGroq(
     temperature=0,
     max_tokens=256,
     groq_api_key=_groq_key,
+    callbacks=[LLMLatencyCallback("groq.classifier")],
 )
 
 # Used by the Response Synthesizer (Node 9).
@@ -37,6 +43,7 @@ llm_synthesizer = ChatGoogleGenerativeAI(
     project=_gcp_project,
     location=_gcp_location,
     streaming=True,
+    callbacks=[LLMLatencyCallback("gemini.synthesizer")],
 )
 
 # Used by the Retrieval Planner node (Phase 5).
@@ -48,4 +55,5 @@ llm_planner = ChatGroq(
     temperature=0,
     max_tokens=512,
     groq_api_key=_groq_key,
+    callbacks=[LLMLatencyCallback("groq.planner")],
 )
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark: vectorized _calculate_max_pain vs the original Python loop.
+
+Usage:
+    PYTHONPATH=. python tests/benchmarks/bench_max_pain.py [--strikes 1000] [--repeat 5]
+
+Builds synthetic option chains (calls and puts on the same strike grid,
+random integer open interest with some zero/NaN rows), checks that both
+implementations pick the same strike, and prints best-of-N timings.
+
+_max_pain_reference is the pre-vectorization implementation, kept here as
+the correctness oracle for tests/test_options_analyzer.py.
+"""
+
+import argparse
+import math
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from agent.graph.nodes.options_analyzer import _calculate_max_pain
+
+
+def _max_pain_reference(calls_df: pd.DataFrame, puts_df: pd.DataFrame) -> Optional[float]:
+    """Original O(strikes²) loop over every candidate strike."""
+    all_strikes = sorted(
+        set(list(calls_df["strike"].dropna())) |
+        set(list(puts_df["strike"].dropna()))
+    )
+    if not all_strikes:
+        return None
+
+    call_strikes = calls_df["strike"].tolist()
+    call_oi = calls_df["openInterest"].tolist()
+    put_strikes = puts_df["strike"].tolist()
+    put_oi = puts_df["openInterest"].tolist()
+
+    min_total = float("inf")
+    max_pain_strike = None
+
+    for P in all_strikes:
+        call_buyer_gain = sum(
+            max(0.0, P - K) * oi
+            for K, oi in zip(call_strikes, call_oi)
+            if oi and not math.isnan(oi)
+        )
+        put_buyer_gain = sum(
+            max(0.0, K - P) * oi
+            for K, oi in zip(put_strikes, put_oi)
+            if oi and not math.isnan(oi)
+        )
+        total = call_buyer_gain + put_buyer_gain
+        if total < min_total:
+            min_total = total
+            max_pain_strike = P
+
+    return float(max_pain_strike) if max_pain_strike is not None else None
+
+
+def synthetic_chain(n_strikes: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Calls and puts on a 0.5-spaced strike grid centred near 400."""
+    rng = np.random.default_rng(seed)
+    strikes = 400.0 + 0.5 * (np.arange(n_strikes) - n_strikes // 2)
+
+    def side():
+        oi = rng.integers(0, 20_000, size=n_strikes).astype(float)
+        oi[rng.random(n_strikes) < 0.05] = np.nan
+        return pd.DataFrame({"strike": strikes, "openInterest": oi})
+
+    return side(), side()
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strikes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    calls, puts = synthetic_chain(args.strikes)
+    expected = _max_pain_reference(calls, puts)
+    actual = _calculate_max_pain(calls, puts)
+    assert actual == expected, f"mismatch: vectorized={actual} reference={expected}"
+
+    loop_s = _best_of(lambda: _max_pain_reference(calls, puts), args.repeat)
+    vec_s = _best_of(lambda: _calculate_max_pain(calls, puts), args.repeat)
+
+    print(f"strikes per side : {args.strikes}")
+    print(f"max pain         : {actual}")
+    print(f"reference loop   : {loop_s * 1000:9.2f} ms")
+    print(f"vectorized       : {vec_s * 1000:9.2f} ms")
+    print(f"speed-up         : {loop_s / vec_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Load test: SEC filing ingestion and query throughput of the ChromaDB path.
+
+Usage:
+    PYTHONPATH=. python tests/benchmarks/bench_rag_ingestion.py [--filings 8] [--items-chars 60000] [--queries 200]
+
+Runs offline: embeddings come from the deterministic local hashing backend
+(RAG_EMBEDDING_BACKEND=hashing) and the vector store, BM25 index and
+embedding cache live in a temporary directory. Synthetic 10-K HTML
+(cover page, Item headings, narrative paragraphs, inline-XBRL tables) goes
+through the same extraction → section chunking → embedding → ChromaDB add
+path as a real filing, then queries run in each retrieval mode.
+
+Reports index build time per filing, chunks/s, and query p50/p95 and
+queries/s per mode. Absolute numbers exclude the Gemini round-trips, so
+they measure the local pipeline (parsing, chunking, HNSW insert/search,
+BM25) rather than end-to-end latency.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_WORDS = (
+    "revenue data center demand supply constraints gross margin guidance export controls china "
+    "inventory provisions customers hyperscale networking gaming automotive fiscal quarter growth "
+    "operating expenses research development competition risk regulation semiconductor capacity"
+).split()
+_ITEMS = ["1", "1A", "1B", "2", "3", "5", "7", "7A", "8", "9A"]
+_QUERIES = [
+    "gross margin guidance",
+    "export controls China data center",
+    "supply constraints inventory provisions",
+    "competition risk semiconductor capacity",
+    "operating expenses research development growth",
+]
+
+
+def synthetic_filing(seed: int, item_chars: int) -> str:
+    """10-K-like HTML: cover page, then each Item with prose and an XBRL table."""
+    rng = random.Random(seed)
+
+    def paragraph(n_chars: int) -> str:
+        words, size = [], 0
+        while size < n_chars:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return "<p>" + " ".join(words).capitalize() + ".</p>"
+
+    parts = ["<html><body><div>UNITED STATES SECURITIES AND EXCHANGE COMMISSION FORM 10-K</div>"]
+    for item in _ITEMS:
+        parts.append(f"<p>Item {item}. Heading</p>")
+        for _ in range(max(item_chars // 2000, 1)):
+            parts.append(paragraph(2000))
+        parts.append(
+            "<table><tr><td>Revenue</td>"
+            f"<td><ix:nonFraction name='us-gaap:Revenues'>{rng.randint(1000, 99999):,}</ix:nonFraction></td></tr></table>"
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filings", type=int, default=8)
+    parser.add_argument("--items-chars", type=int, default=60_000, help="narrative chars per Item")
+    parser.add_argument("--queries", type=int, default=200, help="queries per retrieval mode")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-rag-")
+    os.environ.update({
+        "RAG_EMBEDDING_BACKEND": "hashing",
+        "CHROMA_PERSIST_DIR": os.path.join(workdir, "vector_store"),
+        "BM25_INDEX_PATH": os.path.join(workdir, "bm25.sqlite3"),
+        "EMBEDDING_CACHE_PATH": ":memory:",
+    })
+    # Imported after the environment is set: the module reads it at import.
+    from agent.graph.nodes import rag_retriever
+
+    collection = rag_retriever._get_collection()
+    build_s, n_chunks, html_bytes = [], 0, 0
+    for i in range(args.filings):
+        html = synthetic_filing(i, args.items_chars)
+        html_bytes += len(html)
+        period = f"{2020 + i // 4}Q{i % 4 + 1}"
+        pieces = (html[j : j + 64 * 1024] for j in range(0, len(html), 64 * 1024))
+        started = time.perf_counter()
+        chunks = rag_retriever._iter_section_chunks(rag_retriever._iter_text(pieces), "BENCH", "10-K", period)
+        n_chunks += rag_retriever._ingest_chunks(collection, chunks, "BENCH", period)
+        build_s.append(time.perf_counter() - started)
+
+    print(f"filings ingested     : {args.filings} ({html_bytes / 1e6:.1f} MB HTML)")
+    print(f"chunks stored        : {n_chunks}")
+    print(f"build time / filing  : p50 {statistics.median(build_s):.3f}s  max {max(build_s):.3f}s")
+    print(f"ingest throughput    : {n_chunks / sum(build_s):,.0f} chunks/s")
+
+    for mode in ("vector", "bm25", "hybrid"):
+        rag_retriever.RETRIEVAL_MODE = mode
+        latencies = []
+        for q in range(args.queries):
+            # Distinct query text per call so the query-embedding cache doesn't flatter the numbers.
+            query = f"{_QUERIES[q % len(_QUERIES)]} {q}"
+            started = time.perf_counter()
+            rag_retriever._query_collection(collection, "BENCH", query, ["2020Q1", "2020Q2", "2020Q3", "2020Q4"])
+            latencies.append(time.perf_counter() - started)
+        print(
+            f"query {mode:7s}        : p50 {_pct(latencies, 0.5) * 1000:7.2f} ms  "
+            f"p95 {_pct(latencies, 0.95) * 1000:7.2f} ms  {len(latencies) / sum(latencies):,.0f} q/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,40 @@
 """
-Pytest configuration: disable LangSmith tracing during test runs.
+Pytest configuration: disable LangSmith tracing during test runs, and keep
+on-disk caches out of the working tree.
 
 Tests use mocked LLMs and fake price data. Tracing them to the production
 LangSmith project pollutes real-run visibility with zero-token mock traces.
+Caches are swapped for fresh in-memory instances per test so mocked data
+from one test is never served to another.
 """
 import os
 
+import pytest
+
 os.environ["LANGCHAIN_TRACING_V2"] = "false"
+os.environ.setdefault("PRICE_CACHE_PATH", ":memory:")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", ":memory:")
+os.environ.setdefault("EDGAR_CACHE_PATH", ":memory:")
+os.environ.setdefault("BM25_INDEX_PATH", ":memory:")
+os.environ.setdefault("NEWS_STORE_PATH", ":memory:")
+os.environ.setdefault("FIRECRAWL_CACHE_PATH", ":memory:")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(monkeypatch):
+    from agent.graph.nodes import data_fetcher, news_retriever, rag_retriever, timing
+
+    monkeypatch.setattr(data_fetcher, "_bar_cache", data_fetcher._DailyBarCache(":memory:"))
+    monkeypatch.setattr(data_fetcher, "_fundamentals_cache", {})
+    monkeypatch.setattr(data_fetcher, "_fundamentals_inflight", {})
+    timing.reset()
+    monkeypatch.setattr(rag_retriever, "_embedding_cache", rag_retriever._EmbeddingCache(":memory:"))
+    monkeypatch.setattr(rag_retriever, "_genai_client", None)
+    monkeypatch.setattr(rag_retriever, "_embedder", None)
+    monkeypatch.setattr(rag_retriever, "_chroma_client", None)
+    monkeypatch.setattr(rag_retriever, "_collection", None)
+    monkeypatch.setattr(rag_retriever, "_ingest_jobs", {})
+    monkeypatch.setattr(rag_retriever, "_edgar_cache", rag_retriever._EdgarCache(":memory:"))
+    monkeypatch.setattr(rag_retriever, "_bm25_index", rag_retriever.BM25Index(":memory:"))
+    monkeypatch.setattr(news_retriever, "_article_store", news_retriever._ArticleStore(":memory:"))
+    monkeypatch.setattr(news_retriever, "_scrape_cache", news_retriever._ScrapeCache(":memory:", 1 << 20))
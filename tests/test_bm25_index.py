@@ -0,0 +1,65 @@
+"""
+Tests for the BM25 keyword side index in agent/graph/nodes/bm25_index.py.
+"""
+
+from agent.graph.nodes.bm25_index import BM25Index, tokenize
+
+
+def _chunk(chunk_id, text, ticker="NVDA", period="2024Q4", **meta):
+    return {"id": chunk_id, "text": text,
+            "metadata": {"ticker": ticker, "filing_type": "10-K", "filing_period": period, **meta}}
+
+
+def _index(*chunks):
+    index = BM25Index(":memory:")
+    index.add(chunks)
+    return index
+
+
+def test_tokenize_casefolds_drops_stopwords_and_folds_plurals():
+    assert tokenize("What is the Gross Margins guidance for FY2025?") == ["gross", "margin", "guidance", "fy2025"]
+    assert tokenize("R&D and U.S. sales; business") == ["r&d", "u.s", "sale", "business"]
+
+
+def test_search_ranks_chunks_by_term_matches():
+    index = _index(
+        _chunk("a", "Gross margin guidance for the next quarter is 75 percent."),
+        _chunk("b", "Data center revenue grew on strong demand."),
+        _chunk("c", "Gross margin declined on inventory provisions; guidance unchanged. Gross margin"),
+    )
+    hits = index.search("NVDA", "gross margin guidance")
+
+    assert [h["id"] for h in hits] == ["c", "a"]
+    assert hits[0]["score"] > hits[1]["score"] > 0
+    assert hits[0]["metadata"]["filing_period"] == "2024Q4"
+
+
+def test_search_is_scoped_to_ticker_and_periods():
+    index = _index(
+        _chunk("nvda-old", "export controls on China", period="2022Q1"),
+        _chunk("nvda-new", "export controls on China", period="2024Q4"),
+        _chunk("amd", "export controls on China", ticker="AMD"),
+    )
+
+    assert {h["id"] for h in index.search("NVDA", "export controls")} == {"nvda-old", "nvda-new"}
+    assert [h["id"] for h in index.search("NVDA", "export controls", ["2024Q4"])] == ["nvda-new"]
+    assert index.search("MSFT", "export controls") == []
+
+
+def test_add_skips_chunks_already_indexed():
+    index = _index(_chunk("a", "supply constraints"))
+
+    assert index.add([_chunk("a", "supply constraints"), _chunk("b", "supply chain")]) == 1
+    assert {h["id"] for h in index.search("NVDA", "supply")} == {"a", "b"}
+
+
+def test_search_without_query_terms_returns_nothing():
+    index = _index(_chunk("a", "revenue"))
+    assert index.search("NVDA", "what is the") == []
+
+
+def test_index_persists_across_instances(tmp_path):
+    path = str(tmp_path / "bm25" / "index.sqlite3")
+    BM25Index(path).add([_chunk("a", "Blackwell ramp")])
+
+    assert [h["id"] for h in BM25Index(path).search("NVDA", "blackwell")] == ["a"]
@@ -6,20 +6,28 @@ We build realistic mock DataFrames that mirror the structure yfinance
 actually returns, so our assertions catch real structural bugs.
 
 Key mocking note:
-  _fetch_yfinance calls yf.Ticker().history() TWICE:
-    call 1 — the query period (returns the main data)
-    call 2 — the 90-day baseline for volume anomaly
-  We use side_effect lists to return different DataFrames per call.
+  _fetch_yfinance calls yf.Ticker().history() ONCE, for a single span
+  covering the 90-day baseline plus the query period, through the daily-bar
+  cache. Mocks therefore return one merged DataFrame (baseline bars dated
+  before start_date, query bars from start_date on) and the node slices it.
+  conftest.py gives every test a fresh in-memory cache.
 """
 
+import time
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
+from agent.graph.nodes import data_fetcher
+
 from agent.graph.nodes.data_fetcher import (
     fetch_price_data,
     _build_daily_prices,
     _compute_volume_anomaly,
+    _DailyBarCache,
+    _get_daily_bars,
+    _get_fundamentals,
     VOLUME_ANOMALY_THRESHOLD,
 )
 
@@ -35,9 +43,10 @@ def _make_hist_df(
     high: float = 115.0,
     low: float = 95.0,
     volume: int = 1_000_000,
+    start: str = "2024-05-01",
 ) -> pd.DataFrame:
     """Build a minimal yfinance-style history DataFrame."""
-    dates = pd.date_range(start="2024-05-01", periods=n_days, freq="B")
+    dates = pd.date_range(start=start, periods=n_days, freq="B")
     opens = [open_] + [105.0] * (n_days - 1)
     closes = [105.0] * (n_days - 1) + [close]
     return pd.DataFrame(
@@ -69,6 +78,16 @@ def _make_state(
     return state
 
 
+def _make_baseline_df(n_days: int = 60, volume: int = 1_000_000) -> pd.DataFrame:
+    """Baseline bars dated inside the 90 days before the default start_date."""
+    return _make_hist_df(n_days=n_days, volume=volume, start="2024-02-05")
+
+
+def _merged(query_df: pd.DataFrame, baseline_df: pd.DataFrame) -> pd.DataFrame:
+    """What yfinance returns for the combined baseline + query span."""
+    return pd.concat([baseline_df, query_df])
+
+
 # ---------------------------------------------------------------------------
 # Unit tests — helpers
 # ---------------------------------------------------------------------------
@@ -104,7 +123,7 @@ def test_volume_anomaly_detected_when_ratio_exceeds_threshold(mock_ticker_class)
     Period volume 3x the baseline should set is_anomalous=True.
     anomaly_ratio > VOLUME_ANOMALY_THRESHOLD (1.5) triggers the flag.
     """
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
     mock_instance = MagicMock()
     mock_instance.history.return_value = baseline_df
     mock_ticker_class.return_value = mock_instance
@@ -119,7 +138,7 @@ def test_volume_anomaly_detected_when_ratio_exceeds_threshold(mock_ticker_class)
 @patch("agent.graph.nodes.data_fetcher.yf.Ticker")
 def test_volume_anomaly_not_detected_for_normal_volume(mock_ticker_class):
     """Period volume equal to baseline → is_anomalous=False."""
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
     mock_instance = MagicMock()
     mock_instance.history.return_value = baseline_df
     mock_ticker_class.return_value = mock_instance
@@ -156,7 +175,7 @@ def test_volume_anomaly_exactly_at_threshold_is_not_anomalous(mock_ticker_class)
     The comparison is strictly greater-than, so the boundary itself is safe.
     This guards against a regression to >= that would produce false positives.
     """
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
     mock_instance = MagicMock()
     mock_instance.history.return_value = baseline_df
     mock_ticker_class.return_value = mock_instance
@@ -175,7 +194,7 @@ def test_volume_anomaly_just_above_threshold_is_anomalous(mock_ticker_class):
     Ratio just above VOLUME_ANOMALY_THRESHOLD (1.5) must set is_anomalous=True.
     Confirms the strict-greater-than boundary fires at the first value above 1.5.
     """
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
     mock_instance = MagicMock()
     mock_instance.history.return_value = baseline_df
     mock_ticker_class.return_value = mock_instance
@@ -188,6 +207,108 @@ def test_volume_anomaly_just_above_threshold_is_anomalous(mock_ticker_class):
     assert result["anomaly_ratio"] == pytest.approx(1.51, rel=0.01)
 
 
+# ---------------------------------------------------------------------------
+# Daily-bar cache
+# ---------------------------------------------------------------------------
+
+def test_bar_cache_missing_ranges_reports_only_uncovered_gaps():
+    """Coverage [Feb, Mar) + [Apr, May) leaves two gaps inside [Jan, Jun)."""
+    cache = _DailyBarCache(":memory:")
+    cache.store("NVDA", _make_hist_df(n_days=2, start="2024-02-01"), "2024-02-01", "2024-03-01")
+    cache.store("NVDA", _make_hist_df(n_days=2, start="2024-04-01"), "2024-04-01", "2024-05-01")
+
+    gaps = cache.missing_ranges("NVDA", "2024-01-01", "2024-06-01")
+
+    assert gaps == [
+        ("2024-01-01", "2024-02-01"),
+        ("2024-03-01", "2024-04-01"),
+        ("2024-05-01", "2024-06-01"),
+    ]
+
+
+def test_bar_cache_merges_touching_intervals():
+    cache = _DailyBarCache(":memory:")
+    cache.store("NVDA", _make_hist_df(n_days=2, start="2024-02-01"), "2024-02-01", "2024-03-01")
+    cache.store("NVDA", _make_hist_df(n_days=2, start="2024-03-01"), "2024-03-01", "2024-04-01")
+
+    assert cache.missing_ranges("NVDA", "2024-02-01", "2024-04-01") == []
+    assert cache.missing_ranges("AAPL", "2024-02-01", "2024-04-01") == [("2024-02-01", "2024-04-01")]
+
+
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+def test_get_daily_bars_second_call_is_served_from_cache(mock_ticker_class):
+    mock_instance = MagicMock()
+    mock_instance.history.return_value = _make_hist_df(n_days=5)
+    mock_ticker_class.return_value = mock_instance
+
+    first = _get_daily_bars("NVDA", "2024-05-01", "2024-05-10")
+    second = _get_daily_bars("NVDA", "2024-05-01", "2024-05-10")
+
+    assert mock_instance.history.call_count == 1
+    assert len(first) == len(second) == 5
+
+
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+def test_get_daily_bars_caches_a_span_with_no_trading_days(mock_ticker_class):
+    """A weekend-only span returns no bars; it is still covered, not refetched."""
+    mock_instance = MagicMock()
+    mock_instance.history.return_value = _make_hist_df(n_days=0)
+    mock_ticker_class.return_value = mock_instance
+
+    _get_daily_bars("NVDA", "2024-05-04", "2024-05-06")
+    result = _get_daily_bars("NVDA", "2024-05-04", "2024-05-06")
+
+    assert mock_instance.history.call_count == 1
+    assert result.empty
+
+
+def test_bar_cache_stores_missing_volume_as_zero():
+    hist = _make_hist_df(n_days=2, start="2024-05-01")
+    hist.loc[hist.index[0], "Volume"] = float("nan")
+    cache = _DailyBarCache(":memory:")
+    cache.store("NVDA", hist, "2024-05-01", "2024-05-03")
+
+    assert list(cache.load("NVDA", "2024-05-01", "2024-05-03")["Volume"]) == [0, hist["Volume"].iloc[1]]
+
+
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+def test_get_daily_bars_fetches_only_the_gap(mock_ticker_class):
+    """Extending a cached window forward fetches just the new span."""
+    mock_instance = MagicMock()
+    mock_instance.history.side_effect = [
+        _make_hist_df(n_days=5, start="2024-05-01"),
+        _make_hist_df(n_days=5, start="2024-05-10"),
+    ]
+    mock_ticker_class.return_value = mock_instance
+
+    _get_daily_bars("NVDA", "2024-05-01", "2024-05-10")
+    result = _get_daily_bars("NVDA", "2024-05-01", "2024-05-17")
+
+    second_call = mock_instance.history.call_args_list[1]
+    assert second_call.kwargs == {"start": "2024-05-10", "end": "2024-05-17"}
+    assert len(result) == 10
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+async def test_node_makes_one_history_call_then_none_on_repeat(mock_ticker_class):
+    """Query window + baseline cost one round-trip; a repeat query costs zero."""
+    mock_instance = MagicMock()
+    mock_instance.history.return_value = _merged(
+        _make_hist_df(n_days=5, volume=3_000_000), _make_baseline_df()
+    )
+    mock_instance.info = {}
+    mock_instance.calendar = {}
+    mock_ticker_class.return_value = mock_instance
+
+    first = await fetch_price_data(_make_state())
+    second = await fetch_price_data(_make_state())
+
+    assert mock_instance.history.call_count == 1
+    assert first["volume_anomaly"]["is_anomalous"] is True
+    assert second["price_data"] == first["price_data"]
+
+
 # ---------------------------------------------------------------------------
 # Full node tests
 # ---------------------------------------------------------------------------
@@ -197,11 +318,11 @@ def test_volume_anomaly_just_above_threshold_is_anomalous(mock_ticker_class):
 async def test_node_yfinance_success_populates_price_data(mock_ticker_class):
     """Happy path: yfinance returns data, all price_data fields are present."""
     query_df = _make_hist_df(n_days=5, open_=100.0, close=110.0)
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
 
     mock_instance = MagicMock()
-    # First call → query period; second call → baseline
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    # One call covers baseline + query period
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_ticker_class.return_value = mock_instance
 
     result = await fetch_price_data(_make_state())
@@ -226,10 +347,10 @@ async def test_node_yfinance_success_populates_price_data(mock_ticker_class):
 async def test_node_daily_prices_list_populated(mock_ticker_class):
     """daily_prices must contain one entry per trading day."""
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_ticker_class.return_value = mock_instance
 
     result = await fetch_price_data(_make_state())
@@ -247,10 +368,10 @@ async def test_node_percent_change_calculated_correctly(mock_ticker_class):
     Tests the arithmetic in _fetch_yfinance.
     """
     query_df = _make_hist_df(n_days=3, open_=100.0, close=110.0)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_ticker_class.return_value = mock_instance
 
     result = await fetch_price_data(_make_state())
@@ -264,10 +385,10 @@ async def test_node_percent_change_calculated_correctly(mock_ticker_class):
 async def test_node_volume_anomaly_present_on_yfinance_success(mock_ticker_class):
     """volume_anomaly must be populated alongside price_data on success."""
     query_df = _make_hist_df(n_days=5, volume=3_000_000)
-    baseline_df = _make_hist_df(n_days=60, volume=1_000_000)
+    baseline_df = _make_baseline_df(volume=1_000_000)
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_ticker_class.return_value = mock_instance
 
     result = await fetch_price_data(_make_state())
@@ -370,10 +491,10 @@ async def test_node_missing_ticker_writes_price_error():
 async def test_node_preserves_existing_state_fields(mock_ticker_class):
     """Fields written by earlier nodes must survive through data_fetcher."""
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_ticker_class.return_value = mock_instance
 
     state = _make_state(
@@ -403,10 +524,10 @@ async def test_analyst_data_populated_when_info_available(mock_ticker_class):
     analyst_data must be populated in the returned state.
     """
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_instance.info = {
         "targetMeanPrice": 150.0,
         "targetHighPrice": 200.0,
@@ -437,10 +558,10 @@ async def test_short_interest_populated_when_info_available(mock_ticker_class):
     short_interest must be populated in the returned state.
     """
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_instance.info = {
         "shortPercentOfFloat": 0.03,
         "shortRatio": 1.5,
@@ -469,12 +590,12 @@ async def test_earnings_date_populated_when_calendar_available(mock_ticker_class
     from datetime import datetime, timedelta
 
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     future_date = datetime.now() + timedelta(days=30)
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_instance.info = {}
     mock_instance.recommendations_summary = pd.DataFrame()
     mock_instance.calendar = {"Earnings Date": [future_date]}
@@ -495,10 +616,10 @@ async def test_enrichments_none_when_info_empty(mock_ticker_class):
     must be None. price_data must still be populated (enrichments are non-fatal).
     """
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     mock_instance.info = {}
     mock_instance.recommendations_summary = pd.DataFrame()
     mock_instance.calendar = {}
@@ -521,10 +642,10 @@ async def test_enrichment_exception_does_not_block_price_data(mock_ticker_class)
     be returned. Enrichment failures are non-fatal.
     """
     query_df = _make_hist_df(n_days=5)
-    baseline_df = _make_hist_df(n_days=60)
+    baseline_df = _make_baseline_df()
 
     mock_instance = MagicMock()
-    mock_instance.history.side_effect = [query_df, baseline_df]
+    mock_instance.history.return_value = _merged(query_df, baseline_df)
     # Accessing .info raises to simulate a broken yfinance response
     type(mock_instance).info = property(lambda self: (_ for _ in ()).throw(Exception("info unavailable")))
     mock_ticker_class.return_value = mock_instance
@@ -535,6 +656,123 @@ async def test_enrichment_exception_does_not_block_price_data(mock_ticker_class)
     assert result["price_error"] is None
 
 
+# ---------------------------------------------------------------------------
+# Fundamentals snapshot
+# ---------------------------------------------------------------------------
+
+class _CountingTicker:
+    """yf.Ticker stand-in that counts attribute reads per field."""
+
+    def __init__(self, *args, **kwargs):
+        self.reads: dict[str, int] = {}
+
+    def _read(self, name, value):
+        self.reads[name] = self.reads.get(name, 0) + 1
+        return value
+
+    @property
+    def info(self):
+        return self._read("info", {"targetMeanPrice": 150.0, "shortRatio": 1.5})
+
+    @property
+    def recommendations_summary(self):
+        return self._read("recommendations_summary", pd.DataFrame())
+
+    @property
+    def calendar(self):
+        return self._read("calendar", {})
+
+
+def test_fundamentals_snapshot_fetches_each_field_once():
+    stocks = []
+
+    def new_ticker(*args):
+        stocks.append(_CountingTicker())
+        return stocks[-1]
+
+    with patch("agent.graph.nodes.data_fetcher.yf.Ticker", side_effect=new_ticker):
+        first = _get_fundamentals("NVDA")
+        second = _get_fundamentals("nvda")
+
+    # Each field is read once, on a Ticker no other worker thread touches.
+    assert sorted((stock.reads for stock in stocks), key=str) == sorted(
+        [{"info": 1}, {"recommendations_summary": 1}, {"calendar": 1}], key=str,
+    )
+    assert first is second
+
+
+def test_fundamentals_snapshot_expires_after_ttl():
+    with patch("agent.graph.nodes.data_fetcher.yf.Ticker", side_effect=_CountingTicker) as mock_cls, \
+         patch("agent.graph.nodes.data_fetcher.FUNDAMENTALS_TTL_SECONDS", 0):
+        _get_fundamentals("NVDA")
+        _get_fundamentals("NVDA")
+
+    assert mock_cls.call_count == 2 * 3    # one Ticker per field per fetch
+
+
+def test_fundamentals_partial_failure_is_not_cached():
+    mock_instance = MagicMock()
+    type(mock_instance).info = property(lambda self: (_ for _ in ()).throw(Exception("timeout")))
+    mock_instance.calendar = {}
+    with patch("agent.graph.nodes.data_fetcher.yf.Ticker", return_value=mock_instance) as mock_cls:
+        snapshot = _get_fundamentals("NVDA")
+        _get_fundamentals("NVDA")
+
+    assert snapshot["info"] is None
+    assert snapshot["calendar"] == {}
+    assert mock_cls.call_count == 2 * 3
+
+
+def test_stale_inflight_fundamentals_are_not_joined():
+    old = Future()
+    old.set_result({"targetMeanPrice": 1.0})
+    data_fetcher._fundamentals_inflight["NVDA"] = (
+        time.monotonic() - data_fetcher.FUNDAMENTALS_TTL_SECONDS - 1,
+        {field: old for field in ("info", "recommendations_summary", "calendar")},
+    )
+    stock = _CountingTicker()
+    with patch("agent.graph.nodes.data_fetcher.yf.Ticker", return_value=stock):
+        snapshot = _get_fundamentals("NVDA")
+
+    assert snapshot["info"] == {"targetMeanPrice": 150.0, "shortRatio": 1.5}
+    assert "NVDA" not in data_fetcher._fundamentals_inflight
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+async def test_failed_price_fetch_discards_fundamentals_prefetch(mock_ticker_class, monkeypatch):
+    """The no-fallback and all-sources-failed paths never read the prefetch."""
+    monkeypatch.delenv("ALPHA_VANTAGE_API_KEY", raising=False)
+    mock_instance = MagicMock()
+    mock_instance.history.return_value = pd.DataFrame()
+    mock_ticker_class.return_value = mock_instance
+
+    result = await fetch_price_data(_make_state())
+
+    assert result["price_error"] is not None
+    assert data_fetcher._fundamentals_inflight == {}
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.data_fetcher.yf.Ticker")
+async def test_repeat_query_does_not_refetch_fundamentals(mock_ticker_class):
+    """All three enrichment helpers share one snapshot across queries."""
+    mock_instance = MagicMock()
+    mock_instance.history.return_value = _merged(_make_hist_df(n_days=5), _make_baseline_df())
+    mock_instance.info = {"targetMeanPrice": 150.0, "shortRatio": 1.5}
+    mock_instance.recommendations_summary = pd.DataFrame()
+    mock_instance.calendar = {}
+    mock_ticker_class.return_value = mock_instance
+
+    first = await fetch_price_data(_make_state())
+    second = await fetch_price_data(_make_state())
+
+    # One Ticker for the price history, one per fundamentals field.
+    assert mock_ticker_class.call_count == 1 + 3
+    assert second["analyst_data"] == first["analyst_data"]
+    assert second["short_interest"]["short_ratio"] == 1.5
+
+
 # ---------------------------------------------------------------------------
 # Async interface test
 # ---------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+"""
+Tests for the shared HTTP clients used by the retrieval nodes.
+
+Requests are served by httpx.MockTransport — no network access.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from agent.graph.nodes import http_client
+
+
+@pytest.mark.asyncio
+async def test_async_client_reused_within_one_loop():
+    first = http_client.get_async_client()
+    second = http_client.get_async_client()
+    assert first is second
+    await http_client.aclose()
+    assert first.is_closed
+
+
+def test_async_client_rebuilt_for_a_new_loop():
+    async def grab():
+        return http_client.get_async_client()
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_caps_concurrent_requests(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setitem(http_client._HOST_LIMITS, "api.example.com", 2)
+    monkeypatch.setattr(http_client, "_async_host_sems", {})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("agent.graph.nodes.http_client.get_async_client", return_value=client):
+        responses = await asyncio.gather(*(
+            http_client.async_get("https://api.example.com/items") for _ in range(6)
+        ))
+    await client.aclose()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == 2
+
+
+def test_sync_get_uses_shared_client():
+    client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200, text="ok")))
+    with patch("agent.graph.nodes.http_client.get_sync_client", return_value=client):
+        resp = http_client.sync_get("https://www.sec.gov/files/company_tickers.json")
+    assert resp.text == "ok"
+
+
+def test_token_bucket_allows_burst_then_paces_at_rate():
+    bucket = http_client.TokenBucket(rate=50.0, capacity=2)
+    delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2:] == pytest.approx([0.02, 0.04, 0.06], abs=0.005)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = http_client.TokenBucket(rate=100.0, capacity=1)
+    assert bucket.reserve() == 0.0
+    bucket.acquire()                 # waits ~10 ms for the next token
+    time.sleep(0.02)
+    assert bucket.reserve() == 0.0
+
+
+def test_sec_hosts_share_one_rate_bucket(monkeypatch):
+    bucket = http_client.TokenBucket(rate=1000.0, capacity=1000)
+    monkeypatch.setitem(http_client._rate_buckets, "sec.gov", bucket)
+    client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+
+    with patch("agent.graph.nodes.http_client.get_sync_client", return_value=client):
+        http_client.sync_get("https://www.sec.gov/files/company_tickers.json")
+        http_client.sync_get("https://data.sec.gov/submissions/CIK0001045810.json")
+        http_client.sync_get("https://finnhub.io/api/v1/company-news")
+
+    # Two SEC requests drew from the shared bucket; Finnhub is not rate-bucketed.
+    assert bucket._tokens == pytest.approx(998, abs=1)
@@ -0,0 +1,43 @@
+"""
+Tests for the watchlist pre-ingestion CLI (agent/ingest_watchlist.py).
+
+ingest_ticker is mocked — no EDGAR, Gemini or ChromaDB access.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from agent.ingest_watchlist import ingest_watchlist, main
+
+
+@patch("agent.graph.nodes.rag_retriever.ingest_ticker")
+def test_ingest_watchlist_runs_each_ticker_once(mock_ingest):
+    mock_ingest.side_effect = lambda ticker, start, end: {"NVDA": 12, "AAPL": 0}[ticker]
+
+    results = ingest_watchlist(["nvda", "AAPL", "NVDA", "nvda"], lookback_days=30)
+
+    assert results == {"NVDA": 12, "AAPL": 0}
+    assert mock_ingest.call_count == 2
+    _, start, end = mock_ingest.call_args.args
+    assert end == date.today().isoformat()
+    assert start == (date.today() - timedelta(days=30)).isoformat()
+
+
+@patch("agent.graph.nodes.rag_retriever.ingest_ticker")
+def test_main_reads_file_and_reports_failures(mock_ingest, tmp_path, capsys):
+    def ingest(ticker, start, end):
+        if ticker == "TSLA":
+            raise RuntimeError("EDGAR 503")
+        return 5
+
+    mock_ingest.side_effect = ingest
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# megacaps\nMSFT\n\nTSLA  # volatile\n")
+
+    status = main(["NVDA", "--file", str(watchlist)])
+
+    out = capsys.readouterr().out
+    assert status == 1
+    assert "NVDA     5 new chunks" in out
+    assert "TSLA     FAILED" in out
+    assert {c.args[0] for c in mock_ingest.call_args_list} == {"NVDA", "MSFT", "TSLA"}
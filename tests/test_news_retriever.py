@@ -5,22 +5,30 @@ All external calls (Finnhub, You.com, Google RSS, Firecrawl) are mocked.
 No network access or API keys required.
 """
 
+import asyncio
 import re as _re
-from unittest.mock import MagicMock, call, patch
+import sqlite3
+import time
+import zlib
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
-import responses as responses_lib
+import httpx
 
 from agent.graph.nodes.news_retriever import (
+    _ArticleStore,
+    _ScrapeCache,
     _build_query,
+    _collapse_near_duplicates,
     _enrich_articles,
     _enrich_with_firecrawl,
     _fetch_articles,
     _fetch_finnhub,
     _fetch_google_rss,
     _fetch_youcom,
-    _filter_relevant_articles,
     _is_free_domain,
+    _rank_articles,
     retrieve_news,
 )
 
@@ -111,10 +119,11 @@ def test_build_query_ticker_only():
 # _fetch_finnhub
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_finnhub_success(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_finnhub_success(mock_get):
     mock_get.return_value = _make_response(_FAKE_FINNHUB_RESPONSE)
-    result = _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "fake-key")
+    result = await _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "fake-key")
 
     assert result is not None
     assert len(result) == 2
@@ -124,32 +133,36 @@ def test_fetch_finnhub_success(mock_get):
     assert "NVIDIA stock" in result[0]["snippet"]
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_finnhub_empty_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_finnhub_empty_returns_none(mock_get):
     mock_get.return_value = _make_response([])
-    assert _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_finnhub_non_200_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_finnhub_non_200_returns_none(mock_get):
     mock_get.return_value = _make_response({}, status_code=403)
-    assert _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_finnhub_exception_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_finnhub_exception_returns_none(mock_get):
     mock_get.side_effect = Exception("connection refused")
-    assert _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", "key") is None
 
 
 # ---------------------------------------------------------------------------
 # _fetch_youcom
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_youcom_success(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_youcom_success(mock_get):
     mock_get.return_value = _make_response(_FAKE_YOUCOM_RESPONSE)
-    result = _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fake-key")
+    result = await _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fake-key")
 
     assert result is not None
     assert len(result) == 1
@@ -158,30 +171,38 @@ def test_fetch_youcom_success(mock_get):
     assert result[0]["url"] == "https://cnbc.com/nvda-earnings"
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_youcom_empty_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_youcom_empty_returns_none(mock_get):
     mock_get.return_value = _make_response({"results": {"news": []}})
-    assert _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_youcom_non_200_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_youcom_non_200_returns_none(mock_get):
     mock_get.return_value = _make_response({}, status_code=401)
-    assert _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
 
 
-@patch("agent.graph.nodes.news_retriever.requests.get")
-def test_fetch_youcom_exception_returns_none(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+async def test_fetch_youcom_exception_returns_none(mock_get):
     mock_get.side_effect = Exception("timeout")
-    assert _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
+    assert await _fetch_youcom("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "key") is None
 
 
 # ---------------------------------------------------------------------------
 # _fetch_google_rss
 # ---------------------------------------------------------------------------
 
+_RSS_RESPONSE = MagicMock(status_code=200, content=b"<rss></rss>")
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get", new=AsyncMock(return_value=_RSS_RESPONSE))
 @patch("agent.graph.nodes.news_retriever.feedparser.parse")
-def test_fetch_google_rss_success(mock_parse):
+async def test_fetch_google_rss_success(mock_parse):
     entry = MagicMock()
     entry.published_parsed = (2024, 6, 18, 10, 0, 0, 0, 0, 0)
     entry.get = lambda key, default=None: {
@@ -193,15 +214,17 @@ def test_fetch_google_rss_success(mock_parse):
     }.get(key, default)
 
     mock_parse.return_value = MagicMock(bozo=False, entries=[entry])
-    result = _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
+    result = await _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
 
     assert result is not None
     assert result[0]["title"] == "NVIDIA earnings beat expectations"
     assert result[0]["published_date"] == "2024-06-18"
 
 
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get", new=AsyncMock(return_value=_RSS_RESPONSE))
 @patch("agent.graph.nodes.news_retriever.feedparser.parse")
-def test_fetch_google_rss_filters_out_of_range(mock_parse):
+async def test_fetch_google_rss_filters_out_of_range(mock_parse):
     entry = MagicMock()
     entry.published_parsed = (2024, 1, 1, 0, 0, 0, 0, 0, 0)
     entry.get = lambda key, default=None: {
@@ -211,24 +234,36 @@ def test_fetch_google_rss_filters_out_of_range(mock_parse):
     }.get(key, default)
 
     mock_parse.return_value = MagicMock(bozo=False, entries=[entry])
-    assert _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30") is None
+    assert await _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30") is None
 
 
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get", new=AsyncMock(return_value=_RSS_RESPONSE))
 @patch("agent.graph.nodes.news_retriever.feedparser.parse")
-def test_fetch_google_rss_exception_returns_none(mock_parse):
+async def test_fetch_google_rss_exception_returns_none(mock_parse):
     mock_parse.side_effect = Exception("network error")
-    assert _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30") is None
+    assert await _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30") is None
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_get")
+@patch("agent.graph.nodes.news_retriever.feedparser.parse")
+async def test_fetch_google_rss_non_200_skips_parse(mock_parse, mock_get):
+    mock_get.return_value = _make_response(None, status_code=503)
+    assert await _fetch_google_rss("NVDA", "NVIDIA", "2024-06-01", "2024-06-30") is None
+    mock_parse.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
 # _fetch_articles — parallel behavior
 # ---------------------------------------------------------------------------
 
-def test_fetch_articles_uses_only_finnhub_when_youcom_key_absent():
+@pytest.mark.asyncio
+async def test_fetch_articles_uses_only_finnhub_when_youcom_key_absent():
     articles = [_article(url="https://reuters.com/a")]
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=articles) as mock_fh, \
          patch("agent.graph.nodes.news_retriever._fetch_youcom") as mock_ydc:
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
 
     mock_fh.assert_called_once()
     mock_ydc.assert_not_called()
@@ -236,23 +271,25 @@ def test_fetch_articles_uses_only_finnhub_when_youcom_key_absent():
     assert result == articles
 
 
-def test_fetch_articles_uses_only_youcom_when_finnhub_key_absent():
+@pytest.mark.asyncio
+async def test_fetch_articles_uses_only_youcom_when_finnhub_key_absent():
     articles = [_article(url="https://cnbc.com/a")]
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub") as mock_fh, \
          patch("agent.graph.nodes.news_retriever._fetch_youcom", return_value=articles):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", None, "ydc-key")
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", None, "ydc-key")
 
     mock_fh.assert_not_called()
     assert source == "youcom"
 
 
-def test_fetch_articles_merges_both_sources():
+@pytest.mark.asyncio
+async def test_fetch_articles_merges_both_sources():
     fh_articles = [_article(title="Finnhub A", url="https://reuters.com/a")]
     ydc_articles = [_article(title="YouCom B", url="https://cnbc.com/b")]
 
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=fh_articles), \
          patch("agent.graph.nodes.news_retriever._fetch_youcom", return_value=ydc_articles):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
 
     assert source == "finnhub+youcom"
     assert len(result) == 2
@@ -261,44 +298,511 @@ def test_fetch_articles_merges_both_sources():
     assert "YouCom B" in titles
 
 
-def test_fetch_articles_deduplicates_same_url():
+@pytest.mark.asyncio
+async def test_fetch_articles_deduplicates_same_url():
     shared = _article(url="https://reuters.com/same")
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=[shared]), \
          patch("agent.graph.nodes.news_retriever._fetch_youcom", return_value=[shared]):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
 
     assert len(result) == 1
 
 
-def test_fetch_articles_falls_back_to_rss_when_both_empty():
+@pytest.mark.asyncio
+async def test_fetch_articles_falls_back_to_rss_when_both_empty():
     rss_articles = [_article(url="https://example.com/rss")]
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=None), \
          patch("agent.graph.nodes.news_retriever._fetch_youcom", return_value=None), \
          patch("agent.graph.nodes.news_retriever._fetch_google_rss", return_value=rss_articles):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
 
     assert source == "google_rss"
     assert result == rss_articles
 
 
-def test_fetch_articles_falls_back_to_rss_when_no_keys():
+@pytest.mark.asyncio
+async def test_fetch_articles_falls_back_to_rss_when_no_keys():
     rss_articles = [_article(url="https://example.com/rss")]
     with patch("agent.graph.nodes.news_retriever._fetch_google_rss", return_value=rss_articles):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", None, None)
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", None, None)
 
     assert source == "google_rss"
 
 
-def test_fetch_articles_returns_none_when_all_fail():
+@pytest.mark.asyncio
+async def test_fetch_articles_returns_none_when_all_fail():
     with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=None), \
          patch("agent.graph.nodes.news_retriever._fetch_youcom", return_value=None), \
          patch("agent.graph.nodes.news_retriever._fetch_google_rss", return_value=None):
-        result, source = _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
 
     assert result is None
     assert source == "none"
 
 
+@pytest.mark.asyncio
+async def test_fetch_articles_awaits_both_sources_concurrently():
+    fh = [_article(url="https://reuters.com/a")]
+    ydc = [_article(url="https://cnbc.com/b")]
+
+    async def slow_finnhub(*_):
+        await asyncio.sleep(0.2)
+        return fh
+
+    async def slow_youcom(*_):
+        await asyncio.sleep(0.2)
+        return ydc
+
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=slow_finnhub), \
+         patch("agent.graph.nodes.news_retriever._fetch_youcom", side_effect=slow_youcom):
+        started = time.perf_counter()
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        elapsed = time.perf_counter() - started
+
+    assert source == "finnhub+youcom"
+    assert len(result) == 2
+    assert elapsed < 0.35
+
+
+# ---------------------------------------------------------------------------
+# _fetch_articles — hedged, deadline-bounded fan-out
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_fetch_articles_hedges_with_rss_and_cancels_at_deadline():
+    cancelled = asyncio.Event()
+    rss_articles = [_article(url="https://example.com/rss")]
+
+    async def hung_finnhub(*_):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with patch("agent.graph.nodes.news_retriever.NEWS_FETCH_BUDGET_SECONDS", 0.3), \
+         patch("agent.graph.nodes.news_retriever.NEWS_RSS_HEDGE_SECONDS", 0.05), \
+         patch("agent.graph.nodes.news_retriever.NEWS_RECENT_TTL_SECONDS", 0), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=hung_finnhub), \
+         patch("agent.graph.nodes.news_retriever._fetch_google_rss", return_value=rss_articles) as mock_rss:
+        started = time.perf_counter()
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0)
+
+    mock_rss.assert_called_once()
+    assert (result, source) == (rss_articles, "google_rss")
+    assert 0.25 < elapsed < 1.0
+    assert cancelled.is_set()
+    # A span cut off by the deadline is not kept as settled coverage
+    assert _news_store().missing_ranges("NVDA", "finnhub", "2024-06-01", "2024-06-30") != []
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_returns_early_once_enough_relevant_articles():
+    fh = [_article(title=f"NVIDIA story {i}", url=f"https://reuters.com/{i}") for i in range(10)]
+
+    async def slow_youcom(*_):
+        await asyncio.sleep(5)
+
+    with patch("agent.graph.nodes.news_retriever.NEWS_RECENT_TTL_SECONDS", 0), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=fh), \
+         patch("agent.graph.nodes.news_retriever._fetch_youcom", side_effect=slow_youcom), \
+         patch("agent.graph.nodes.news_retriever._fetch_google_rss") as mock_rss:
+        started = time.perf_counter()
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+        elapsed = time.perf_counter() - started
+
+    mock_rss.assert_not_called()
+    assert source == "finnhub"
+    assert len(result) == 10
+    assert elapsed < 0.5
+    # You.com was cancelled: the span only gets the short TTL, never settled coverage
+    assert _news_store().missing_ranges("NVDA", "finnhub+youcom", "2024-06-01", "2024-06-30") == [
+        ("2024-06-01", "2024-06-30"),
+    ]
+    assert _news_store()._connect().execute(
+        "SELECT COUNT(*) FROM news_coverage WHERE expires_at IS NULL"
+    ).fetchone() == (0,)
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_skips_rss_hedge_once_layer1_has_articles():
+    async def slow_youcom(*_):
+        await asyncio.sleep(0.2)
+        return [_article(url="https://cnbc.com/b")]
+
+    with patch("agent.graph.nodes.news_retriever.NEWS_RSS_HEDGE_SECONDS", 0.05), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=[_article(url="https://reuters.com/a")]), \
+         patch("agent.graph.nodes.news_retriever._fetch_youcom", side_effect=slow_youcom), \
+         patch("agent.graph.nodes.news_retriever._fetch_google_rss") as mock_rss:
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", "ydc-key")
+
+    mock_rss.assert_not_called()
+    assert source == "finnhub+youcom"
+    assert len(result) == 2
+
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_settles_span_when_layer1_answers_after_hedge_starts():
+    async def slow_finnhub(*_):
+        await asyncio.sleep(0.15)
+        return [_article(url="https://reuters.com/a")]
+
+    async def slow_rss(*_):
+        await asyncio.sleep(5)
+
+    with patch("agent.graph.nodes.news_retriever.NEWS_RSS_HEDGE_SECONDS", 0.05), \
+         patch("agent.graph.nodes.news_retriever.NEWS_RECENT_TTL_SECONDS", 0), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=slow_finnhub), \
+         patch("agent.graph.nodes.news_retriever._fetch_google_rss", side_effect=slow_rss) as mock_rss:
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+
+    mock_rss.assert_called_once()
+    assert source == "finnhub"
+    # The cancelled hedge does not keep a span Layer 1 answered in full from settling
+    assert _news_store().missing_ranges("NVDA", "finnhub", "2024-06-01", "2024-06-30") == []
+
+
+# ---------------------------------------------------------------------------
+# Article store
+# ---------------------------------------------------------------------------
+
+def _news_store():
+    from agent.graph.nodes import news_retriever
+    return news_retriever._article_store
+
+
+def _days_ago(n):
+    return (datetime.now() - timedelta(days=n)).strftime("%Y-%m-%d")
+
+
+def test_article_store_missing_ranges_reports_inclusive_gaps():
+    store = _ArticleStore(":memory:")
+    store.store("NVDA", "finnhub", "2024-02-01", "2024-02-29", [("finnhub", _article())])
+    store.store("NVDA", "finnhub", "2024-04-01", "2024-04-30", [("finnhub", _article())])
+
+    assert store.missing_ranges("NVDA", "finnhub", "2024-01-15", "2024-05-10") == [
+        ("2024-01-15", "2024-01-31"),
+        ("2024-03-01", "2024-03-31"),
+        ("2024-05-01", "2024-05-10"),
+    ]
+    assert store.missing_ranges("NVDA", "finnhub+youcom", "2024-02-01", "2024-02-29") == [
+        ("2024-02-01", "2024-02-29"),
+    ]
+
+
+def test_article_store_merges_adjacent_spans():
+    store = _ArticleStore(":memory:")
+    store.store("NVDA", "finnhub", "2024-02-01", "2024-02-29", [("finnhub", _article())])
+    store.store("NVDA", "finnhub", "2024-03-01", "2024-03-31", [("finnhub", _article())])
+
+    assert store.missing_ranges("NVDA", "finnhub", "2024-02-01", "2024-03-31") == []
+    assert store._connect().execute("SELECT COUNT(*) FROM news_coverage").fetchone() == (1,)
+
+
+def test_article_store_recent_and_empty_spans_expire():
+    store = _ArticleStore(":memory:")
+    with patch("agent.graph.nodes.news_retriever.NEWS_RECENT_TTL_SECONDS", 0):
+        store.store("NVDA", "finnhub", _days_ago(10), _days_ago(0), [("finnhub", _article())])
+        store.store("NVDA", "finnhub", "2024-02-01", "2024-02-29", [])
+
+    assert store.missing_ranges("NVDA", "finnhub", _days_ago(10), _days_ago(0)) == [(_days_ago(1), _days_ago(0))]
+    assert store.missing_ranges("NVDA", "finnhub", "2024-02-01", "2024-02-29") == [("2024-02-01", "2024-02-29")]
+
+
+def test_article_store_clamps_dates_into_the_fetched_span():
+    store = _ArticleStore(":memory:")
+    undated = {**_article(url="https://cnbc.com/undated"), "published_date": ""}
+    early = {**_article(url="https://reuters.com/early"), "published_date": "2024-05-31"}
+    store.store("NVDA", "youcom", "2024-06-01", "2024-06-30", [("youcom", undated), ("youcom", early)])
+
+    assert {a["url"] for _, a in store.load("NVDA", "2024-06-01", "2024-06-30")} == {
+        "https://cnbc.com/undated", "https://reuters.com/early",
+    }
+    assert store.load("NVDA", "2024-06-01", "2024-06-29")[0][1]["url"] == "https://reuters.com/early"
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_repeat_query_served_from_store():
+    articles = [_article(url="https://reuters.com/a")]
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=articles) as mock_fh:
+        first = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+        second = await _fetch_articles("NVDA", "NVIDIA", "2024-06-10", "2024-06-20", "fh-key", None)
+
+    mock_fh.assert_called_once()
+    assert first == second == (articles, "finnhub")
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_overlapping_query_fetches_only_the_gap():
+    june = [_article(url="https://reuters.com/june")]
+    july = [{**_article(url="https://cnbc.com/july"), "published_date": "2024-07-10"}]
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=[june, july]) as mock_fh:
+        await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-10", "2024-07-15", "fh-key", None)
+
+    assert mock_fh.call_args_list[1] == call("NVDA", "2024-07-01", "2024-07-15", "fh-key")
+    assert [a["url"] for a in result] == ["https://cnbc.com/july", "https://reuters.com/june"]
+    assert source == "finnhub"
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_capped_span_covers_only_its_exact_repeat():
+    capped = [_article(title=f"NVIDIA story {i}", url=f"https://reuters.com/{i}") for i in range(10)]
+    week = [_article(url="https://cnbc.com/week")]
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=[capped, week]) as mock_fh:
+        await _fetch_articles("NVDA", "NVIDIA", "2024-04-01", "2024-06-30", "fh-key", None)
+        await _fetch_articles("NVDA", "NVIDIA", "2024-04-01", "2024-06-30", "fh-key", None)
+        assert mock_fh.call_count == 1
+        # Finnhub stopped at its cap, so a week inside the quarter is asked for again.
+        result, _ = await _fetch_articles("NVDA", "NVIDIA", "2024-05-06", "2024-05-12", "fh-key", None)
+
+    assert mock_fh.call_args_list[1] == call("NVDA", "2024-05-06", "2024-05-12", "fh-key")
+    assert "https://cnbc.com/week" in [a["url"] for a in result]
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_new_provider_key_is_a_store_miss():
+    rss = [_article(url="https://example.com/rss")]
+    fh = [_article(url="https://reuters.com/a")]
+    with patch("agent.graph.nodes.news_retriever._fetch_google_rss", return_value=rss), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=fh) as mock_fh:
+        await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", None, None)
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+
+    mock_fh.assert_called_once()
+    assert (result, source) == (fh, "finnhub")
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_broken_store_fetches_directly():
+    articles = [_article(url="https://reuters.com/a")]
+    with patch("agent.graph.nodes.news_retriever._article_store.missing_ranges",
+               side_effect=sqlite3.OperationalError("disk I/O error")), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=articles) as mock_fh:
+        result, source = await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+
+    mock_fh.assert_called_once_with("NVDA", "2024-06-01", "2024-06-30", "fh-key")
+    assert (result, source) == (articles, "finnhub")
+
+
+@pytest.mark.asyncio
+async def test_fetch_articles_runs_store_calls_off_the_event_loop():
+    import threading
+    from agent.graph.nodes import news_retriever
+
+    store = news_retriever._article_store
+    threads = []
+
+    def recording(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return wrapper
+
+    with patch.object(store, "missing_ranges", recording(store.missing_ranges)), \
+         patch.object(store, "store", recording(store.store)), \
+         patch.object(store, "load", recording(store.load)), \
+         patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=[_article()]):
+        await _fetch_articles("NVDA", "NVIDIA", "2024-06-01", "2024-06-30", "fh-key", None)
+
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
+@patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value=None)
+@patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
+async def test_retrieve_news_snapshot_inside_historical_range_costs_no_extra_fetch(*_):
+    recent = {**_article(url="https://reuters.com/recent"), "published_date": _days_ago(2)}
+    older = {**_article(url="https://reuters.com/older"), "published_date": _days_ago(20)}
+    state = _base_state(start_date=_days_ago(30), end_date=_days_ago(0), include_current_snapshot=True)
+
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", return_value=[recent, older]) as mock_fh:
+        result = await retrieve_news(state)
+
+    mock_fh.assert_called_once()
+    assert [a["url"] for a in result["news_articles"]] == ["https://reuters.com/recent", "https://reuters.com/older"]
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
+@patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value=None)
+@patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
+async def test_retrieve_news_fetches_snapshot_gap_before_range_concurrently(*_):
+    """A historical range starting inside the snapshot window leaves a gap before it, fetched in the same gather."""
+    in_flight, overlapped = 0, False
+
+    async def fake_finnhub(ticker, start, end, key):
+        nonlocal in_flight, overlapped
+        in_flight += 1
+        overlapped = overlapped or in_flight > 1
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return [{**_article(url=f"https://reuters.com/{start}"), "published_date": start}]
+
+    state = _base_state(start_date=_days_ago(3), end_date=_days_ago(0), include_current_snapshot=True)
+    with patch("agent.graph.nodes.news_retriever._fetch_finnhub", side_effect=fake_finnhub) as mock_fh:
+        result = await retrieve_news(state)
+
+    assert sorted(c.args[1:3] for c in mock_fh.call_args_list) == [
+        (_days_ago(7), _days_ago(4)), (_days_ago(3), _days_ago(0)),
+    ]
+    assert overlapped
+    assert {a["url"] for a in result["news_articles"]} == {
+        f"https://reuters.com/{_days_ago(3)}", f"https://reuters.com/{_days_ago(7)}",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Relevance ranking
+# ---------------------------------------------------------------------------
+
+def _rank_urls(articles, ticker="NVDA", company_name="NVIDIA", start="2024-06-01", end="2024-06-30"):
+    return [a["url"] for a in _rank_articles(articles, ticker, company_name, start, end)]
+
+
+def test_rank_articles_matches_ticker_symbols_case_sensitively():
+    articles = [
+        _article(title="Bitcoin slips as coin prices cool", url="https://a.com/1", snippet="Crypto markets fell."),
+        _article(title="Coinbase shares rally", url="https://a.com/2", snippet="The exchange beat estimates."),
+        _article(title="$COIN jumps premarket", url="https://a.com/3", snippet="Volume surged."),
+        _article(title="Snow storm hits Denver", url="https://a.com/4", snippet="Flights were cancelled."),
+    ]
+
+    assert sorted(_rank_urls(articles, "COIN", "Coinbase")) == ["https://a.com/2", "https://a.com/3"]
+    assert _rank_urls(articles, "SNOW", "Snowflake") == []
+
+
+def test_rank_articles_needs_a_marker_for_single_letter_ticker():
+    articles = [
+        _article(title="A new report on chip demand", url="https://a.com/1", snippet="Analysts weigh in."),
+        _article(title="Agilent (A) beats estimates", url="https://a.com/2", snippet="Shares rose."),
+        _article(title="Lab stocks climb", url="https://a.com/3", snippet="NYSE:A gained 4%, $A options busy."),
+    ]
+
+    assert _rank_urls(articles, "A", "A") == ["https://a.com/2", "https://a.com/3"]
+
+
+def test_rank_articles_needs_a_marker_for_word_ticker():
+    articles = [
+        _article(title="IT spending slows in Europe", url="https://a.com/1", snippet="Budgets are tight."),
+        _article(title="Gartner shares slip", url="https://a.com/2", snippet="Gartner (IT) cut its outlook."),
+        _article(title="Why IT leaders are cautious", url="https://a.com/3", snippet="$IT fell 3%."),
+    ]
+
+    assert sorted(_rank_urls(articles, "IT", "IT")) == ["https://a.com/2", "https://a.com/3"]
+
+
+def test_rank_articles_uses_lookup_aliases_on_word_boundaries():
+    articles = [
+        _article(title="Google unveils new Gemini model", url="https://a.com/1", snippet="Search gets AI."),
+        _article(title="Googling tips for students", url="https://a.com/2", snippet="How to search better."),
+        _article(title="Meta shares climb on ad growth", url="https://a.com/3", snippet="Revenue rose."),
+    ]
+
+    assert _rank_urls(articles, "GOOGL", "Alphabet (Google)") == ["https://a.com/1"]
+    assert _rank_urls(articles, "META", "Meta") == ["https://a.com/3"]
+
+
+def test_rank_articles_weak_first_word_alias_for_unlisted_company():
+    articles = [
+        _article(title="Micron shares surge", url="https://a.com/weak", snippet="Memory prices rose."),
+        _article(title="Micron Technology beats estimates", url="https://a.com/full", snippet="Memory prices rose."),
+    ]
+    assert _rank_urls(articles, "MU", "Micron Technology Inc.") == ["https://a.com/full", "https://a.com/weak"]
+
+
+def test_rank_articles_orders_by_mentions_recency_and_source():
+    snippet_only = _article(title="Chip stocks rally", url="https://reuters.com/chips",
+                            snippet="NVIDIA led the gains.")
+    older = {**_article(title="NVIDIA unveils Blackwell", url="https://blog.example/old", snippet="New GPUs."),
+             "source_name": "Example Blog", "published_date": "2024-06-02"}
+    newer = {**older, "url": "https://blog.example/new", "published_date": "2024-06-28"}
+    reuters = {**older, "url": "https://reuters.com/old", "source_name": "Reuters"}
+
+    assert _rank_urls([snippet_only, older, newer, reuters]) == [
+        "https://reuters.com/old", "https://blog.example/new", "https://blog.example/old", "https://reuters.com/chips",
+    ]
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
+@patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
+@patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value="fc-key")
+@patch("agent.graph.nodes.news_retriever._fetch_articles")
+@patch("agent.graph.nodes.news_retriever._enrich_articles")
+async def test_retrieve_news_enriches_only_the_top_ranked_articles(mock_enrich, mock_fetch, *_):
+    relevant = [_article(title=f"NVDA story {i}", url=f"https://cnbc.com/{i}") for i in range(12)]
+    off_topic = [_article(title="Oil prices climb", url="https://cnbc.com/oil", snippet="Crude rose.")]
+    mock_fetch.return_value = (off_topic + relevant, "finnhub")
+    mock_enrich.side_effect = lambda articles, key: articles
+
+    result = await retrieve_news(_base_state())
+
+    assert len(mock_enrich.call_args[0][0]) == 8
+    assert [a["url"] for a in result["news_articles"]] == [f"https://cnbc.com/{i}" for i in range(8)]
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate clustering
+# ---------------------------------------------------------------------------
+
+_WIRE_TITLE = "Nvidia shares hit record as AI chip demand surges"
+_WIRE_BODY = (
+    "Nvidia Corp shares rose 4% on Tuesday to a record high, as investors bet demand for its "
+    "artificial intelligence chips will keep growing, after rival Micron posted strong results."
+)
+_OTHER_STORY = _article(
+    title="Nvidia faces antitrust probe in China",
+    url="https://apnews.com/nvidia-probe",
+    snippet="Chinese regulators opened an investigation into Nvidia over suspected violations of "
+            "anti-monopoly law, a move seen as retaliation against US chip export curbs.",
+)
+
+
+def _reprint(url, title=_WIRE_TITLE, snippet=_WIRE_BODY):
+    return _article(title=title, url=url, snippet=snippet)
+
+
+def test_collapse_near_duplicates_keeps_one_per_syndicated_story():
+    articles = [
+        _reprint("https://reuters.com/nvda-record"),
+        _OTHER_STORY,
+        _reprint("https://finance.yahoo.com/nvda-record", title=_WIRE_TITLE + " - Reuters",
+                 snippet=_WIRE_BODY.split(", after")[0] + "."),
+        _reprint("https://marketwatch.com/nvda-record",
+                 snippet="Shares of Nvidia rose 4% Tuesday to a record high as investors bet demand for its "
+                         "artificial intelligence chips will keep growing after rival Micron posted strong "
+                         "results, Reuters reported."),
+    ]
+
+    assert [a["url"] for a in _collapse_near_duplicates(articles)] == [
+        "https://reuters.com/nvda-record", "https://apnews.com/nvidia-probe",
+    ]
+
+
+def test_collapse_near_duplicates_prefers_a_free_domain_representative():
+    articles = [_reprint("https://bloomberg.com/nvda-record"), _OTHER_STORY, _reprint("https://cnbc.com/nvda-record")]
+
+    assert [a["url"] for a in _collapse_near_duplicates(articles)] == [
+        "https://cnbc.com/nvda-record", "https://apnews.com/nvidia-probe",
+    ]
+
+
+def test_collapse_near_duplicates_leaves_short_texts_alone():
+    articles = [_article(url="https://reuters.com/a"), _article(url="https://cnbc.com/b")]
+    assert _collapse_near_duplicates(articles) == articles
+
+
+def test_collapse_near_duplicates_drops_matches_of_known_articles():
+    known = [_reprint("https://reuters.com/nvda-record")]
+    assert _collapse_near_duplicates([_reprint("https://cnbc.com/nvda-record"), _OTHER_STORY], known=known) == [_OTHER_STORY]
+
+
 # ---------------------------------------------------------------------------
 # _is_free_domain
 # ---------------------------------------------------------------------------
@@ -318,65 +822,135 @@ def test_is_free_domain_rejects_paywalled_domains():
 # _enrich_with_firecrawl
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.news_retriever.requests.post")
-def test_enrich_with_firecrawl_replaces_snippet_for_free_domain(mock_post):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_with_firecrawl_replaces_snippet_for_free_domain(mock_post):
     mock_post.return_value = _make_response({
         "success": True,
         "data": {"markdown": "# NVDA Article\n\nFull article content here. " * 50},
     })
     article = _article(url="https://reuters.com/nvda")
-    enriched = _enrich_with_firecrawl(article, "fc-key")
+    enriched = await _enrich_with_firecrawl(article, "fc-key")
 
     assert enriched["snippet"] != article["snippet"]
     assert len(enriched["snippet"]) <= 2000
     assert "NVDA Article" in enriched["snippet"]
 
 
-@patch("agent.graph.nodes.news_retriever.requests.post")
-def test_enrich_with_firecrawl_skips_paywalled_domain(mock_post):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_with_firecrawl_skips_paywalled_domain(mock_post):
     article = _article(url="https://bloomberg.com/nvda")
-    result = _enrich_with_firecrawl(article, "fc-key")
+    result = await _enrich_with_firecrawl(article, "fc-key")
 
     mock_post.assert_not_called()
     assert result is article  # unchanged
 
 
-@patch("agent.graph.nodes.news_retriever.requests.post")
-def test_enrich_with_firecrawl_returns_original_on_http_error(mock_post):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_with_firecrawl_returns_original_on_http_error(mock_post):
     mock_post.return_value = _make_response({}, status_code=500)
     article = _article(url="https://reuters.com/nvda")
-    result = _enrich_with_firecrawl(article, "fc-key")
+    result = await _enrich_with_firecrawl(article, "fc-key")
     assert result["snippet"] == article["snippet"]
 
 
-@patch("agent.graph.nodes.news_retriever.requests.post")
-def test_enrich_with_firecrawl_returns_original_on_exception(mock_post):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_with_firecrawl_returns_original_on_exception(mock_post):
     mock_post.side_effect = Exception("timeout")
     article = _article(url="https://reuters.com/nvda")
-    result = _enrich_with_firecrawl(article, "fc-key")
+    result = await _enrich_with_firecrawl(article, "fc-key")
     assert result["snippet"] == article["snippet"]
 
 
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_with_firecrawl_serves_repeat_urls_from_cache(mock_post):
+    mock_post.return_value = _make_response({"data": {"markdown": "Full NVDA article text."}})
+    article = _article(url="https://reuters.com/nvda")
+
+    first = await _enrich_with_firecrawl(article, "fc-key")
+    second = await _enrich_with_firecrawl(article, "fc-key")
+
+    mock_post.assert_called_once()
+    assert first["snippet"] == second["snippet"] == "Full NVDA article text."
+
+
+def test_scrape_cache_round_trips_compressed_text():
+    cache = _ScrapeCache(":memory:", 1 << 20)
+    text = "Data center revenue grew again. " * 60
+    cache.put("https://reuters.com/a", text)
+
+    assert cache.get("https://reuters.com/a") == text
+    assert cache.get("https://reuters.com/missing") is None
+    stored = cache._connect().execute("SELECT size FROM scrapes").fetchone()[0]
+    assert stored < len(text) / 10
+
+
+def test_scrape_cache_evicts_least_recently_used_over_budget():
+    texts = {url: f"{url} " + "".join(f"{i:x}" for i in range(400)) for url in ("a", "b", "c")}
+    entry_size = len(zlib.compress(texts["a"].encode()))
+    cache = _ScrapeCache(":memory:", int(entry_size * 2.5))
+
+    cache.put("a", texts["a"])
+    time.sleep(0.01)
+    cache.put("b", texts["b"])
+    time.sleep(0.01)
+    cache.get("a")  # refresh "a", so "b" is now the least recently used
+    time.sleep(0.01)
+    cache.put("c", texts["c"])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == texts["a"]
+    assert cache.get("c") == texts["c"]
+
+
+
+def test_scrape_cache_evicts_in_batches_and_tracks_total():
+    texts = {f"u{i:02d}": f"u{i:02d} " + "".join(f"{j:x}" for j in range(400)) for i in range(12)}
+    entry_size = max(len(zlib.compress(t.encode())) for t in texts.values())
+    cache = _ScrapeCache(":memory:", int(entry_size * 10.5))
+
+    for url in list(texts)[:11]:
+        cache.put(url, texts[url])
+        time.sleep(0.002)
+    cache.put("u10", texts["u10"])   # replacing an entry does not grow the total
+
+    conn = cache._connect()
+    # Over budget once: the two oldest go together, leaving headroom ...
+    assert conn.execute("SELECT COUNT(*) FROM scrapes").fetchone()[0] == 9
+    assert cache.get("u00") is None and cache.get("u01") is None
+    # ... so the next write fits without evicting.
+    cache.put("u11", texts["u11"])
+    assert conn.execute("SELECT COUNT(*) FROM scrapes").fetchone()[0] == 10
+    assert cache._total == conn.execute("SELECT SUM(size) FROM scrapes").fetchone()[0]
+
+
 # ---------------------------------------------------------------------------
 # _enrich_articles
 # ---------------------------------------------------------------------------
 
-def test_enrich_articles_skips_when_no_key():
+@pytest.mark.asyncio
+async def test_enrich_articles_skips_when_no_key():
     articles = [_article(url="https://reuters.com/nvda")]
-    result = _enrich_articles(articles, None)
+    result = await _enrich_articles(articles, None)
     assert result is articles  # unchanged, same object
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._enrich_with_firecrawl")
-def test_enrich_articles_calls_enricher_for_each_article(mock_enrich):
+async def test_enrich_articles_calls_enricher_for_each_article(mock_enrich):
     mock_enrich.side_effect = lambda a, key: a
     articles = [_article(url=f"https://reuters.com/{i}") for i in range(3)]
-    _enrich_articles(articles, "fc-key")
+    await _enrich_articles(articles, "fc-key")
     assert mock_enrich.call_count == 3
 
 
-@patch("agent.graph.nodes.news_retriever.requests.post")
-def test_enrich_articles_returns_original_snippets_on_firecrawl_500(mock_post):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever.async_post")
+async def test_enrich_articles_returns_original_snippets_on_firecrawl_500(mock_post):
     """
     If Firecrawl returns HTTP 500 for every article, _enrich_articles must
     return the original articles unchanged — not an empty list, not None.
@@ -392,7 +966,7 @@ def test_enrich_articles_returns_original_snippets_on_firecrawl_500(mock_post):
         _article(title="Article 1", url="https://reuters.com/a1", snippet="Original snippet 1."),
         _article(title="Article 2", url="https://reuters.com/a2", snippet="Original snippet 2."),
     ]
-    result = _enrich_articles(articles, api_key="fake_key")
+    result = await _enrich_articles(articles, api_key="fake_key")
 
     assert len(result) == 2, "Must return all articles even when Firecrawl returns 500"
     assert result[0]["snippet"] == "Original snippet 1.", (
@@ -407,77 +981,103 @@ def test_enrich_articles_returns_original_snippets_on_firecrawl_500(mock_post):
 # retrieve_news — node integration
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
 @patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
 @patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._fetch_articles")
-def test_retrieve_news_returns_articles_and_source(mock_fetch, *_):
+async def test_retrieve_news_returns_articles_and_source(mock_fetch, *_):
     mock_fetch.return_value = ([_article()], "finnhub")
-    result = retrieve_news(_base_state())
+    result = await retrieve_news(_base_state())
 
     assert result["news_source_used"] == "finnhub"
     assert len(result["news_articles"]) == 1
     assert result["news_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._fetch_articles", return_value=(None, "none"))
-def test_retrieve_news_all_sources_fail_returns_none_articles(mock_fetch, *_):
-    result = retrieve_news(_base_state())
+async def test_retrieve_news_all_sources_fail_returns_none_articles(mock_fetch, *_):
+    result = await retrieve_news(_base_state())
     assert result["news_articles"] is None
     assert result["news_source_used"] == "none"
     assert result["news_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
 @patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
 @patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value="fc-key")
 @patch("agent.graph.nodes.news_retriever._fetch_articles")
 @patch("agent.graph.nodes.news_retriever._enrich_articles")
-def test_retrieve_news_calls_firecrawl_when_key_present(mock_enrich, mock_fetch, *_):
+async def test_retrieve_news_calls_firecrawl_when_key_present(mock_enrich, mock_fetch, *_):
     mock_fetch.return_value = ([_article()], "finnhub")
     mock_enrich.side_effect = lambda articles, key: articles
-    retrieve_news(_base_state())
+    await retrieve_news(_base_state())
     mock_enrich.assert_called_once()
     assert mock_enrich.call_args[0][1] == "fc-key"
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
 @patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
 @patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._fetch_articles")
-def test_retrieve_news_current_snapshot_appends_recent(mock_fetch, *_):
+async def test_retrieve_news_current_snapshot_appends_recent(mock_fetch, *_):
     historical = [_article(url="https://reuters.com/old", snippet="NVDA")]
     current = [_article(title="New", url="https://cnbc.com/new", snippet="NVDA")]
     mock_fetch.side_effect = [(historical, "finnhub"), (current, "finnhub")]
 
-    result = retrieve_news(_base_state(include_current_snapshot=True))
+    result = await retrieve_news(_base_state(include_current_snapshot=True))
     assert len(result["news_articles"]) == 2
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
 @patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
 @patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value=None)
 @patch("agent.graph.nodes.news_retriever._fetch_articles")
-def test_retrieve_news_deduplicates_on_snapshot(mock_fetch, *_):
+async def test_retrieve_news_deduplicates_on_snapshot(mock_fetch, *_):
     article = _article(url="https://reuters.com/same", snippet="NVDA")
     mock_fetch.side_effect = [([article], "finnhub"), ([article], "finnhub")]
 
-    result = retrieve_news(_base_state(include_current_snapshot=True))
+    result = await retrieve_news(_base_state(include_current_snapshot=True))
     assert len(result["news_articles"]) == 1
 
 
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.news_retriever._get_finnhub_key", return_value="fh-key")
+@patch("agent.graph.nodes.news_retriever._get_youcom_key", return_value="ydc-key")
+@patch("agent.graph.nodes.news_retriever._get_firecrawl_key", return_value="fc-key")
+@patch("agent.graph.nodes.news_retriever._fetch_articles")
+@patch("agent.graph.nodes.news_retriever._enrich_articles")
+async def test_retrieve_news_enriches_one_article_per_near_duplicate_cluster(mock_enrich, mock_fetch, *_):
+    historical = [_reprint("https://reuters.com/nvda-record"), _reprint("https://cnbc.com/nvda-record"), _OTHER_STORY]
+    snapshot = [_reprint("https://finance.yahoo.com/nvda-record"), _article(title="NVDA new", url="https://cnbc.com/new")]
+    mock_fetch.side_effect = [(historical, "finnhub"), (snapshot, "finnhub")]
+    mock_enrich.side_effect = lambda articles, key: [{**a, "snippet": "full text"} for a in articles]
+
+    result = await retrieve_news(_base_state(include_current_snapshot=True))
+
+    enriched_urls = [a["url"] for call_args in mock_enrich.call_args_list for a in call_args[0][0]]
+    assert enriched_urls == ["https://reuters.com/nvda-record", "https://apnews.com/nvidia-probe", "https://cnbc.com/new"]
+    assert [a["url"] for a in result["news_articles"]] == enriched_urls
+
+
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.news_retriever._get_finnhub_key", side_effect=Exception("unexpected"))
-def test_retrieve_news_unexpected_exception_writes_error(mock_fh_key):
-    result = retrieve_news(_base_state())
+async def test_retrieve_news_unexpected_exception_writes_error(mock_fh_key):
+    result = await retrieve_news(_base_state())
     assert result["news_articles"] is None
     assert result["news_error"] is not None
     assert "unexpected" in result["news_error"]
 
 
-def test_returns_only_owned_fields():
+@pytest.mark.asyncio
+async def test_returns_only_owned_fields():
     """
     retrieve_news must return ONLY its three owned fields.
     Returning {**state} in a parallel Send() branch causes LangGraph to
@@ -487,7 +1087,7 @@ def test_returns_only_owned_fields():
 
     with patch("agent.graph.nodes.news_retriever._fetch_articles", return_value=([], "none")):
         with patch("agent.graph.nodes.news_retriever._enrich_articles", return_value=[]):
-            result = retrieve_news(state)
+            result = await retrieve_news(state)
 
     assert set(result.keys()) == {"news_articles", "news_source_used", "news_error"}, (
         f"retrieve_news returned unexpected keys: {set(result.keys())}"
@@ -501,21 +1101,22 @@ def test_returns_only_owned_fields():
 # HTTP-layer field-mapping contract test
 # ---------------------------------------------------------------------------
 
-@responses_lib.activate
-def test_fetch_finnhub_parses_real_response_field_names():
+@pytest.mark.asyncio
+@pytest.mark.asyncio
+async def test_fetch_finnhub_parses_real_response_field_names():
     """
     HTTP-layer contract test: _fetch_finnhub must correctly map Finnhub's
     field names (headline, summary, datetime, source) to the internal
     article format (title, snippet, published_date, source_name).
 
-    Unlike function-level mocks, this intercepts at the HTTP layer so the
-    actual field-mapping code runs. If Finnhub renames a field in their API,
-    this test fails immediately, pointing directly at the broken mapping.
+    Unlike function-level mocks, this intercepts at the HTTP layer (an httpx
+    MockTransport behind the shared client) so the actual field-mapping code
+    runs. If Finnhub renames a field in their API, this test fails
+    immediately, pointing directly at the broken mapping.
     """
-    responses_lib.add(
-        responses_lib.GET,
-        _re.compile(r"https://finnhub\.io/api/v1/company-news.*"),
-        json=[
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert _re.match(r"https://finnhub\.io/api/v1/company-news", str(request.url))
+        return httpx.Response(200, json=[
             {
                 "headline": "NVDA hits record high",
                 "source": "Reuters",
@@ -523,11 +1124,12 @@ def test_fetch_finnhub_parses_real_response_field_names():
                 "url": "https://reuters.com/nvda-record",
                 "summary": "NVIDIA stock reached a new all-time high on strong AI demand.",
             }
-        ],
-        status=200,
-    )
+        ])
 
-    result = _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", api_key="fake_key")
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("agent.graph.nodes.http_client.get_async_client", return_value=mock_client):
+        result = await _fetch_finnhub("NVDA", "2024-06-01", "2024-06-30", api_key="fake_key")
+    await mock_client.aclose()
 
     assert result is not None and len(result) == 1, (
         f"Expected 1 article from Finnhub response, got: {result}"
@@ -12,6 +12,7 @@ Key mocking note:
 """
 
 import math
+import time
 from collections import namedtuple
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
@@ -27,8 +28,14 @@ _EXPIRY_180D = (datetime.now() + timedelta(days=180)).strftime("%Y-%m-%d")
 from agent.graph.nodes.options_analyzer import (
     analyze_options,
     _black_scholes_greeks,
+    _black_scholes_greeks_array,
+    _build_surface,
     _calculate_max_pain,
+    _implied_spot,
+    _normal_cdf,
+    _normal_cdf_array,
 )
+from tests.benchmarks.bench_max_pain import _max_pain_reference, synthetic_chain
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +154,33 @@ def test_max_pain_returns_none_on_empty_dataframes():
     assert result is None
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_max_pain_matches_reference_loop_on_synthetic_chains(seed):
+    """Vectorized max pain picks the same strike as the original O(n²) loop."""
+    calls, puts = synthetic_chain(200 + seed * 10, seed=seed)
+    assert _calculate_max_pain(calls, puts) == _max_pain_reference(calls, puts)
+
+
+def test_max_pain_matches_reference_on_ragged_chain():
+    """Different call/put strike sets, zero OI, NaN OI and NaN strikes."""
+    calls = pd.DataFrame({
+        "strike": [90.0, 95.0, 100.0, 105.0, float("nan")],
+        "openInterest": [300, 0, float("nan"), 120, 999],
+    })
+    puts = pd.DataFrame({
+        "strike": [97.5, 100.0, 102.5, 110.0],
+        "openInterest": [50, 400, 0, 220],
+    })
+    assert _calculate_max_pain(calls, puts) == _max_pain_reference(calls, puts)
+
+
+def test_max_pain_ties_resolve_to_lowest_strike():
+    """No open interest anywhere → every total is 0 → lowest strike wins."""
+    calls = _make_options_df([110.0, 100.0], [1, 1], [0, 0], [0.3, 0.3])
+    puts = _make_options_df([105.0], [1], [0], [0.3])
+    assert _calculate_max_pain(calls, puts) == 100.0
+
+
 # ---------------------------------------------------------------------------
 # Full node tests
 # ---------------------------------------------------------------------------
@@ -307,3 +341,148 @@ def test_black_scholes_nan_sigma_returns_none_greeks():
     assert result["gamma"] is None
     assert result["theta"] is None
     assert result["vega"] is None
+
+
+# ---------------------------------------------------------------------------
+# Array Black-Scholes
+# ---------------------------------------------------------------------------
+
+def test_normal_cdf_array_matches_scalar():
+    xs = [-6.0, -2.5, -1.0, -0.1, 0.0, 0.3, 1.7, 4.0]
+    vec = _normal_cdf_array(xs)
+    for x, v in zip(xs, vec):
+        assert v == pytest.approx(_normal_cdf(x), abs=1e-7)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_black_scholes_array_matches_scalar(option_type):
+    """Every strike priced in one array pass agrees with the scalar Greeks."""
+    strikes = [120.0, 150.0, 175.0, 180.0, 185.0, 210.0, 260.0]
+    ivs = [0.55, 0.4, 0.3, 0.28, 0.29, 0.33, 0.5]
+    T = 45 / 365
+    arr = _black_scholes_greeks_array(180.0, strikes, T, ivs, option_type)
+    for i, (K, sigma) in enumerate(zip(strikes, ivs)):
+        scalar = _black_scholes_greeks(180.0, K, T, sigma, option_type)
+        for greek in ("delta", "gamma", "theta", "vega"):
+            assert arr[greek][i] == pytest.approx(scalar[greek], abs=1e-4)
+
+
+def test_black_scholes_array_invalid_rows_are_nan():
+    arr = _black_scholes_greeks_array(180.0, [180.0, 0.0, 180.0], [0.1, 0.1, 0.0], [0.3, 0.3, 0.3])
+    assert not math.isnan(arr["delta"][0])
+    assert math.isnan(arr["delta"][1])
+    assert math.isnan(arr["gamma"][2])
+
+
+# ---------------------------------------------------------------------------
+# Volatility surface
+# ---------------------------------------------------------------------------
+
+def _surface_chain(atm_iv: float, skew: float = 0.0):
+    """Chain around 180 whose IV rises by `skew` per 10 points below spot."""
+    strikes = [150.0, 160.0, 170.0, 180.0, 190.0, 200.0, 210.0]
+    ivs = [atm_iv + skew * max(0.0, (180.0 - k) / 10) for k in strikes]
+    calls = _make_options_df(strikes, [10] * 7, [100] * 7, ivs)
+    puts = _make_options_df(strikes, [10] * 7, [100] * 7, ivs)
+    return OptionChain(calls=calls, puts=puts)
+
+
+def test_surface_term_structure_contango_and_put_skew():
+    chains = {
+        _EXPIRY_45D: _surface_chain(0.30, skew=0.03),
+        _EXPIRY_75D: _surface_chain(0.33, skew=0.03),
+        _EXPIRY_180D: _surface_chain(0.38, skew=0.03),
+    }
+    surface = _build_surface(chains, 180.0)
+
+    assert [t["expiry"] for t in surface["term_structure"]] == [_EXPIRY_45D, _EXPIRY_75D, _EXPIRY_180D]
+    assert [t["atm_iv"] for t in surface["term_structure"]] == [0.30, 0.33, 0.38]
+    assert surface["term_structure_shape"] == "contango"
+    assert surface["spot_source"] == "price_data"
+    # Downside puts are richer than upside calls → positive risk reversal
+    assert all(k["risk_reversal_25d"] > 0 for k in surface["skew"])
+    assert surface["contracts_priced"] == 3 * 14
+
+
+def test_surface_backwardation():
+    chains = {_EXPIRY_45D: _surface_chain(0.60), _EXPIRY_180D: _surface_chain(0.40)}
+    assert _build_surface(chains, 180.0)["term_structure_shape"] == "backwardation"
+
+
+def test_implied_spot_from_put_call_parity():
+    strikes = [170.0, 180.0, 190.0]
+    calls = _make_options_df(strikes, [1] * 3, [1] * 3, [0.3] * 3)
+    puts = _make_options_df(strikes, [1] * 3, [1] * 3, [0.3] * 3)
+    calls["bid"], calls["ask"] = [12.0, 5.0, 1.5], [12.4, 5.4, 1.9]
+    puts["bid"], puts["ask"] = [1.4, 4.6, 11.0], [1.8, 5.0, 11.4]
+    # At K=180: C - P = 0.4 → S ≈ 0.4 + 180·e^(-rT)
+    spot = _implied_spot(calls, puts, T=0.1)
+    assert spot == pytest.approx(0.4 + 180.0 * math.exp(-0.05 * 0.1))
+
+
+@patch("agent.graph.nodes.options_analyzer.yf.Ticker")
+def test_surface_uses_parity_spot_without_price_data(mock_ticker_class):
+    mock_instance = MagicMock()
+    mock_instance.options = (_EXPIRY_45D, _EXPIRY_75D)
+    mock_instance.option_chain.return_value = _surface_chain(0.3)
+    mock_ticker_class.return_value = mock_instance
+
+    result = analyze_options(_make_state(price_data=None))
+
+    surface = result["options_data"]["volatility_surface"]
+    assert surface is not None
+    assert surface["spot_source"] == "put_call_parity"
+
+
+@patch("agent.graph.nodes.options_analyzer.yf.Ticker")
+def test_expiries_fetched_concurrently(mock_ticker_class):
+    """Four chains at 0.2 s each must take about one fetch, not four."""
+    def slow_chain(expiry):
+        time.sleep(0.2)
+        return _surface_chain(0.3)
+
+    mock_instance = MagicMock()
+    mock_instance.options = (_EXPIRY_45D, _EXPIRY_75D, _EXPIRY_180D, "2099-01-15")
+    mock_instance.option_chain.side_effect = slow_chain
+    mock_ticker_class.return_value = mock_instance
+
+    started = time.perf_counter()
+    result = analyze_options(_make_state())
+    elapsed = time.perf_counter() - started
+
+    assert mock_instance.option_chain.call_count == 4
+    assert len(result["options_data"]["volatility_surface"]["term_structure"]) == 4
+    assert elapsed < 0.6
+
+
+@patch("agent.graph.nodes.options_analyzer.yf.Ticker")
+def test_far_expiry_failure_does_not_fail_node(mock_ticker_class):
+    def chain_for(expiry):
+        if expiry == _EXPIRY_180D:
+            raise Exception("timeout")
+        return _surface_chain(0.3)
+
+    mock_instance = MagicMock()
+    mock_instance.options = (_EXPIRY_45D, _EXPIRY_75D, _EXPIRY_180D)
+    mock_instance.option_chain.side_effect = chain_for
+    mock_ticker_class.return_value = mock_instance
+
+    result = analyze_options(_make_state())
+
+    assert result["options_error"] is None
+    expiries = [t["expiry"] for t in result["options_data"]["volatility_surface"]["term_structure"]]
+    assert expiries == [_EXPIRY_45D, _EXPIRY_75D]
+
+
+@patch("agent.graph.nodes.options_analyzer.SURFACE_EXPIRIES", 1)
+@patch("agent.graph.nodes.options_analyzer.yf.Ticker")
+def test_single_expiry_mode_skips_surface(mock_ticker_class):
+    mock_instance = MagicMock()
+    mock_instance.options = (_EXPIRY_45D, _EXPIRY_75D)
+    mock_instance.option_chain.return_value = _surface_chain(0.3)
+    mock_ticker_class.return_value = mock_instance
+
+    result = analyze_options(_make_state())
+
+    assert mock_instance.option_chain.call_count == 1
+    assert result["options_data"]["volatility_surface"] is None
@@ -1,7 +1,7 @@
 """
 Tests for Node 7: RAG Retriever (rag_retriever.py)
 
-Strategy: all external calls (Gemini, ChromaDB, SEC EDGAR, requests) are
+Strategy: all external calls (Gemini, ChromaDB, SEC EDGAR HTTP) are
 mocked so the test suite runs offline and deterministically.
 
 Test groups:
@@ -9,17 +9,29 @@ Test groups:
   2. Cache hit — ChromaDB already has chunks → return without EDGAR
   3. Cache miss → EDGAR discover → ingest → re-query
   4. EDGAR fallbacks (CIK not found, no filings in range)
-  5. Helpers: _strip_html, _chunk_text, _date_in_range
+  5. Helpers: _iter_text, _iter_section_chunks, _date_in_range
+  6–11. Embedding cache, vector-store handle, background queue, EDGAR
+        cache, retry/backoff, streaming extraction
+  12. Section-aware chunking (Item headings, data tables, boilerplate)
+  13. Period-filtered vector query and adaptive top-k
+  14. Hybrid BM25 + vector retrieval
+  15. Embedding backends (Gemini, local hashing)
+  16. Pipelined multi-filing ingestion
+  17. Content-hash deduplication
 """
 
+import json
 import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from unittest.mock import MagicMock, patch, PropertyMock
+import httpx
 import pytest
 
 from agent.graph.nodes.rag_retriever import (
     retrieve_rag_context,
-    _strip_html,
-    _chunk_text,
+    _iter_text,
+    _iter_section_chunks,
     _date_in_range,
     _discover_filings,
 )
@@ -54,33 +66,37 @@ def _make_chroma_query_result(docs=None, metas=None, distances=None):
 # Group 1: Early-exit guards
 # ---------------------------------------------------------------------------
 
-def test_no_ticker_returns_empty():
+@pytest.mark.asyncio
+async def test_no_ticker_returns_empty():
     state = {**BASE_STATE, "ticker": ""}
-    result = retrieve_rag_context(state)
+    result = await retrieve_rag_context(state)
     assert result["filing_chunks"] == []
     assert result["filing_ingested"] is False
     assert result["filing_error"] is None
 
 
-def test_no_start_date_returns_empty():
+@pytest.mark.asyncio
+async def test_no_start_date_returns_empty():
     state = {**BASE_STATE, "start_date": ""}
-    result = retrieve_rag_context(state)
+    result = await retrieve_rag_context(state)
     assert result["filing_chunks"] == []
     assert result["filing_error"] is None
 
 
-def test_no_end_date_returns_empty():
+@pytest.mark.asyncio
+async def test_no_end_date_returns_empty():
     state = {**BASE_STATE, "end_date": ""}
-    result = retrieve_rag_context(state)
+    result = await retrieve_rag_context(state)
     assert result["filing_chunks"] == []
 
 
-def test_missing_gcp_project_uses_fallback():
+@pytest.mark.asyncio
+async def test_missing_gcp_project_uses_fallback():
     """When GOOGLE_CLOUD_PROJECT is absent, the node returns early with a descriptive
     filing_error rather than attempting to embed or query ChromaDB."""
     env_without_key = {k: v for k, v in os.environ.items() if k != "GOOGLE_CLOUD_PROJECT"}
     with patch.dict(os.environ, env_without_key, clear=True):
-        result = retrieve_rag_context(BASE_STATE)
+        result = await retrieve_rag_context(BASE_STATE)
     assert result["filing_chunks"] == []
     assert result["filing_error"] == "GOOGLE_CLOUD_PROJECT not configured"
 
@@ -89,11 +105,12 @@ def test_missing_gcp_project_uses_fallback():
 # Group 2: Cache hit — ChromaDB already has chunks
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_cache_hit_returns_chunks_without_edgar(mock_embed_q, mock_get_col, mock_genai):
+async def test_cache_hit_returns_chunks_without_edgar(mock_embed_q, mock_get_col, mock_genai):
     mock_embed_q.return_value = [0.1] * 768
 
     mock_col = MagicMock()
@@ -105,7 +122,7 @@ def test_cache_hit_returns_chunks_without_edgar(mock_embed_q, mock_get_col, mock
     )
     mock_get_col.return_value = mock_col
 
-    result = retrieve_rag_context(BASE_STATE)
+    result = await retrieve_rag_context(BASE_STATE)
 
     assert len(result["filing_chunks"]) == 1
     assert result["filing_chunks"][0]["filing_type"] == "10-Q"
@@ -114,11 +131,12 @@ def test_cache_hit_returns_chunks_without_edgar(mock_embed_q, mock_get_col, mock
     assert result["filing_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_cache_hit_does_not_call_edgar(mock_embed_q, mock_get_col, mock_genai):
+async def test_cache_hit_does_not_call_edgar(mock_embed_q, mock_get_col, mock_genai):
     """When cache has results, EDGAR should not be called."""
     mock_embed_q.return_value = [0.1] * 768
 
@@ -132,7 +150,7 @@ def test_cache_hit_does_not_call_edgar(mock_embed_q, mock_get_col, mock_genai):
     mock_get_col.return_value = mock_col
 
     with patch("agent.graph.nodes.rag_retriever._get_cik") as mock_cik:
-        retrieve_rag_context(BASE_STATE)
+        await retrieve_rag_context(BASE_STATE)
         mock_cik.assert_not_called()
 
 
@@ -140,14 +158,16 @@ def test_cache_hit_does_not_call_edgar(mock_embed_q, mock_get_col, mock_genai):
 # Group 3: Cache miss → EDGAR discover → ingest → re-query
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch("agent.graph.nodes.rag_retriever._get_cik")
 @patch("agent.graph.nodes.rag_retriever._discover_filings")
-@patch("agent.graph.nodes.rag_retriever._ingest_filing")
+@patch("agent.graph.nodes.rag_retriever._ingest_filings")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 5)
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_cache_miss_triggers_ingestion(
+async def test_cache_miss_triggers_ingestion(
     mock_ingest, mock_discover, mock_cik, mock_embed_q, mock_get_col, mock_genai
 ):
     mock_embed_q.return_value = [0.1] * 768
@@ -172,7 +192,7 @@ def test_cache_miss_triggers_ingestion(
     )
     mock_get_col.return_value = mock_col
 
-    result = retrieve_rag_context(BASE_STATE)
+    result = await retrieve_rag_context(BASE_STATE)
 
     mock_ingest.assert_called_once()
     assert result["filing_ingested"] is True
@@ -180,13 +200,15 @@ def test_cache_miss_triggers_ingestion(
     assert result["filing_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch("agent.graph.nodes.rag_retriever._get_cik")
 @patch("agent.graph.nodes.rag_retriever._discover_filings")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 5)
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_ingest_sets_filing_ingested_true(
+async def test_ingest_sets_filing_ingested_true(
     mock_discover, mock_cik, mock_embed_q, mock_get_col, mock_genai
 ):
     mock_embed_q.return_value = [0.1] * 768
@@ -209,8 +231,8 @@ def test_ingest_sets_filing_ingested_true(
     ]
     mock_get_col.return_value = mock_col
 
-    with patch("agent.graph.nodes.rag_retriever._ingest_filing", return_value=10):
-        result = retrieve_rag_context(BASE_STATE)
+    with patch("agent.graph.nodes.rag_retriever._ingest_filings", return_value=10):
+        result = await retrieve_rag_context(BASE_STATE)
 
     assert result["filing_ingested"] is True
 
@@ -219,12 +241,14 @@ def test_ingest_sets_filing_ingested_true(
 # Group 4: EDGAR fallbacks
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch("agent.graph.nodes.rag_retriever._get_cik")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 5)
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_cik_not_found_returns_empty(mock_cik, mock_embed_q, mock_get_col, mock_genai):
+async def test_cik_not_found_returns_empty(mock_cik, mock_embed_q, mock_get_col, mock_genai):
     mock_embed_q.return_value = [0.1] * 768
     mock_cik.return_value = None
 
@@ -233,18 +257,20 @@ def test_cik_not_found_returns_empty(mock_cik, mock_embed_q, mock_get_col, mock_
     mock_col.query.return_value = _make_chroma_query_result()
     mock_get_col.return_value = mock_col
 
-    result = retrieve_rag_context(BASE_STATE)
+    result = await retrieve_rag_context(BASE_STATE)
     assert result["filing_chunks"] == []
     assert result["filing_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch("agent.graph.nodes.rag_retriever._embed_query")
 @patch("agent.graph.nodes.rag_retriever._get_cik")
 @patch("agent.graph.nodes.rag_retriever._discover_filings")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 5)
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_no_filings_in_range_returns_empty(
+async def test_no_filings_in_range_returns_empty(
     mock_discover, mock_cik, mock_embed_q, mock_get_col, mock_genai
 ):
     mock_embed_q.return_value = [0.1] * 768
@@ -256,18 +282,19 @@ def test_no_filings_in_range_returns_empty(
     mock_col.query.return_value = _make_chroma_query_result()
     mock_get_col.return_value = mock_col
 
-    result = retrieve_rag_context(BASE_STATE)
+    result = await retrieve_rag_context(BASE_STATE)
     assert result["filing_chunks"] == []
     assert result["filing_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.rag_retriever.genai")
 @patch("agent.graph.nodes.rag_retriever._get_collection")
 @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
-def test_exception_sets_filing_error(mock_get_col, mock_genai):
+async def test_exception_sets_filing_error(mock_get_col, mock_genai):
     """An unhandled exception inside the node should set filing_error."""
     mock_get_col.side_effect = RuntimeError("disk full")
-    result = retrieve_rag_context(BASE_STATE)
+    result = await retrieve_rag_context(BASE_STATE)
     assert result["filing_chunks"] == []
     assert "disk full" in result["filing_error"]
 
@@ -276,43 +303,43 @@ def test_exception_sets_filing_error(mock_get_col, mock_genai):
 # Group 5: Pure helper unit tests (no mocking needed)
 # ---------------------------------------------------------------------------
 
-def test_strip_html_removes_tags():
+def test_iter_text_removes_tags():
     html = "<h1>Revenue</h1><p>Grew <b>154%</b> YoY</p>"
-    text = _strip_html(html)
+    text = "".join(_iter_text([html]))
     assert "<" not in text
     assert "Revenue" in text
     assert "154%" in text
 
 
-def test_strip_html_collapses_whitespace():
+def test_iter_text_collapses_whitespace():
     html = "<p>hello   \n\t  world</p>"
-    text = _strip_html(html)
+    text = "".join(_iter_text([html]))
     assert "  " not in text
 
 
-def test_chunk_text_produces_correct_ids():
+def test_chunking_produces_correct_ids():
     text = "A" * 10000
-    chunks = _chunk_text(text, "NVDA", "10-Q", "2024Q2")
+    chunks = list(_iter_section_chunks([text], "NVDA", "10-Q", "2024Q2"))
     assert all(c["id"].startswith("NVDA-10-Q-2024Q2-chunk-") for c in chunks)
     # IDs should be sequential
     indices = [int(c["id"].split("-chunk-")[1]) for c in chunks]
     assert indices == list(range(len(indices)))
 
 
-def test_chunk_text_metadata():
+def test_chunking_metadata():
     text = "B" * 5000
-    chunks = _chunk_text(text, "AAPL", "10-K", "2023Q4")
+    chunks = list(_iter_section_chunks([text], "AAPL", "10-K", "2023Q4"))
     for c in chunks:
         assert c["metadata"]["ticker"] == "AAPL"
         assert c["metadata"]["filing_type"] == "10-K"
         assert c["metadata"]["filing_period"] == "2023Q4"
 
 
-def test_chunk_text_overlap():
+def test_chunking_overlap():
     """Chunks overlap by _OVERLAP_CHARS so consecutive chunks share content."""
     from agent.graph.nodes.rag_retriever import _CHUNK_CHARS, _OVERLAP_CHARS
     text = "X" * (_CHUNK_CHARS + _OVERLAP_CHARS + 100)
-    chunks = _chunk_text(text, "T", "10-Q", "2024Q1")
+    chunks = list(_iter_section_chunks([text], "T", "10-Q", "2024Q1"))
     assert len(chunks) >= 2
     # Second chunk starts before first chunk ends
     first_end = _CHUNK_CHARS
@@ -402,27 +429,32 @@ def test_discover_filings_respects_date_range():
     assert results[0]["period"] == "2024Q3"
 
 
-def test_chunk_text_empty_text():
-    chunks = _chunk_text("", "NVDA", "10-Q", "2024Q2")
+def test_chunking_empty_text():
+    chunks = list(_iter_section_chunks([""], "NVDA", "10-Q", "2024Q2"))
     assert chunks == []
 
 
-def test_returns_only_owned_fields():
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever.submit_ingestion")
+async def test_returns_only_owned_fields(mock_submit, mock_get_col):
     """
     After the parallel fan-out fix, retrieve_rag_context must return only
-    its three owned fields. It must NOT spread {**state} back — doing so
+    its owned fields. It must NOT spread {**state} back — doing so
     causes InvalidUpdateError when LangGraph merges parallel branches.
     """
+    mock_get_col.return_value.count.return_value = 0
+    mock_submit.return_value.result.side_effect = FutureTimeoutError
     state = {**BASE_STATE, "extra_field_that_should_not_leak": "sentinel"}
-    result = retrieve_rag_context(state)
-    # Only these three keys are allowed in the return dict
-    assert set(result.keys()) == {"filing_chunks", "filing_ingested", "filing_error"}
+    result = await retrieve_rag_context(state)
+    # Only Node 7's keys are allowed in the return dict
+    assert set(result.keys()) <= {"filing_chunks", "filing_ingested", "filing_ingestion_pending", "filing_error"}
     assert "extra_field_that_should_not_leak" not in result
     assert "user_message" not in result
     assert "ticker" not in result
 
 
-def test_strip_html_removes_style_and_script():
+def test_iter_text_removes_style_and_script():
     html = """
     <html><head><style>body { margin: 0; }</style>
     <script>alert('test');</script></head>
@@ -430,14 +462,1099 @@ def test_strip_html_removes_style_and_script():
     <table><tr><td>Net income</td><td>$18.8B</td></tr></table>
     </body></html>
     """
-    result = _strip_html(html)
+    result = "".join(_iter_text([html]))
     assert "margin" not in result
     assert "alert" not in result
     assert "Revenue" in result
     assert "Net income" in result
 
 
-def test_strip_html_minimum_length():
+def test_iter_text_minimum_length():
     html = "<html><body>" + "<p>This is important financial information. " * 100 + "</p></body></html>"
-    result = _strip_html(html)
+    result = "".join(_iter_text([html]))
     assert len(result) > 500
+
+
+# ---------------------------------------------------------------------------
+# Group 6: Query embedding cache
+# ---------------------------------------------------------------------------
+
+def _embed_response(vector):
+    return MagicMock(embeddings=[MagicMock(values=vector)])
+
+
+@patch("agent.graph.nodes.rag_retriever.genai")
+def test_embed_query_cached_across_phrasing_whitespace_and_case(mock_genai):
+    from agent.graph.nodes.rag_retriever import _embed_query
+
+    mock_client = mock_genai.Client.return_value
+    mock_client.models.embed_content.return_value = _embed_response([0.1, 0.2, 0.3])
+
+    first = _embed_query("NVDA data center revenue")
+    second = _embed_query("  nvda   Data Center revenue ")
+
+    assert first == second == [0.1, 0.2, 0.3]
+    mock_client.models.embed_content.assert_called_once()
+    # One shared client, not one per call.
+    mock_genai.Client.assert_called_once()
+
+
+@patch("agent.graph.nodes.rag_retriever.genai")
+def test_embed_query_different_text_misses(mock_genai):
+    from agent.graph.nodes.rag_retriever import _embed_query
+
+    mock_client = mock_genai.Client.return_value
+    mock_client.models.embed_content.side_effect = [_embed_response([1.0]), _embed_response([2.0])]
+
+    assert _embed_query("NVDA revenue") == [1.0]
+    assert _embed_query("NVDA risk factors") == [2.0]
+    assert mock_client.models.embed_content.call_count == 2
+
+
+def test_embedding_cache_survives_restart_via_disk(tmp_path):
+    from agent.graph.nodes.rag_retriever import _EmbeddingCache
+
+    path = str(tmp_path / "emb.sqlite3")
+    vector = [0.123456789012345, -1e-9, 3.0]
+    _EmbeddingCache(path).put("m", "RETRIEVAL_QUERY", "What about margins?", vector)
+
+    reopened = _EmbeddingCache(path)
+    assert reopened.get("m", "RETRIEVAL_QUERY", "what about  margins?") == vector
+    assert reopened.get("m", "RETRIEVAL_DOCUMENT", "What about margins?") is None
+    assert reopened.get("other-model", "RETRIEVAL_QUERY", "What about margins?") is None
+
+
+def test_embedding_cache_lru_evicts_oldest():
+    from agent.graph.nodes.rag_retriever import _EmbeddingCache
+
+    cache = _EmbeddingCache(":memory:", max_entries=2)
+    cache.put("m", "q", "a", [1.0])
+    cache.put("m", "q", "b", [2.0])
+    cache.get("m", "q", "a")           # a is now most recent
+    cache.put("m", "q", "c", [3.0])
+
+    assert list(k[2] for k in cache._lru) == ["a", "c"]
+    # Evicted from memory but still on disk.
+    assert cache.get("m", "q", "b") == [2.0]
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever.genai")
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever._get_cik", return_value="0001045810")
+@patch("agent.graph.nodes.rag_retriever._discover_filings")
+@patch("agent.graph.nodes.rag_retriever._ingest_filings", return_value=5)
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 5)
+@patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
+async def test_requery_after_ingestion_reuses_query_vector(
+    mock_ingest, mock_discover, mock_cik, mock_get_col, mock_genai
+):
+    mock_client = mock_genai.Client.return_value
+    mock_client.models.embed_content.return_value = _embed_response([0.5] * 8)
+
+    mock_col = MagicMock()
+    mock_col.count.return_value = 10
+    mock_col.query.return_value = _make_chroma_query_result()
+    mock_get_col.return_value = mock_col
+    mock_discover.return_value = [{"period": "2024Q2"}]
+
+    await retrieve_rag_context(BASE_STATE)
+
+    assert mock_col.query.call_count == 2
+    mock_client.models.embed_content.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Group 7: Shared vector-store handle
+# ---------------------------------------------------------------------------
+
+@patch("agent.graph.nodes.rag_retriever.chromadb")
+def test_get_collection_opens_client_once_across_threads(mock_chromadb):
+    from concurrent.futures import ThreadPoolExecutor
+    from agent.graph.nodes.rag_retriever import _get_collection
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        handles = list(pool.map(lambda _: _get_collection(), range(16)))
+
+    mock_chromadb.PersistentClient.assert_called_once()
+    assert all(h is handles[0] for h in handles)
+
+
+def test_warm_up_loads_index_with_stored_vector(tmp_path):
+    import chromadb
+    from agent.graph.nodes import rag_retriever
+
+    with patch.object(rag_retriever, "CHROMA_PERSIST_DIR", str(tmp_path)):
+        col = rag_retriever._get_collection()
+        col.add(ids=["a", "b"], embeddings=[[1.0, 0.0], [0.0, 1.0]], documents=["x", "y"])
+
+        with patch.object(chromadb.Collection, "query", autospec=True) as mock_query:
+            rag_retriever.warm_up_vector_store()
+
+    mock_query.assert_called_once()
+    assert mock_query.call_args.kwargs["n_results"] == 1
+
+
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+def test_warm_up_skips_empty_collection(mock_get_col):
+    from agent.graph.nodes.rag_retriever import warm_up_vector_store
+
+    mock_get_col.return_value.get.return_value = {"ids": [], "embeddings": []}
+    warm_up_vector_store()
+    mock_get_col.return_value.query.assert_not_called()
+
+
+@patch("agent.graph.nodes.rag_retriever._get_collection", side_effect=RuntimeError("disk locked"))
+def test_warm_up_failure_is_logged_not_raised(mock_get_col):
+    from agent.graph.nodes.rag_retriever import warm_up_vector_store
+
+    warm_up_vector_store()
+
+
+# ---------------------------------------------------------------------------
+# Group 8: Background ingestion queue
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 8)
+@patch("agent.graph.nodes.rag_retriever._get_cik", return_value="0001045810")
+@patch("agent.graph.nodes.rag_retriever._discover_filings", return_value=[{"period": "2024Q2"}])
+@patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
+async def test_cache_miss_answers_immediately_with_ingestion_pending(
+    mock_discover, mock_cik, mock_embed_q, mock_get_col
+):
+    from agent.graph.nodes import rag_retriever
+
+    release = threading.Event()
+
+    def slow_ingest(collection, filings, ticker):
+        release.wait(5)
+        return 7
+
+    mock_col = MagicMock()
+    mock_col.count.return_value = 0
+    mock_get_col.return_value = mock_col
+
+    with patch("agent.graph.nodes.rag_retriever._ingest_filings", side_effect=slow_ingest):
+        result = await retrieve_rag_context(BASE_STATE)
+
+        assert result == {
+            "filing_chunks": [],
+            "filing_ingested": False,
+            "filing_ingestion_pending": True,
+            "filing_error": None,
+        }
+        assert rag_retriever.ingestion_pending("nvda")
+
+        job = rag_retriever.submit_ingestion("NVDA", BASE_STATE["start_date"], BASE_STATE["end_date"])
+        release.set()
+        assert job.result(timeout=5) == 7
+
+    assert not rag_retriever.ingestion_pending("NVDA")
+
+
+def test_submit_ingestion_shares_in_flight_job():
+    from agent.graph.nodes import rag_retriever
+
+    release = threading.Event()
+    with patch("agent.graph.nodes.rag_retriever.ingest_ticker", side_effect=lambda *a: release.wait(5) and 3):
+        first = rag_retriever.submit_ingestion("nvda", "2024-06-01", "2024-07-31")
+        second = rag_retriever.submit_ingestion("NVDA", "2024-06-01", "2024-07-31")
+        other = rag_retriever.submit_ingestion("NVDA", "2024-01-01", "2024-03-31")
+        release.set()
+        assert first is second
+        assert other is not first
+        assert first.result(timeout=5) == 3
+        other.result(timeout=5)
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 768)
+async def test_cache_hit_flags_pending_while_another_job_for_ticker_runs(mock_embed_q, mock_get_col):
+    from agent.graph.nodes import rag_retriever
+
+    mock_col = MagicMock()
+    mock_col.count.return_value = 10
+    mock_col.query.return_value = _make_chroma_query_result(
+        docs=["Data center revenue grew 154% YoY..."],
+        metas=[{"filing_type": "10-Q", "filing_period": "2024Q2"}],
+        distances=[0.12],
+    )
+    mock_get_col.return_value = mock_col
+
+    release = threading.Event()
+    with patch("agent.graph.nodes.rag_retriever.ingest_ticker", side_effect=lambda *a: release.wait(5) and 3):
+        other = rag_retriever.submit_ingestion("NVDA", "2023-01-01", "2023-12-31")
+        result = await retrieve_rag_context(BASE_STATE)
+        release.set()
+        other.result(timeout=5)
+
+    assert len(result["filing_chunks"]) == 1
+    assert result["filing_ingestion_pending"] is True
+    assert (await retrieve_rag_context(BASE_STATE))["filing_ingestion_pending"] is False
+
+
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever._get_cik", return_value="0001045810")
+@patch("agent.graph.nodes.rag_retriever._discover_filings")
+@patch("agent.graph.nodes.rag_retriever._ingest_filings", return_value=4)
+def test_ingest_ticker_ingests_all_filings_in_one_pipeline(mock_ingest, mock_discover, mock_cik, mock_get_col):
+    from agent.graph.nodes.rag_retriever import ingest_ticker
+
+    filings = [{"period": "2024Q1"}, {"period": "2024Q2"}]
+    mock_discover.return_value = filings
+    assert ingest_ticker("NVDA", "2024-01-01", "2024-07-31") == 4
+    mock_ingest.assert_called_once_with(mock_get_col.return_value, filings, "NVDA")
+
+
+# ---------------------------------------------------------------------------
+# Group 9: EDGAR CIK map and submissions cache
+# ---------------------------------------------------------------------------
+
+_TICKERS_JSON = {
+    "0": {"cik_str": 1045810, "ticker": "NVDA", "title": "NVIDIA CORP"},
+    "1": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"},
+}
+
+
+def _json_response(payload, status=200, headers=None):
+    resp = MagicMock(status_code=status, headers=headers or {})
+    resp.json.return_value = payload
+    return resp
+
+
+def test_get_cik_downloads_map_once_then_looks_up_locally():
+    from agent.graph.nodes.rag_retriever import _get_cik
+
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=_json_response(_TICKERS_JSON)) as mock_get:
+        assert _get_cik("nvda") == "0001045810"
+        assert _get_cik("BRK.B") == "0001067983"
+        assert _get_cik("ZZZZ") is None
+
+    mock_get.assert_called_once()
+
+
+def test_get_cik_refreshes_after_ttl_and_falls_back_to_stale_map():
+    from agent.graph.nodes import rag_retriever
+
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=_json_response(_TICKERS_JSON)):
+        rag_retriever._get_cik("NVDA")
+
+    rag_retriever._edgar_cache.cik_map_fetched_at -= rag_retriever.CIK_MAP_TTL_SECONDS + 1
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=None) as mock_get:
+        assert rag_retriever._get_cik("NVDA") == "0001045810"
+    mock_get.assert_called_once()
+
+
+def test_cik_map_survives_restart(tmp_path):
+    from agent.graph.nodes import rag_retriever
+
+    path = str(tmp_path / "edgar.sqlite3")
+    with patch.object(rag_retriever, "_edgar_cache", rag_retriever._EdgarCache(path)):
+        with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=_json_response(_TICKERS_JSON)):
+            rag_retriever._get_cik("NVDA")
+
+    with patch.object(rag_retriever, "_edgar_cache", rag_retriever._EdgarCache(path)):
+        with patch("agent.graph.nodes.rag_retriever._edgar_get") as mock_get:
+            assert rag_retriever._get_cik("NVDA") == "0001045810"
+        mock_get.assert_not_called()
+
+
+def test_submissions_served_fresh_then_revalidated_with_validators():
+    from agent.graph.nodes import rag_retriever
+
+    body = {"filings": {"recent": {"form": ["10-Q"]}}}
+    first = _json_response(body, headers={"ETag": '"abc"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"})
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=first) as mock_get:
+        assert rag_retriever._get_submissions("0001045810") == body
+        assert rag_retriever._get_submissions("0001045810") == body
+    mock_get.assert_called_once()
+
+    # Age the entry past the freshness window → conditional GET, 304 keeps it.
+    rag_retriever._edgar_cache.touch_submissions("0001045810", 0.0)
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=_json_response(None, status=304)) as mock_get:
+        assert rag_retriever._get_submissions("0001045810") == body
+
+    headers = mock_get.call_args.kwargs["headers"]
+    assert headers == {"If-None-Match": '"abc"', "If-Modified-Since": "Tue, 01 Oct 2024 00:00:00 GMT"}
+    assert rag_retriever._edgar_cache.get_submissions("0001045810")[3] > 0.0
+
+
+def test_submissions_replaced_on_200_and_stale_copy_used_when_edgar_down():
+    from agent.graph.nodes import rag_retriever
+
+    old = {"filings": {"recent": {"form": ["10-K"]}}}
+    new = {"filings": {"recent": {"form": ["10-K", "10-Q"]}}}
+    rag_retriever._edgar_cache.store_submissions("0001045810", json.dumps(old), '"v1"', None, 0.0)
+
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=_json_response(new, headers={"ETag": '"v2"'})):
+        assert rag_retriever._get_submissions("0001045810") == new
+    assert rag_retriever._edgar_cache.get_submissions("0001045810")[1] == '"v2"'
+
+    rag_retriever._edgar_cache.touch_submissions("0001045810", 0.0)
+    with patch("agent.graph.nodes.rag_retriever._edgar_get", return_value=None):
+        assert rag_retriever._get_submissions("0001045810") == new
+
+
+# ---------------------------------------------------------------------------
+# Group 10: EDGAR retry/backoff
+# ---------------------------------------------------------------------------
+
+def _http_response(status, headers=None):
+    import httpx
+    return httpx.Response(status, headers=headers or {}, request=httpx.Request("GET", "https://data.sec.gov/x"))
+
+
+@patch("agent.graph.nodes.rag_retriever.time.sleep")
+@patch("agent.graph.nodes.rag_retriever.sync_get")
+def test_edgar_get_retries_429_then_succeeds(mock_get, mock_sleep):
+    from agent.graph.nodes.rag_retriever import _edgar_get
+
+    mock_get.side_effect = [_http_response(429, {"Retry-After": "2"}), _http_response(503), _http_response(200)]
+
+    resp = _edgar_get("https://data.sec.gov/x")
+
+    assert resp.status_code == 200
+    assert mock_get.call_count == 3
+    first_wait, second_wait = (c.args[0] for c in mock_sleep.call_args_list)
+    assert first_wait == 2.0                 # Retry-After honoured
+    assert 2.0 <= second_wait <= 3.0         # backoff for attempt 1: 2s + jitter
+
+
+@patch("agent.graph.nodes.rag_retriever.time.sleep")
+@patch("agent.graph.nodes.rag_retriever.sync_get")
+def test_edgar_get_gives_up_after_max_retries(mock_get, mock_sleep):
+    from agent.graph.nodes.rag_retriever import _EDGAR_MAX_RETRIES, _edgar_get
+
+    mock_get.return_value = _http_response(503)
+
+    assert _edgar_get("https://data.sec.gov/x") is None
+    assert mock_get.call_count == _EDGAR_MAX_RETRIES + 1
+    assert mock_sleep.call_count == _EDGAR_MAX_RETRIES
+
+
+@patch("agent.graph.nodes.rag_retriever.time.sleep")
+@patch("agent.graph.nodes.rag_retriever.sync_get")
+def test_edgar_get_success_does_not_sleep(mock_get, mock_sleep):
+    from agent.graph.nodes.rag_retriever import _edgar_get
+
+    mock_get.return_value = _http_response(200)
+    assert _edgar_get("https://data.sec.gov/x").status_code == 200
+    mock_get.return_value = _http_response(404)
+    assert _edgar_get("https://data.sec.gov/x") is None
+    mock_sleep.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Group 11: Streaming extraction and chunking
+# ---------------------------------------------------------------------------
+
+_FILING_HTML = (
+    "<html><head><style>p { color: red }</style><script>var x = 1;</script></head><body>"
+    "<!-- cover page --><p>NVIDIA&nbsp;Corporation</p>"
+    "<ix:nonFraction name='us-gaap:Revenues'>26,044</ix:nonFraction> million &amp; "
+    "<b>data</b>center   revenue\n\n grew <i>154%</i>.<br/>Risk&#160;factors "
+    + "<div>Supply constraints may limit growth in fiscal 2025.</div>\n" * 40
+    + "</body></html>"
+)
+
+
+def _split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("piece_size", [1, 2, 3, 7, 16, 64, 1000])
+def test_streamed_text_matches_one_shot_extraction(piece_size):
+    from agent.graph.nodes.rag_retriever import _iter_text
+
+    streamed = "".join(_iter_text(_split(_FILING_HTML, piece_size)))
+    assert streamed == "".join(_iter_text([_FILING_HTML]))
+    assert "var x" not in streamed and "color" not in streamed
+    assert "NVIDIA\xa0Corporation" not in streamed   # nbsp collapsed like any whitespace
+
+
+@pytest.mark.parametrize("piece_size", [1, 5, 399, 400, 2000, 2400, 2401, 10_000])
+def test_streamed_chunks_match_one_shot_chunking(piece_size):
+    from agent.graph.nodes.rag_retriever import _iter_chunks
+
+    text = " ".join(f"word{i}" for i in range(3000))
+    streamed = list(_iter_chunks(_split(text, piece_size), "NVDA", "10-K", "2024Q4"))
+    assert streamed == list(_iter_chunks([text], "NVDA", "10-K", "2024Q4"))
+
+
+def test_streaming_pipeline_memory_is_bounded():
+    """A multi-MB filing goes through extraction + chunking without being held in memory."""
+    import tracemalloc
+    from agent.graph.nodes.rag_retriever import _iter_chunks, _iter_text
+
+    unit = (
+        "<ix:nonFraction name='us-gaap:Revenue' contextRef='c1' decimals='-6'>26,044</ix:nonFraction>"
+        "<p style='font-size:10pt'>Data center revenue grew &amp; margins expanded.</p>\n"
+    )
+    piece = unit * 400
+    n_pieces = 40                                   # ≈ 2 MB of HTML
+
+    tracemalloc.start()
+    try:
+        n_chunks = sum(1 for _ in _iter_chunks(_iter_text(piece for _ in range(n_pieces)), "N", "10-K", "2024Q4"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert n_chunks > 100
+    assert peak < len(piece) * n_pieces / 2
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=lambda texts: [[0.0]] * len(texts))
+def test_ingest_filing_stores_chunks_in_bounded_batches(mock_embed):
+    from agent.graph.nodes.rag_retriever import _INGEST_BATCH_CHUNKS, _ingest_filings
+
+    text = " ".join(f"word{i}" for i in range(60_000))
+    mock_col = MagicMock()
+    mock_col.get.return_value = {"ids": []}
+    filing = {"cik": "0001045810", "accession_number": "000104581024000123",
+              "primary_doc": "nvda.htm", "filing_type": "10-K", "period": "2024Q4"}
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", return_value=iter(_split(text, 5000))):
+        stored = _ingest_filings(mock_col, [filing], "NVDA")
+
+    assert stored == len(list(_iter_section_chunks([text], "NVDA", "10-K", "2024Q4")))
+    batch_sizes = [len(c.kwargs["ids"]) for c in mock_col.add.call_args_list]
+    assert max(batch_sizes) == _INGEST_BATCH_CHUNKS
+    assert sum(batch_sizes) == stored
+
+
+def test_ingest_filing_skips_too_short_text():
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    mock_col = MagicMock()
+    filing = {"cik": "1", "accession_number": "a", "primary_doc": "d.htm", "filing_type": "10-Q", "period": "2024Q1"}
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", return_value=iter(["Page not found"])):
+        assert _ingest_filings(mock_col, [filing], "NVDA") == 0
+    mock_col.add.assert_not_called()
+
+
+@patch("agent.graph.nodes.rag_retriever.time.sleep")
+def test_edgar_stream_text_retries_then_streams_body(mock_sleep):
+    import httpx
+    from agent.graph.nodes.rag_retriever import _edgar_stream_text
+
+    statuses = iter([503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, text="<p>10-K body</p>" if status == 200 else "busy")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with patch("agent.graph.nodes.http_client.get_sync_client", return_value=client):
+        text = "".join(_edgar_stream_text("https://www.sec.gov/Archives/edgar/data/1/a/d.htm"))
+
+    assert text == "<p>10-K body</p>"
+    mock_sleep.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Group 12: Section-aware chunking
+# ---------------------------------------------------------------------------
+
+_NARRATIVE = " ".join("Supply constraints may limit data center growth." for _ in range(120))
+
+_10K_HTML = (
+    "<html><body><div>UNITED STATES SECURITIES AND EXCHANGE COMMISSION FORM 10-K "
+    "Indicate by check mark whether the registrant is a well-known seasoned issuer.</div>"
+    "<table><tr><td>Item 1.</td><td>Business</td><td>4</td></tr>"
+    "<tr><td>Item 1A.</td><td>Risk Factors</td><td>12</td></tr></table>"
+    "<p>PART I</p><p>Item 1. Business</p><p>" + _NARRATIVE + "</p>"
+    "<p>Table of Contents</p><p>Item 1A. Risk Factors</p><p>" + _NARRATIVE + "</p>"
+    "<table><tr><td>Revenue</td><td><ix:nonFraction name='us-gaap:Revenues'>26,044</ix:nonFraction></td></tr></table>"
+    "<p>Item 1B. Unresolved Staff Comments</p><p>" + _NARRATIVE + "</p>"
+    "<p>Item 2. Properties</p><p>None.</p>"
+    "<p>ITEM 7. MANAGEMENT'S DISCUSSION AND ANALYSIS</p><p>" + _NARRATIVE + "</p>"
+    "<table><tr><td>Fiscal 2024</td><td>$ 60,922</td><td>$ 26,974</td></tr></table>"
+    "<p>SIGNATURES</p><p>Pursuant to the requirements of Section 13 " + _NARRATIVE + "</p>"
+    "</body></html>"
+)
+
+
+def _section_chunks(html, filing_type="10-K", piece_size=None):
+    from agent.graph.nodes.rag_retriever import _iter_section_chunks, _iter_text
+
+    pieces = _split(html, piece_size) if piece_size else [html]
+    return list(_iter_section_chunks(_iter_text(pieces), "NVDA", filing_type, "2024Q4"))
+
+
+def test_iter_text_drops_data_tables_keeps_narrative_tables():
+    html = (
+        "<table><tr><td>Revenue</td><td><ix:nonFraction>26,044</ix:nonFraction></td></tr></table>"
+        "<table><tr><td>2024</td><td>$ 60,922</td><td>$ 26,974</td></tr></table>"
+        "<table><tr><td>Item 7.</td><td>Management's Discussion and Analysis</td></tr></table>"
+        "<ix:header><ix:hidden>us-gaap:FiscalYearFocus 2024</ix:hidden></ix:header>"
+    )
+    text = "".join(_iter_text([html]))
+    assert "26,044" not in text and "60,922" not in text and "FiscalYearFocus" not in text
+    assert text == "Item 7. Management's Discussion and Analysis"
+
+
+def test_section_chunks_follow_item_headings():
+    chunks = _section_chunks(_10K_HTML)
+
+    sections = list(dict.fromkeys(c["metadata"]["section"] for c in chunks))
+    assert sections == ["Business", "Risk Factors", "Management's Discussion and Analysis"]
+    assert chunks[0]["id"] == "NVDA-10-K-2024Q4-item1-chunk-000"
+    assert {c["metadata"]["section_item"] for c in chunks} == {"1", "1A", "7"}
+    assert len({c["id"] for c in chunks}) == len(chunks)
+
+
+def test_section_chunks_drop_cover_tables_and_boilerplate():
+    text = " ".join(c["text"] for c in _section_chunks(_10K_HTML))
+
+    assert "check mark" not in text                   # cover page
+    assert "Table of Contents" not in text            # page header
+    assert "26,044" not in text and "60,922" not in text
+    assert "Unresolved Staff Comments" not in text    # boilerplate Item 1B
+    assert "Properties" not in text                   # "None." stub
+    assert "Pursuant to the requirements" not in text
+
+
+def test_section_chunks_never_straddle_items():
+    for chunk in _section_chunks(_10K_HTML):
+        if chunk["metadata"]["section_item"] != "1A":
+            assert "Item 1A" not in chunk["text"]
+
+
+def test_10q_items_resolve_by_part():
+    html = (
+        "<p>PART I — FINANCIAL INFORMATION</p><p>Item 2. Management's Discussion</p><p>" + _NARRATIVE + "</p>"
+        "<p>PART II — OTHER INFORMATION</p><p>Item 1A. Risk Factors</p><p>" + _NARRATIVE + "</p>"
+    )
+    chunks = _section_chunks(html, filing_type="10-Q")
+
+    assert {(c["metadata"]["section"], c["id"].rsplit("-chunk", 1)[0]) for c in chunks} == {
+        ("Management's Discussion and Analysis", "NVDA-10-Q-2024Q4-part1-item2"),
+        ("Risk Factors", "NVDA-10-Q-2024Q4-part2-item1a"),
+    }
+
+
+def test_cross_references_are_not_headings():
+    html = "<p>Item 1A. Risk Factors</p><p>" + _NARRATIVE + " as discussed in Part II, Item 7, \"MD&amp;A\" and see Item 7 of this report. " + _NARRATIVE + "</p>"
+    assert {c["metadata"]["section_item"] for c in _section_chunks(html)} == {"1A"}
+
+
+@pytest.mark.parametrize("piece_size", [1, 7, 150, 4096])
+def test_section_chunks_independent_of_piece_size(piece_size):
+    assert _section_chunks(_10K_HTML, piece_size=piece_size) == _section_chunks(_10K_HTML)
+
+
+def test_filing_without_headings_chunks_like_before():
+    from agent.graph.nodes.rag_retriever import _iter_chunks
+
+    text = " ".join(f"word{i}" for i in range(3000))
+    assert list(_iter_section_chunks(_split(text, 500), "NVDA", "10-K", "2024Q4")) == list(_iter_chunks([text], "NVDA", "10-K", "2024Q4"))
+
+
+# ---------------------------------------------------------------------------
+# Group 13: Period-filtered vector query and adaptive top-k
+# ---------------------------------------------------------------------------
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[1.0, 0.0])
+def test_period_filter_is_pushed_into_vector_query(mock_embed_q, tmp_path):
+    """Many close matches from old quarters must not crowd out the in-range chunk."""
+    from agent.graph.nodes import rag_retriever
+
+    with patch.object(rag_retriever, "CHROMA_PERSIST_DIR", str(tmp_path)):
+        col = rag_retriever._get_collection()
+        col.add(
+            ids=[f"old-{i}" for i in range(30)] + ["new"],
+            embeddings=[[1.0, 0.01 * i] for i in range(30)] + [[1.0, 0.5]],
+            documents=[f"old {i}" for i in range(30)] + ["new"],
+            metadatas=[{"ticker": "NVDA", "filing_period": "2022Q1"}] * 30
+            + [{"ticker": "NVDA", "filing_period": "2026Q1"}],
+        )
+        chunks = rag_retriever._query_collection(col, "NVDA", "q", filing_periods=["2025Q4", "2026Q1"])
+
+    assert [c["text"] for c in chunks] == ["new"]
+    assert chunks[0]["filing_quarter"] == "2026Q1"
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 768)
+def test_query_where_clause_combines_ticker_and_periods(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    mock_col = MagicMock()
+    mock_col.count.return_value = 100
+    mock_col.query.return_value = _make_chroma_query_result()
+
+    _query_collection(mock_col, "NVDA", "q", filing_periods=["2024Q1", "2024Q2"])
+    assert mock_col.query.call_args.kwargs["where"] == {
+        "$and": [{"ticker": "NVDA"}, {"filing_period": {"$in": ["2024Q1", "2024Q2"]}}]
+    }
+
+    _query_collection(mock_col, "NVDA", "q")
+    assert mock_col.query.call_args.kwargs["where"] == {"ticker": "NVDA"}
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 768)
+def test_adaptive_top_k_extends_only_with_near_best_matches(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _MAX_TOP_K, _TOP_K, _query_collection
+
+    def run(distances):
+        mock_col = MagicMock()
+        mock_col.count.return_value = 100
+        n = len(distances)
+        mock_col.query.return_value = _make_chroma_query_result(
+            docs=[f"d{i}" for i in range(n)], metas=[{"filing_period": "2024Q2"}] * n, distances=distances,
+        )
+        return _query_collection(mock_col, "NVDA", "q")
+
+    # Ten near-equal matches → extended past _TOP_K, capped at _MAX_TOP_K.
+    assert len(run([0.10 + 0.001 * i for i in range(10)])) == _MAX_TOP_K
+    # One strong match, the rest well below it → the usual _TOP_K.
+    assert len(run([0.05] + [0.30 + 0.001 * i for i in range(9)])) == _TOP_K
+    # Below-threshold candidates are still dropped.
+    assert run([0.10, 0.60, 0.70]) == run([0.10])
+
+
+# ---------------------------------------------------------------------------
+# Group 14: Hybrid BM25 + vector retrieval
+# ---------------------------------------------------------------------------
+
+def _index_chunks(*texts, period="2024Q2"):
+    from agent.graph.nodes import rag_retriever
+
+    rag_retriever._bm25_index.add([
+        {"id": f"k{i}", "text": t, "metadata": {"ticker": "NVDA", "filing_type": "10-Q", "filing_period": period}}
+        for i, t in enumerate(texts)
+    ])
+
+
+def _vector_collection(ids, docs, distances):
+    mock_col = MagicMock()
+    mock_col.count.return_value = 100
+    mock_col.query.return_value = {
+        "ids": [ids], "documents": [docs], "distances": [distances],
+        "metadatas": [[{"filing_type": "10-Q", "filing_period": "2024Q2"}] * len(docs)],
+    }
+    return mock_col
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 768)
+def test_hybrid_fuses_keyword_and_vector_rankings(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    _index_chunks("Gross margin guidance is 75 percent.", "Unrelated text about buybacks.")
+    mock_col = _vector_collection(["v0", "k0"], ["Data center demand is strong.", "Gross margin guidance is 75 percent."], [0.10, 0.20])
+
+    chunks = _query_collection(mock_col, "NVDA", "gross margin guidance", ["2024Q2"])
+
+    # k0 is ranked by both retrievers, so it comes first and keeps its cosine score.
+    assert [c["text"] for c in chunks] == ["Gross margin guidance is 75 percent.", "Data center demand is strong."]
+    assert chunks[0]["chunk_relevance_score"] == 0.8
+    assert chunks[0]["chunk_score_type"] == "similarity"
+    assert "id" not in chunks[0]
+
+
+@patch("agent.graph.nodes.rag_retriever.EMBED_QUERY_TIMEOUT_SECONDS", 0.05)
+@patch("agent.graph.nodes.rag_retriever._embed_query")
+def test_hybrid_falls_back_to_bm25_when_embedding_is_slow(mock_embed_q):
+    import time
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    mock_embed_q.side_effect = lambda text: time.sleep(0.5) or [0.1] * 768
+    _index_chunks("Export controls restrict shipments to China.")
+    mock_col = _vector_collection([], [], [])
+
+    chunks = _query_collection(mock_col, "NVDA", "export controls China", ["2024Q2"])
+
+    assert [c["text"] for c in chunks] == ["Export controls restrict shipments to China."]
+    assert chunks[0]["chunk_relevance_score"] == 1.0
+    assert chunks[0]["chunk_score_type"] == "keyword"
+    mock_col.query.assert_not_called()
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", side_effect=RuntimeError("Vertex AI unavailable"))
+def test_hybrid_falls_back_to_bm25_when_embedding_fails(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    _index_chunks("Export controls restrict shipments to China.")
+    chunks = _query_collection(_vector_collection([], [], []), "NVDA", "export controls", None)
+    assert len(chunks) == 1
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_query", side_effect=RuntimeError("Vertex AI unavailable"))
+def test_embedding_failure_without_keyword_hits_still_raises(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    with pytest.raises(RuntimeError):
+        _query_collection(_vector_collection([], [], []), "NVDA", "export controls", None)
+
+
+@patch("agent.graph.nodes.rag_retriever.RETRIEVAL_MODE", "bm25")
+@patch("agent.graph.nodes.rag_retriever._embed_query")
+def test_bm25_mode_makes_no_embedding_call(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    _index_chunks("Gross margin guidance is 75 percent.", period="2024Q2")
+    _index_chunks("Gross margin guidance was 65 percent.", period="2021Q1")
+    mock_col = MagicMock()
+
+    chunks = _query_collection(mock_col, "NVDA", "gross margin guidance", ["2024Q2"])
+
+    assert [c["filing_quarter"] for c in chunks] == ["2024Q2"]
+    mock_embed_q.assert_not_called()
+    mock_col.query.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever._embed_query", side_effect=RuntimeError("Vertex AI unavailable"))
+@patch("agent.graph.nodes.rag_retriever._get_collection")
+@patch("agent.graph.nodes.rag_retriever.submit_ingestion")
+async def test_keyword_hits_without_vectors_still_queue_ingestion(mock_submit, mock_get_col, mock_embed_q):
+    """A BM25 index left over from another collection is not a cache hit."""
+    _index_chunks("Data center revenue grew on Hopper demand.")
+    mock_get_col.return_value.get.return_value = {"ids": []}     # empty vector collection
+    mock_submit.return_value.result.side_effect = FutureTimeoutError
+
+    result = await retrieve_rag_context(BASE_STATE)
+
+    mock_submit.assert_called_once_with("NVDA", BASE_STATE["start_date"], BASE_STATE["end_date"])
+    assert result["filing_ingestion_pending"] is True
+    assert [c["text"] for c in result["filing_chunks"]] == ["Data center revenue grew on Hopper demand."]
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=lambda texts: [[0.0]] * len(texts))
+def test_ingestion_indexes_batch_for_keyword_search(mock_embed):
+    from agent.graph.nodes import rag_retriever
+
+    text = " ".join(f"Blackwell ramp drove data center revenue in region {i}." for i in range(80))
+    chunks = list(_iter_section_chunks([text], "NVDA", "10-K", "2024Q4"))
+    mock_col = MagicMock()
+    mock_col.get.return_value = {"ids": [chunks[0]["id"]]}     # already in ChromaDB
+
+    assert rag_retriever._ingest_sources(mock_col, [("NVDA 10-K 2024Q4", lambda: chunks)]) == len(chunks) - 1
+    hits = rag_retriever._bm25_index.search("NVDA", "blackwell")
+    assert {h["id"] for h in hits} == {c["id"] for c in chunks}
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever.RETRIEVAL_MODE", "bm25")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 30)
+@patch("agent.graph.nodes.rag_retriever._embed_texts")
+async def test_bm25_mode_ingests_without_embedding_or_gcp(mock_embed, tmp_path):
+    """bm25 mode fills only the keyword index, and its hits are a cache hit."""
+    from agent.graph.nodes import rag_retriever
+
+    filing = {"cik": "0001045810", "accession_number": "000104581024000123", "primary_doc": "nvda.htm",
+              "filing_type": "10-K", "period": "2024Q2", "filing_date": "2024-05-29"}
+    env_without_key = {k: v for k, v in os.environ.items() if k != "GOOGLE_CLOUD_PROJECT"}
+    state = {**BASE_STATE, "user_message": "supply constraints data center growth"}
+
+    with patch.dict(os.environ, env_without_key, clear=True), \
+         patch.object(rag_retriever, "CHROMA_PERSIST_DIR", str(tmp_path)), \
+         patch.object(rag_retriever, "_get_cik", return_value="0001045810"), \
+         patch.object(rag_retriever, "_discover_filings", return_value=[filing]) as mock_discover, \
+         patch.object(rag_retriever, "_stream_filing_text", return_value=iter([_10K_HTML])):
+        first = await retrieve_rag_context(state)
+        second = await retrieve_rag_context(state)
+
+    assert first["filing_error"] is None
+    assert first["filing_ingested"] is True
+    assert first["filing_chunks"]
+    assert second["filing_ingested"] is False
+    assert second["filing_chunks"] == first["filing_chunks"]
+    mock_discover.assert_called_once()
+    mock_embed.assert_not_called()
+    assert rag_retriever._get_collection().count() == 0
+
+
+# ---------------------------------------------------------------------------
+# Group 15: Embedding backends
+# ---------------------------------------------------------------------------
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    import math
+    from agent.graph.nodes.rag_retriever import _HashingEmbedder
+
+    embedder = _HashingEmbedder(dimensions=256)
+    first = embedder.embed_query("Data center revenue grew 154%")
+    assert first == _HashingEmbedder(dimensions=256).embed_documents(["Data center revenue grew 154%"])[0]
+    assert len(first) == 256
+    assert math.isclose(math.sqrt(sum(v * v for v in first)), 1.0)
+    assert embedder.embed_query("") != [0.0] * 256
+
+
+def test_hashing_embedder_ranks_overlapping_text_closer():
+    from agent.graph.nodes.rag_retriever import _HashingEmbedder
+
+    embedder = _HashingEmbedder()
+    query, near, far = embedder.embed_documents([
+        "gross margin guidance", "Gross margin guidance for Q3 is 75%.", "Export controls restrict shipments.",
+    ])
+    dot = lambda a, b: sum(x * y for x, y in zip(a, b))
+    assert dot(query, near) > dot(query, far)
+
+
+@patch("agent.graph.nodes.rag_retriever.EMBEDDING_BACKEND", "word2vec")
+def test_unknown_backend_is_reported_as_filing_error():
+    import asyncio
+
+    result = asyncio.run(retrieve_rag_context(BASE_STATE))
+    assert "unknown RAG_EMBEDDING_BACKEND 'word2vec'" in result["filing_error"]
+
+
+def test_each_embedding_model_gets_its_own_collection():
+    from agent.graph.nodes.rag_retriever import _collection_name, _GeminiEmbedder, _HashingEmbedder
+
+    assert _collection_name(_GeminiEmbedder()) == "sec_filings_gemini_embedding_001_v2"
+    assert _collection_name(_HashingEmbedder(512)) == "sec_filings_hashing_512_v2"
+
+
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.rag_retriever.EMBEDDING_BACKEND", "hashing")
+@patch("agent.graph.nodes.rag_retriever.INGEST_WAIT_SECONDS", 30)
+@patch("agent.graph.nodes.rag_retriever.genai")
+async def test_hashing_backend_runs_ingest_and_query_offline(mock_genai, tmp_path):
+    """No GOOGLE_CLOUD_PROJECT, no genai: ingestion and retrieval through a real ChromaDB."""
+    from agent.graph.nodes import rag_retriever
+
+    filing = {"cik": "0001045810", "accession_number": "000104581024000123", "primary_doc": "nvda.htm",
+              "filing_type": "10-K", "period": "2024Q2", "filing_date": "2024-05-29"}
+    env_without_key = {k: v for k, v in os.environ.items() if k != "GOOGLE_CLOUD_PROJECT"}
+
+    with patch.dict(os.environ, env_without_key, clear=True), \
+         patch.object(rag_retriever, "CHROMA_PERSIST_DIR", str(tmp_path)), \
+         patch.object(rag_retriever, "_get_cik", return_value="0001045810"), \
+         patch.object(rag_retriever, "_discover_filings", return_value=[filing]), \
+         patch.object(rag_retriever, "_stream_filing_text", return_value=iter([_10K_HTML])):
+        result = await retrieve_rag_context({**BASE_STATE, "user_message": "supply constraints data center growth"})
+
+    assert result["filing_error"] is None
+    assert result["filing_ingested"] is True
+    assert result["filing_chunks"]
+    mock_genai.Client.assert_not_called()
+    assert rag_retriever._get_collection().name == "sec_filings_hashing_768_v2"
+
+
+# ---------------------------------------------------------------------------
+# Group 16: Pipelined multi-filing ingestion
+# ---------------------------------------------------------------------------
+
+def _filings(n):
+    return [{"cik": "1", "accession_number": f"a{i}", "primary_doc": f"d{i}.htm",
+             "filing_type": "10-Q", "period": f"2024Q{i + 1}"} for i in range(n)]
+
+
+def _filing_text(accession):
+    return " ".join(f"{accession}w{j}" for j in range(12_000))
+
+
+def _pipeline_collection():
+    mock_col = MagicMock()
+    mock_col.get.return_value = {"ids": []}
+    return mock_col
+
+
+def test_filing_downloads_run_concurrently():
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    all_streaming = threading.Barrier(3, timeout=5)
+
+    def stream(cik, accession, doc):
+        all_streaming.wait()          # only passes if the three downloads overlap
+        yield _filing_text(accession)
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=stream), \
+         patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=lambda t: [[0.0]] * len(t)):
+        stored = _ingest_filings(_pipeline_collection(), _filings(3), "NVDA")
+
+    assert stored == sum(len(list(_iter_section_chunks([_filing_text(f"a{i}")], "NVDA", "10-Q", "x"))) for i in range(3))
+
+
+def test_chunks_from_several_filings_are_packed_into_full_batches():
+    from agent.graph.nodes.rag_retriever import _INGEST_BATCH_CHUNKS, _ingest_filings
+
+    batch_sizes = []
+
+    def embed(texts):
+        batch_sizes.append(len(texts))
+        return [[0.0]] * len(texts)
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=lambda c, a, d: iter([_filing_text(a)])), \
+         patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=embed):
+        stored = _ingest_filings(_pipeline_collection(), _filings(3), "NVDA")
+
+    per_filing = len(list(_iter_section_chunks([_filing_text("a0")], "NVDA", "10-Q", "x")))
+    assert per_filing < _INGEST_BATCH_CHUNKS < stored
+    assert batch_sizes[:-1] == [_INGEST_BATCH_CHUNKS] * (len(batch_sizes) - 1)
+    assert sum(batch_sizes) == stored
+
+
+def test_embedding_overlaps_previous_collection_add():
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    second_batch_embedding = threading.Event()
+    embed_calls = []
+    overlapped = []
+
+    def embed(texts):
+        embed_calls.append(len(texts))
+        if len(embed_calls) == 2:
+            second_batch_embedding.set()
+        return [[0.0]] * len(texts)
+
+    def add(**kwargs):
+        if not overlapped:
+            # The first add only finishes once batch 2 is being embedded.
+            overlapped.append(second_batch_embedding.wait(timeout=5))
+
+    mock_col = _pipeline_collection()
+    mock_col.add.side_effect = add
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=lambda c, a, d: iter([_filing_text(a)])), \
+         patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=embed):
+        _ingest_filings(mock_col, _filings(3), "NVDA")
+
+    assert overlapped == [True]
+
+
+def test_failed_filing_does_not_stop_the_others():
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    def stream(cik, accession, doc):
+        if accession == "a1":
+            raise httpx.HTTPError("EDGAR 500")
+        return iter([_filing_text(accession)])
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=stream), \
+         patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=lambda t: [[0.0]] * len(t)):
+        stored = _ingest_filings(_pipeline_collection(), _filings(3), "NVDA")
+
+    assert stored == 2 * len(list(_iter_section_chunks([_filing_text("a0")], "NVDA", "10-Q", "x")))
+
+
+def test_all_filings_failing_raises():
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=httpx.HTTPError("EDGAR 500")):
+        with pytest.raises(httpx.HTTPError):
+            _ingest_filings(_pipeline_collection(), _filings(2), "NVDA")
+
+
+def test_embedding_failure_releases_blocked_downloads():
+    import time
+    from agent.graph.nodes.rag_retriever import _ingest_filings
+
+    finished = []
+
+    def stream(cik, accession, doc):
+        try:
+            for _ in range(4):
+                yield _filing_text(accession)
+        finally:
+            finished.append(accession)
+
+    with patch("agent.graph.nodes.rag_retriever._stream_filing_text", side_effect=stream), \
+         patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=RuntimeError("quota exceeded")):
+        with pytest.raises(RuntimeError):
+            _ingest_filings(_pipeline_collection(), _filings(3), "NVDA")
+
+    # Producers blocked on the full queue notice the cancellation and exit.
+    deadline = time.monotonic() + 5
+    while len(finished) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(finished) == ["a0", "a1", "a2"]
+
+
+# ---------------------------------------------------------------------------
+# Group 17: Content-hash deduplication
+# ---------------------------------------------------------------------------
+
+_RISK_TEXT = " ".join(f"Export controls may restrict sales of product line {i}." for i in range(150))
+
+
+def _fake_embed(texts):
+    from agent.graph.nodes.rag_retriever import _HashingEmbedder
+    return _HashingEmbedder(64).embed_documents(texts)
+
+
+def test_repeated_text_across_filings_reuses_stored_vectors(tmp_path):
+    from agent.graph.nodes import rag_retriever
+
+    filings = [{"cik": "1", "accession_number": f"a{q}", "primary_doc": "d.htm",
+                "filing_type": "10-Q", "period": f"2024Q{q}"} for q in (1, 2)]
+    embedded = []
+
+    def embed(texts):
+        embedded.extend(texts)
+        return _fake_embed(texts)
+
+    with patch.object(rag_retriever, "CHROMA_PERSIST_DIR", str(tmp_path)), \
+         patch.object(rag_retriever, "_stream_filing_text", side_effect=lambda c, a, d: iter([_RISK_TEXT])), \
+         patch.object(rag_retriever, "_embed_texts", side_effect=embed):
+        col = rag_retriever._get_collection()
+        first = rag_retriever._ingest_filings(col, [filings[0]], "NVDA")
+        n_embedded = len(embedded)
+        second = rag_retriever._ingest_filings(col, [filings[1]], "NVDA")
+
+    # Q2 repeats Q1 word for word: stored for the Q2 period filter, but not re-embedded.
+    assert first == second > 1
+    assert len(embedded) == n_embedded
+    assert col.count() == first + second
+    q2 = col.get(where={"filing_period": "2024Q2"}, include=["metadatas"])
+    assert all(m["content_hash"] for m in q2["metadatas"])
+
+
+@patch("agent.graph.nodes.rag_retriever._INGEST_BATCH_CHUNKS", 2)
+@patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=_fake_embed)
+def test_text_repeated_across_batches_of_one_job_is_embedded_once(mock_embed):
+    from agent.graph.nodes.rag_retriever import _ingest_sources
+
+    def chunks(period):
+        return [{"id": f"NVDA-10-Q-{period}-chunk-{i:03d}", "text": text,
+                 "metadata": {"ticker": "NVDA", "filing_type": "10-Q", "filing_period": period}}
+                for i, text in enumerate(["Export controls may restrict sales. " * 20, "Gaming demand was soft. " * 20])]
+    mock_col = MagicMock()
+    # Earlier batches' adds have not landed: ChromaDB knows none of the text.
+    mock_col.get.return_value = {"ids": [], "embeddings": None, "metadatas": []}
+
+    stored = _ingest_sources(mock_col, [("Q1", lambda: chunks("2024Q1")), ("Q2", lambda: chunks("2024Q2"))])
+
+    assert stored == 4
+    assert sum(len(c.args[0]) for c in mock_embed.call_args_list) == 2
+
+
+@patch("agent.graph.nodes.rag_retriever._embed_texts", side_effect=_fake_embed)
+def test_passage_repeated_within_a_filing_is_stored_once(mock_embed):
+    from agent.graph.nodes.rag_retriever import _ingest_chunks
+
+    chunk = lambda i, text: {"id": f"NVDA-10-K-2024Q4-chunk-{i:03d}", "text": text,
+                             "metadata": {"ticker": "NVDA", "filing_type": "10-K", "filing_period": "2024Q4"}}
+    legend = "Forward-looking statements involve risks and uncertainties. " * 10
+    mock_col = MagicMock()
+    mock_col.get.return_value = {"ids": []}
+
+    stored = _ingest_chunks(mock_col, [chunk(0, legend), chunk(1, "Revenue grew. " * 30), chunk(2, legend.upper())], "NVDA", "2024Q4")
+
+    assert stored == 2
+    assert mock_col.add.call_args.kwargs["ids"] == ["NVDA-10-K-2024Q4-chunk-000", "NVDA-10-K-2024Q4-chunk-001"]
+
+
+@patch("agent.graph.nodes.rag_retriever.RETRIEVAL_MODE", "vector")
+@patch("agent.graph.nodes.rag_retriever._embed_query", return_value=[0.1] * 768)
+def test_query_returns_each_passage_once(mock_embed_q):
+    from agent.graph.nodes.rag_retriever import _query_collection
+
+    mock_col = MagicMock()
+    mock_col.count.return_value = 10
+    mock_col.query.return_value = _make_chroma_query_result(
+        docs=["Export controls...", "Export controls...", "Gaming demand..."],
+        metas=[{"filing_period": "2024Q2", "content_hash": "h1"},
+               {"filing_period": "2024Q1", "content_hash": "h1"},
+               {"filing_period": "2024Q2", "content_hash": "h2"}],
+        distances=[0.1, 0.1, 0.2],
+    )
+
+    chunks = _query_collection(mock_col, "NVDA", "export controls")
+    assert [(c["text"], c["filing_quarter"]) for c in chunks] == [
+        ("Export controls...", "2024Q2"), ("Gaming demand...", "2024Q2"),
+    ]
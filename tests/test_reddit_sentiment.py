@@ -6,7 +6,7 @@ Covers: Reddit public JSON fetcher, Stocktwits fetcher, LLM classifier,
         pre-label pass-through, and the full node integration.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -90,8 +90,9 @@ def _stocktwits_message(
 # _fetch_reddit_posts
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_reddit_posts_returns_in_range_posts(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_reddit_posts_returns_in_range_posts(mock_get):
     mock_get.return_value = MagicMock(
         status_code=200,
         json=lambda: _reddit_response([
@@ -99,21 +100,22 @@ def test_fetch_reddit_posts_returns_in_range_posts(mock_get):
             _reddit_post(post_id="out1", created_utc=1700000000.0),  # 2023-11-14 — out of range
         ]),
     )
-    posts = _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
+    posts = await _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
     assert len(posts) == 1
     assert posts[0]["id"] == "in1"
     assert posts[0]["source"] == "reddit"
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_reddit_posts_returns_expected_fields(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_reddit_posts_returns_expected_fields(mock_get):
     mock_get.return_value = MagicMock(
         status_code=200,
         json=lambda: _reddit_response([
             _reddit_post(title="NVDA earnings", selftext="Very bullish.", score=200, created_utc=1718000000.0),
         ]),
     )
-    posts = _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
+    posts = await _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
     post = posts[0]
     assert post["title"] == "NVDA earnings"
     assert post["score"] == 200
@@ -123,17 +125,19 @@ def test_fetch_reddit_posts_returns_expected_fields(mock_get):
     assert post["pre_label"] is None
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_reddit_posts_returns_empty_on_http_error(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_reddit_posts_returns_empty_on_http_error(mock_get):
     mock_get.return_value = MagicMock(status_code=429)
-    posts = _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
+    posts = await _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
     assert posts == []
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_reddit_posts_returns_empty_on_exception(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_reddit_posts_returns_empty_on_exception(mock_get):
     mock_get.side_effect = Exception("network error")
-    posts = _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
+    posts = await _fetch_reddit_posts("NVDA", "NVIDIA", "2024-06-01", "2024-06-30")
     assert posts == []
 
 
@@ -141,8 +145,9 @@ def test_fetch_reddit_posts_returns_empty_on_exception(mock_get):
 # _fetch_stocktwits_messages
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_stocktwits_returns_in_range_messages(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_stocktwits_returns_in_range_messages(mock_get):
     mock_get.return_value = MagicMock(
         status_code=200,
         json=lambda: _stocktwits_response([
@@ -150,14 +155,15 @@ def test_fetch_stocktwits_returns_in_range_messages(mock_get):
             _stocktwits_message(msg_id=2, created_at="2023-01-01T12:00:00Z"),  # out of range
         ]),
     )
-    messages = _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
+    messages = await _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
     assert len(messages) == 1
     assert messages[0]["id"] == "1"
     assert messages[0]["source"] == "stocktwits"
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_stocktwits_uses_pre_label(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_stocktwits_uses_pre_label(mock_get):
     mock_get.return_value = MagicMock(
         status_code=200,
         json=lambda: _stocktwits_response([
@@ -166,23 +172,25 @@ def test_fetch_stocktwits_uses_pre_label(mock_get):
             _stocktwits_message(msg_id=3, created_at="2024-06-12T12:00:00Z", sentiment_basic=None),
         ]),
     )
-    messages = _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
+    messages = await _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
     assert messages[0]["pre_label"] == "bullish"
     assert messages[1]["pre_label"] == "bearish"
     assert messages[2]["pre_label"] is None
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_stocktwits_returns_empty_on_http_error(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_stocktwits_returns_empty_on_http_error(mock_get):
     mock_get.return_value = MagicMock(status_code=429)
-    messages = _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
+    messages = await _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
     assert messages == []
 
 
-@patch("agent.graph.nodes.reddit_sentiment.requests.get")
-def test_fetch_stocktwits_returns_empty_on_exception(mock_get):
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.async_get")
+async def test_fetch_stocktwits_returns_empty_on_exception(mock_get):
     mock_get.side_effect = Exception("connection refused")
-    messages = _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
+    messages = await _fetch_stocktwits_messages("NVDA", "2024-06-01", "2024-06-30")
     assert messages == []
 
 
@@ -190,42 +198,46 @@ def test_fetch_stocktwits_returns_empty_on_exception(mock_get):
 # _classify_batch
 # ---------------------------------------------------------------------------
 
-@patch("agent.graph.nodes.reddit_sentiment.llm_classifier")
-def test_classify_batch_parses_llm_response(mock_llm):
-    mock_llm.invoke.return_value = MagicMock(
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.llm_classifier", ainvoke=AsyncMock())
+async def test_classify_batch_parses_llm_response(mock_llm):
+    mock_llm.ainvoke.return_value = MagicMock(
         content='[{"index": 0, "sentiment": "bullish"}, {"index": 1, "sentiment": "bearish"}]'
     )
     posts = [
         {"title": "NVDA up", "snippet": "Very bullish."},
         {"title": "NVDA down", "snippet": "Bearish outlook."},
     ]
-    labels = _classify_batch(posts)
+    labels = await _classify_batch(posts)
     assert labels == ["bullish", "bearish"]
 
 
-@patch("agent.graph.nodes.reddit_sentiment.llm_classifier")
-def test_classify_batch_falls_back_to_neutral_on_llm_error(mock_llm):
-    mock_llm.invoke.side_effect = Exception("LLM unavailable")
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.llm_classifier", ainvoke=AsyncMock())
+async def test_classify_batch_falls_back_to_neutral_on_llm_error(mock_llm):
+    mock_llm.ainvoke.side_effect = Exception("LLM unavailable")
     posts = [{"title": "NVDA", "snippet": "something"}]
-    labels = _classify_batch(posts)
+    labels = await _classify_batch(posts)
     assert labels == ["neutral"]
 
 
-@patch("agent.graph.nodes.reddit_sentiment.llm_classifier")
-def test_classify_batch_strips_markdown_fence(mock_llm):
-    mock_llm.invoke.return_value = MagicMock(
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.llm_classifier", ainvoke=AsyncMock())
+async def test_classify_batch_strips_markdown_fence(mock_llm):
+    mock_llm.ainvoke.return_value = MagicMock(
         content='```json\n[{"index": 0, "sentiment": "neutral"}]\n```'
     )
-    labels = _classify_batch([{"title": "NVDA", "snippet": "unclear"}])
+    labels = await _classify_batch([{"title": "NVDA", "snippet": "unclear"}])
     assert labels == ["neutral"]
 
 
-@patch("agent.graph.nodes.reddit_sentiment.llm_classifier")
-def test_classify_batch_strips_uppercase_json_fence(mock_llm):
-    mock_llm.invoke.return_value = MagicMock(
+@pytest.mark.asyncio
+@patch("agent.graph.nodes.reddit_sentiment.llm_classifier", ainvoke=AsyncMock())
+async def test_classify_batch_strips_uppercase_json_fence(mock_llm):
+    mock_llm.ainvoke.return_value = MagicMock(
         content='```JSON\n[{"index": 0, "sentiment": "bullish"}]\n```'
     )
-    labels = _classify_batch([{"title": "NVDA moon", "snippet": "great"}])
+    labels = await _classify_batch([{"title": "NVDA moon", "snippet": "great"}])
     assert labels == ["bullish"]
 
 
@@ -233,25 +245,27 @@ def test_classify_batch_strips_uppercase_json_fence(mock_llm):
 # _classify_all — pre-label pass-through and batching
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._classify_batch")
-def test_classify_all_skips_llm_for_pre_labeled_posts(mock_batch):
+async def test_classify_all_skips_llm_for_pre_labeled_posts(mock_batch):
     mock_batch.return_value = ["neutral"]  # called for the one unlabeled post
     posts = [
         {"title": "A", "snippet": "", "pre_label": "bullish"},
         {"title": "B", "snippet": "", "pre_label": "bearish"},
         {"title": "C", "snippet": "", "pre_label": None},  # needs LLM
     ]
-    labels = _classify_all(posts)
+    labels = await _classify_all(posts)
     assert labels == ["bullish", "bearish", "neutral"]
     mock_batch.assert_called_once()
     assert len(mock_batch.call_args[0][0]) == 1  # only 1 post sent to LLM
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._classify_batch")
-def test_classify_all_batches_correctly(mock_batch):
+async def test_classify_all_batches_correctly(mock_batch):
     mock_batch.side_effect = lambda batch: ["bullish"] * len(batch)
     posts = [{"title": f"post {i}", "snippet": "", "pre_label": None} for i in range(12)]
-    labels = _classify_all(posts)
+    labels = await _classify_all(posts)
     # 12 posts, batch size 5 → 3 calls (5+5+2)
     assert mock_batch.call_count == 3
     assert len(labels) == 12
@@ -261,10 +275,11 @@ def test_classify_all_batches_correctly(mock_batch):
 # analyze_reddit_sentiment — node integration
 # ---------------------------------------------------------------------------
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts", return_value=[])
 @patch("agent.graph.nodes.reddit_sentiment._fetch_stocktwits_messages", return_value=[])
-def test_node_returns_zero_summary_when_no_posts(mock_st, mock_reddit):
-    result = analyze_reddit_sentiment(_base_state())
+async def test_node_returns_zero_summary_when_no_posts(mock_st, mock_reddit):
+    result = await analyze_reddit_sentiment(_base_state())
     assert result["sentiment_error"] is None
     assert result["sentiment_summary"]["total_posts_analyzed"] == 0
     assert result["sentiment_posts"] == []
@@ -272,10 +287,11 @@ def test_node_returns_zero_summary_when_no_posts(mock_st, mock_reddit):
     assert "stocktwits" in result["sentiment_summary"]["sources"]
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts")
 @patch("agent.graph.nodes.reddit_sentiment._fetch_stocktwits_messages")
 @patch("agent.graph.nodes.reddit_sentiment._classify_all")
-def test_node_aggregates_totals_correctly(mock_classify, mock_st, mock_reddit):
+async def test_node_aggregates_totals_correctly(mock_classify, mock_st, mock_reddit):
     mock_reddit.return_value = [
         {"title": "A", "subreddit": "stocks", "date": "2024-06-10",
          "score": 100, "snippet": "", "source": "reddit", "permalink": "", "pre_label": None},
@@ -288,7 +304,7 @@ def test_node_aggregates_totals_correctly(mock_classify, mock_st, mock_reddit):
     ]
     mock_classify.return_value = ["bullish", "bearish", "bullish"]
 
-    result = analyze_reddit_sentiment(_base_state())
+    result = await analyze_reddit_sentiment(_base_state())
     summary = result["sentiment_summary"]
 
     assert summary["total_posts_analyzed"] == 3
@@ -299,10 +315,11 @@ def test_node_aggregates_totals_correctly(mock_classify, mock_st, mock_reddit):
     assert result["sentiment_error"] is None
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts")
 @patch("agent.graph.nodes.reddit_sentiment._fetch_stocktwits_messages")
 @patch("agent.graph.nodes.reddit_sentiment._classify_all")
-def test_node_sources_breakdown_is_correct(mock_classify, mock_st, mock_reddit):
+async def test_node_sources_breakdown_is_correct(mock_classify, mock_st, mock_reddit):
     mock_reddit.return_value = [
         {"title": "R1", "subreddit": "stocks", "date": "2024-06-10",
          "score": 100, "snippet": "", "source": "reddit", "permalink": "", "pre_label": None},
@@ -315,7 +332,7 @@ def test_node_sources_breakdown_is_correct(mock_classify, mock_st, mock_reddit):
     ]
     mock_classify.return_value = ["bullish", "bearish", "neutral"]
 
-    result = analyze_reddit_sentiment(_base_state())
+    result = await analyze_reddit_sentiment(_base_state())
     sources = result["sentiment_summary"]["sources"]
 
     assert sources["reddit"]["posts"] == 1
@@ -325,10 +342,11 @@ def test_node_sources_breakdown_is_correct(mock_classify, mock_st, mock_reddit):
     assert sources["stocktwits"]["neutral"] == 1
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts")
 @patch("agent.graph.nodes.reddit_sentiment._fetch_stocktwits_messages")
 @patch("agent.graph.nodes.reddit_sentiment._classify_all")
-def test_node_preserves_post_fields(mock_classify, mock_st, mock_reddit):
+async def test_node_preserves_post_fields(mock_classify, mock_st, mock_reddit):
     mock_reddit.return_value = [
         {"title": "NVDA bull", "subreddit": "stocks", "date": "2024-06-10",
          "score": 300, "snippet": "Strong buy.", "source": "reddit",
@@ -337,7 +355,7 @@ def test_node_preserves_post_fields(mock_classify, mock_st, mock_reddit):
     mock_st.return_value = []
     mock_classify.return_value = ["bullish"]
 
-    result = analyze_reddit_sentiment(_base_state())
+    result = await analyze_reddit_sentiment(_base_state())
     post = result["sentiment_posts"][0]
 
     assert post["title"] == "NVDA bull"
@@ -348,16 +366,18 @@ def test_node_preserves_post_fields(mock_classify, mock_st, mock_reddit):
     assert post["permalink"] == "/r/stocks/abc"
 
 
+@pytest.mark.asyncio
 @patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts")
-def test_node_writes_error_on_unexpected_exception(mock_reddit):
+async def test_node_writes_error_on_unexpected_exception(mock_reddit):
     mock_reddit.side_effect = Exception("unexpected crash")
-    result = analyze_reddit_sentiment(_base_state())
+    result = await analyze_reddit_sentiment(_base_state())
     assert result["sentiment_summary"] is None
     assert result["sentiment_posts"] is None
     assert "unexpected crash" in result["sentiment_error"]
 
 
-def test_returns_only_owned_fields():
+@pytest.mark.asyncio
+async def test_returns_only_owned_fields():
     """
     analyze_reddit_sentiment must return ONLY its three owned fields.
     Returning {**state} in a parallel Send() branch causes LangGraph to
@@ -367,7 +387,7 @@ def test_returns_only_owned_fields():
 
     with patch("agent.graph.nodes.reddit_sentiment._fetch_reddit_posts", return_value=[]):
         with patch("agent.graph.nodes.reddit_sentiment._fetch_stocktwits_messages", return_value=[]):
-            result = analyze_reddit_sentiment(state)
+            result = await analyze_reddit_sentiment(state)
 
     assert set(result.keys()) == {"sentiment_summary", "sentiment_posts", "sentiment_error"}, (
         f"analyze_reddit_sentiment returned unexpected keys: {set(result.keys())}"
@@ -347,3 +347,66 @@ def test_prompt_includes_earnings_date():
     state = _make_state(next_earnings_date="2026-05-20", days_until_earnings=57)
     prompt = _build_synthesis_prompt(state)
     assert "2026-05-20" in prompt
+
+
+def test_prompt_includes_volatility_surface():
+    """When options_data carries a volatility surface, prompt must summarise it."""
+    state = _make_state(options_data={
+        "put_call_ratio": 0.9,
+        "total_call_volume": 1000,
+        "total_put_volume": 900,
+        "average_implied_volatility": 0.3,
+        "max_pain": 180.0,
+        "volatility_surface": {
+            "term_structure": [
+                {"expiry": "2026-11-20", "days_to_expiry": 30, "atm_iv": 0.32},
+                {"expiry": "2026-12-18", "days_to_expiry": 60, "atm_iv": 0.35},
+            ],
+            "skew": [
+                {"expiry": "2026-11-20", "call_25d_iv": 0.3, "put_25d_iv": 0.36, "risk_reversal_25d": 0.06},
+            ],
+            "term_structure_shape": "contango",
+        },
+    })
+    prompt = _build_synthesis_prompt(state)
+    assert "term structure (contango)" in prompt
+    assert "2026-12-18 (60d) 0.35" in prompt
+    assert "risk reversal" in prompt
+
+
+def test_prompt_notes_pending_filing_ingestion():
+    """No chunks yet but ingestion queued → prompt says filings are being processed."""
+    state = _make_state(filing_chunks=[], filing_ingestion_pending=True)
+    prompt = _build_synthesis_prompt(state)
+    assert "being processed in the background" in prompt
+
+
+def test_prompt_notes_pending_ingestion_alongside_excerpts():
+    state = _make_state(filing_chunks=[{
+        "text": "Supply constraints may limit growth.", "filing_type": "10-K",
+        "filing_quarter": "2024Q4", "section": "", "chunk_relevance_score": 0.81,
+    }], filing_ingestion_pending=True)
+    prompt = _build_synthesis_prompt(state)
+    assert "## SEC Filing Excerpts [more filings are still being processed]" in prompt
+
+
+def test_prompt_labels_filing_excerpts_with_section():
+    state = _make_state(filing_chunks=[{
+        "text": "Supply constraints may limit growth.", "filing_type": "10-K",
+        "filing_quarter": "2024Q4", "filing_date": "2024-02-21",
+        "section": "Risk Factors", "chunk_relevance_score": 0.81,
+    }])
+    prompt = _build_synthesis_prompt(state)
+    assert "10-K 2024Q4 — Risk Factors (relevance: 0.81)" in prompt
+
+
+def test_prompt_labels_keyword_scores_apart_from_similarity():
+    state = _make_state(filing_chunks=[
+        {"text": "Export controls restrict shipments.", "filing_type": "10-Q", "filing_quarter": "2024Q2",
+         "section": "", "chunk_relevance_score": 1.0, "chunk_score_type": "keyword"},
+        {"text": "Data center demand is strong.", "filing_type": "10-Q", "filing_quarter": "2024Q2",
+         "section": "", "chunk_relevance_score": 0.8, "chunk_score_type": "similarity"},
+    ])
+    prompt = _build_synthesis_prompt(state)
+    assert "10-Q 2024Q2 (keyword match: 1.0 of best)" in prompt
+    assert "10-Q 2024Q2 (relevance: 0.8)" in prompt
@@ -145,12 +145,12 @@ def test_plan_preserves_existing_state(mock_llm):
 # route_after_plan_retrieval — pure Python, no mocking needed
 # ---------------------------------------------------------------------------
 
-def test_router_all_true_returns_three_sends():
+def test_router_all_true_returns_price_plus_three_sends():
     state = _make_state(retrieval_plan={"fetch_news": True, "fetch_sentiment": True, "fetch_rag": True})
     result = route_after_plan_retrieval(state)
-    assert len(result) == 3
+    assert len(result) == 4
     targets = {s.node for s in result}
-    assert targets == {"retrieve_news", "reddit_sentiment", "retrieve_rag"}
+    assert targets == {"fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"}
 
 
 def test_router_rag_false_omits_rag():
@@ -173,24 +173,23 @@ def test_router_sentiment_false_omits_sentiment():
 def test_router_only_news():
     state = _make_state(retrieval_plan={"fetch_news": True, "fetch_sentiment": False, "fetch_rag": False})
     result = route_after_plan_retrieval(state)
-    assert len(result) == 1
-    assert result[0].node == "retrieve_news"
+    assert [s.node for s in result] == ["fetch_price", "retrieve_news"]
 
 
 def test_router_all_false_safety_net_activates_all():
-    """All flags False would deadlock synthesize — safety net must fire."""
+    """All flags False is treated like a failed plan — safety net must fire."""
     state = _make_state(retrieval_plan={"fetch_news": False, "fetch_sentiment": False, "fetch_rag": False})
     result = route_after_plan_retrieval(state)
-    assert len(result) == 3
+    assert len(result) == 4
     targets = {s.node for s in result}
-    assert targets == {"retrieve_news", "reddit_sentiment", "retrieve_rag"}
+    assert targets == {"fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"}
 
 
 def test_router_missing_plan_defaults_all_active():
     """No retrieval_plan in state — should behave as all True."""
     state = _make_state()  # no retrieval_plan key
     result = route_after_plan_retrieval(state)
-    assert len(result) == 3
+    assert len(result) == 4
 
 
 def test_router_returns_send_objects():
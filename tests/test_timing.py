@@ -0,0 +1,160 @@
+"""
+Tests for the latency instrumentation helpers in agent/graph/nodes/timing.py.
+"""
+
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent.graph.nodes import timing
+from agent.graph.nodes.timing import (
+    LLMLatencyCallback,
+    format_timings,
+    merge_timings,
+    submit_timed,
+    timed_call,
+    timed_node,
+)
+
+
+def test_timed_call_outside_a_node_only_feeds_histograms():
+    with timed_call("finnhub"):
+        time.sleep(0.01)
+
+    calls = timing.snapshot()["calls"]
+    assert calls["finnhub"]["count"] == 1
+    assert calls["finnhub"]["max"] >= 0.01
+
+
+def test_sync_node_reports_duration_and_calls():
+    def node(state):
+        with timed_call("yfinance.history"):
+            time.sleep(0.01)
+        return {**state, "price_data": {"close_price": 1.0}}
+
+    result = timed_node("fetch_price", node)({"ticker": "NVDA", "timings": {"nodes": {"stale": 9.9}}})
+
+    assert result["price_data"] == {"close_price": 1.0}
+    # Full-state returns must not echo earlier timings back into the reducer.
+    assert set(result["timings"]["nodes"]) == {"fetch_price"}
+    assert result["timings"]["nodes"]["fetch_price"] >= 0.01
+    assert len(result["timings"]["calls"]["yfinance.history"]) == 1
+    assert timing.snapshot()["nodes"]["fetch_price"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_node_attributes_calls_from_gathered_tasks():
+    async def fetch(name):
+        with timed_call(name):
+            await asyncio.sleep(0.01)
+
+    async def node(state):
+        await asyncio.gather(fetch("finnhub"), fetch("google_rss"))
+        return {"news_articles": []}
+
+    result = await timed_node("retrieve_news", node)({})
+
+    assert set(result["timings"]["calls"]) == {"finnhub", "google_rss"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_nodes_keep_separate_collectors():
+    async def node_with(call):
+        async def node(state):
+            with timed_call(call):
+                await asyncio.sleep(0.01)
+            return {}
+        return node
+
+    news = timed_node("retrieve_news", await node_with("finnhub"))
+    rag = timed_node("retrieve_rag", await node_with("edgar"))
+    news_result, rag_result = await asyncio.gather(news({}), rag({}))
+
+    assert set(news_result["timings"]["calls"]) == {"finnhub"}
+    assert set(rag_result["timings"]["calls"]) == {"edgar"}
+
+
+def test_nested_node_reports_into_outer_node():
+    inner = timed_node("resolve_ticker", lambda s: {**s, "ticker": "NVDA"})
+
+    def outer(state):
+        result = inner(state)
+        assert "timings" not in result
+        with timed_call("yfinance.earnings_dates"):
+            pass
+        return {"ticker": result["ticker"]}
+
+    result = timed_node("resolve_subject", outer)({})
+
+    assert set(result["timings"]["nodes"]) == {"resolve_ticker", "resolve_subject"}
+    assert "yfinance.earnings_dates" in result["timings"]["calls"]
+
+
+def test_submit_timed_attributes_pool_work_to_calling_node():
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    def node(state):
+        futures = [submit_timed(pool, "yfinance.option_chain", time.sleep, 0.01) for _ in range(2)]
+        for f in futures:
+            f.result()
+        return {}
+
+    result = timed_node("analyze_options", node)({})
+    pool.shutdown()
+
+    assert len(result["timings"]["calls"]["yfinance.option_chain"]) == 2
+
+
+def test_merge_timings_adds_nodes_and_concatenates_calls():
+    left = {"nodes": {"fetch_price": 0.2}, "calls": {"finnhub": [0.1]}}
+    right = {"nodes": {"retrieve_news": 0.3}, "calls": {"finnhub": [0.2], "edgar": [0.4]}}
+
+    merged = merge_timings(left, right)
+
+    assert merged == {
+        "nodes": {"fetch_price": 0.2, "retrieve_news": 0.3},
+        "calls": {"finnhub": [0.1, 0.2], "edgar": [0.4]},
+    }
+    assert left["calls"]["finnhub"] == [0.1]   # inputs untouched
+    assert merge_timings(None, right)["nodes"] == {"retrieve_news": 0.3}
+
+
+def test_histogram_percentiles_and_buckets():
+    for ms in range(1, 101):
+        timing.record_call("edgar", ms / 1000)
+
+    hist = timing.snapshot()["calls"]["edgar"]
+    assert hist["count"] == 100
+    assert hist["p50"] == pytest.approx(0.051)
+    assert hist["p99"] == pytest.approx(0.1)
+    assert hist["buckets"]["0.05"] == 50
+    assert hist["buckets"]["+Inf"] == 100
+
+
+def test_llm_callback_records_call_inside_node():
+    callback = LLMLatencyCallback("groq.classifier")
+
+    def node(state):
+        run_id = uuid.uuid4()
+        callback.on_chat_model_start({}, [[]], run_id=run_id)
+        time.sleep(0.01)
+        callback.on_llm_end(None, run_id=run_id)
+        return {}
+
+    result = timed_node("classify_intent", node)({})
+
+    samples = result["timings"]["calls"]["llm.groq.classifier"]
+    assert len(samples) == 1 and samples[0] >= 0.01
+
+
+def test_format_timings_lists_slowest_node_first():
+    line = format_timings({
+        "nodes": {"synthesize": 1.5, "retrieve_news": 3.0},
+        "calls": {"finnhub": [0.5, 0.25]},
+    })
+    assert line.index("retrieve_news") < line.index("synthesize")
+    assert "finnhub=0.750s/2" in line
+    assert format_timings(None) == "no timings"
@@ -14,6 +14,8 @@ test_response_synthesizer.py.  We only care that the right nodes are
 reached and that state fields set by each node flow through correctly.
 """
 
+import asyncio
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -70,14 +72,15 @@ def test_route_date_parser_date_missing_overrides_valid_intent():
     assert route_after_date_parser(state) == "synthesize"
 
 
-def test_route_date_parser_stock_analysis_to_fetch_price():
+def test_route_date_parser_stock_analysis_to_planner():
+    """Analysis intents plan first; fetch_price is dispatched by the planner fan-out."""
     state = _state(intent="stock_analysis", date_missing=False)
-    assert route_after_date_parser(state) == "fetch_price"
+    assert route_after_date_parser(state) == "plan_retrieval"
 
 
-def test_route_date_parser_general_lookup_to_fetch_price():
+def test_route_date_parser_general_lookup_to_planner():
     state = _state(intent="general_lookup", date_missing=False)
-    assert route_after_date_parser(state) == "fetch_price"
+    assert route_after_date_parser(state) == "plan_retrieval"
 
 
 def test_route_date_parser_chart_request_to_fetch_price():
@@ -100,37 +103,42 @@ def test_route_fetch_price_chart_request_to_generate_chart():
     assert route_after_fetch_price(state) == "generate_chart"
 
 
-def test_route_fetch_price_stock_analysis_to_planner():
-    """Phase 5: analysis intents route to plan_retrieval, not directly to fan-out."""
+def test_route_fetch_price_stock_analysis_to_synthesize():
+    """fetch_price is a fan-out branch for analysis intents and joins at synthesize."""
     state = _state(intent="stock_analysis")
-    assert route_after_fetch_price(state) == "plan_retrieval"
+    assert route_after_fetch_price(state) == "synthesize"
 
 
-def test_route_fetch_price_general_lookup_to_planner():
+def test_route_fetch_price_general_lookup_to_synthesize():
     state = _state(intent="general_lookup")
-    assert route_after_fetch_price(state) == "plan_retrieval"
+    assert route_after_fetch_price(state) == "synthesize"
 
 
-def test_route_fetch_price_options_view_to_planner():
-    """options_view reaching route_after_fetch_price also goes to planner."""
+def test_route_fetch_price_options_view_to_synthesize():
+    """options_view reaching route_after_fetch_price also converges at synthesize."""
     state = _state(intent="options_view")
-    assert route_after_fetch_price(state) == "plan_retrieval"
+    assert route_after_fetch_price(state) == "synthesize"
 
 
 def test_route_plan_retrieval_all_active():
-    """All-active plan fans out to all three retrieval nodes."""
+    """All-active plan fans out to price plus all three retrieval nodes."""
     state = _state(retrieval_plan={"fetch_news": True, "fetch_sentiment": True, "fetch_rag": True})
     result = route_after_plan_retrieval(state)
     assert isinstance(result, list)
-    assert {s.node for s in result} == {"retrieve_news", "reddit_sentiment", "retrieve_rag"}
+    assert {s.node for s in result} == {"fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"}
 
 
 def test_route_plan_retrieval_selective():
-    """Selective plan emits only enabled nodes."""
+    """Selective plan emits price plus only the enabled retrieval nodes."""
     state = _state(retrieval_plan={"fetch_news": True, "fetch_sentiment": False, "fetch_rag": False})
     result = route_after_plan_retrieval(state)
-    assert len(result) == 1
-    assert result[0].node == "retrieve_news"
+    assert [s.node for s in result] == ["fetch_price", "retrieve_news"]
+
+
+def test_route_plan_retrieval_all_false_activates_all():
+    state = _state(retrieval_plan={"fetch_news": False, "fetch_sentiment": False, "fetch_rag": False})
+    result = route_after_plan_retrieval(state)
+    assert {s.node for s in result} == {"fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"}
 
 
 # ---------------------------------------------------------------------------
@@ -263,3 +271,161 @@ def test_e2e_unknown_intent_returns_clarification(
     # Clarification path does not call llm_synthesizer
     mock_synth_llm.invoke.assert_not_called()
     assert result.get("synthesizer_error") is None
+
+
+# ---------------------------------------------------------------------------
+# Fan-out timing: price fetch overlaps the retrieval branches
+# ---------------------------------------------------------------------------
+
+def _timed_stub(name: str, delay: float, timings: dict, update=None):
+    """Async node stub that sleeps `delay` and records (start, end) times."""
+    async def _node(state):
+        start = time.perf_counter()
+        await asyncio.sleep(delay)
+        timings[name] = (start, time.perf_counter())
+        if update is None:
+            return {**state}
+        return update(state) if callable(update) else update
+    return _node
+
+
+@pytest.mark.asyncio
+async def test_price_fetch_runs_concurrently_with_retrieval_branches():
+    """
+    stock_analysis critical path is planner + max(price, news, sentiment, rag),
+    not price + planner + max(retrieval). Stage timings are recorded per node.
+    """
+    timings: dict = {}
+    stubs = {
+        "classify_intent": _timed_stub("classify_intent", 0, timings, {
+            "intent": "stock_analysis", "chart_requested": False,
+        }),
+        "resolve_ticker": _timed_stub("resolve_ticker", 0, timings, lambda s: {**s, "ticker": "NVDA"}),
+        "parse_dates": _timed_stub("parse_dates", 0, timings, lambda s: {
+            **s, "start_date": "2024-05-01", "end_date": "2024-05-07", "date_missing": False,
+        }),
+        "plan_retrieval": _timed_stub("plan_retrieval", 0.05, timings, lambda s: {
+            **s, "retrieval_plan": {"fetch_news": True, "fetch_sentiment": True, "fetch_rag": True},
+        }),
+        "fetch_price_data": _timed_stub("fetch_price", 0.3, timings, lambda s: {
+            **s, "price_data": {"close_price": 1.0}, "price_error": None,
+        }),
+        "retrieve_news": _timed_stub("retrieve_news", 0.3, timings, {"news_articles": [], "news_error": None}),
+        "analyze_reddit_sentiment": _timed_stub("reddit_sentiment", 0.2, timings, {"sentiment_error": None}),
+        "retrieve_rag_context": _timed_stub("retrieve_rag", 0.3, timings, {"filing_chunks": [], "filing_error": None}),
+        "synthesize_response": _timed_stub("synthesize", 0, timings, {"response_text": "ok"}),
+    }
+    with patch.multiple("agent.graph.workflow", **stubs):
+        graph = create_workflow()
+        result = await graph.ainvoke({"user_message": "How did NVDA do?", "user_config": {}})
+
+    assert result["price_data"] == {"close_price": 1.0}
+    assert result["response_text"] == "ok"
+
+    # Price starts only after the plan exists, together with the retrieval branches.
+    price_start, price_end = timings["fetch_price"]
+    news_start, news_end = timings["retrieve_news"]
+    assert price_start >= timings["plan_retrieval"][1]
+    assert price_start < news_end and news_start < price_end
+
+    # Synthesize waits for every branch.
+    synth_start = timings["synthesize"][0]
+    assert all(synth_start >= timings[n][1] for n in ("fetch_price", "retrieve_news", "reddit_sentiment", "retrieve_rag"))
+
+
+# ---------------------------------------------------------------------------
+# Front-end timing: intent classification overlaps ticker/date resolution
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_intent_runs_concurrently_with_ticker_and_dates():
+    """
+    The front-end critical path is max(intent, ticker → dates), not their sum.
+    parse_dates still runs after resolve_ticker (earnings lookup needs it).
+    """
+    timings: dict = {}
+    stubs = {
+        "classify_intent": _timed_stub("classify_intent", 0.3, timings, {
+            "intent": "general_lookup", "chart_requested": False, "intent_error": None,
+        }),
+        "resolve_ticker": _timed_stub("resolve_ticker", 0.15, timings, lambda s: {
+            **s, "ticker": "NVDA", "company_name": "NVIDIA",
+        }),
+        "parse_dates": _timed_stub("parse_dates", 0.15, timings, lambda s: {
+            **s, "start_date": "2024-05-01", "end_date": "2024-05-07", "date_missing": False,
+        }),
+        "plan_retrieval": _timed_stub("plan_retrieval", 0, timings, lambda s: {
+            **s, "retrieval_plan": {"fetch_news": False, "fetch_sentiment": False, "fetch_rag": True},
+        }),
+        "fetch_price_data": _timed_stub("fetch_price", 0, timings, {"price_data": {"close_price": 1.0}}),
+        "retrieve_news": _timed_stub("retrieve_news", 0, timings, {"news_articles": []}),
+        "analyze_reddit_sentiment": _timed_stub("reddit_sentiment", 0, timings, {"sentiment_error": None}),
+        "retrieve_rag_context": _timed_stub("retrieve_rag", 0, timings, {"filing_chunks": []}),
+        "synthesize_response": _timed_stub("synthesize", 0, timings, {"response_text": "ok"}),
+    }
+    with patch.multiple("agent.graph.workflow", **stubs):
+        graph = create_workflow()
+        result = await graph.ainvoke({"user_message": "How did NVDA do last week?", "user_config": {}})
+
+    # Both branches' fields survive the join and reach the router.
+    assert result["intent"] == "general_lookup"
+    assert result["ticker"] == "NVDA"
+    assert result["start_date"] == "2024-05-01"
+    assert result["user_message"] == "How did NVDA do last week?"
+    assert "retrieve_rag" in timings
+
+    intent_start, intent_end = timings["classify_intent"]
+    ticker_start, _ = timings["resolve_ticker"]
+    assert ticker_start < intent_end and intent_start < timings["parse_dates"][1]
+    assert timings["parse_dates"][0] >= timings["resolve_ticker"][1]
+    assert timings["plan_retrieval"][0] >= max(intent_end, timings["parse_dates"][1])
+
+
+# ---------------------------------------------------------------------------
+# Latency instrumentation: state["timings"]
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_result_carries_per_node_and_per_call_timings():
+    """Every executed node (incl. the subgraph's) and its external calls land in timings."""
+    from agent.graph.nodes.timing import timed_call
+
+    async def news(state):
+        with timed_call("finnhub"):
+            await asyncio.sleep(0.05)
+        return {"news_articles": [], "news_error": None}
+
+    def rag(state):
+        with timed_call("edgar"):
+            time.sleep(0.02)
+        with timed_call("edgar"):
+            pass
+        return {"filing_chunks": [], "filing_error": None}
+
+    stubs = {
+        "classify_intent": MagicMock(return_value={"intent": "stock_analysis", "chart_requested": False}),
+        "resolve_ticker": MagicMock(side_effect=lambda s: {**s, "ticker": "NVDA"}),
+        "parse_dates": MagicMock(side_effect=lambda s: {
+            **s, "start_date": "2024-05-01", "end_date": "2024-05-07", "date_missing": False,
+        }),
+        "plan_retrieval": MagicMock(side_effect=lambda s: {
+            **s, "retrieval_plan": {"fetch_news": True, "fetch_sentiment": False, "fetch_rag": True},
+        }),
+        "fetch_price_data": MagicMock(side_effect=lambda s: {**s, "price_data": {"close_price": 1.0}}),
+        "retrieve_news": news,
+        "retrieve_rag_context": rag,
+        "synthesize_response": MagicMock(return_value={"response_text": "ok"}),
+    }
+    with patch.multiple("agent.graph.workflow", **stubs):
+        result = await create_workflow().ainvoke({"user_message": "How did NVDA do?", "user_config": {}})
+
+    nodes = result["timings"]["nodes"]
+    assert set(nodes) == {
+        "classify_intent", "resolve_ticker", "parse_dates", "plan_retrieval",
+        "fetch_price", "retrieve_news", "retrieve_rag", "synthesize",
+    }
+    assert nodes["retrieve_news"] >= 0.05
+
+    calls = result["timings"]["calls"]
+    assert len(calls["finnhub"]) == 1 and calls["finnhub"][0] >= 0.05
+    assert len(calls["edgar"]) == 2